@@ -6,42 +6,137 @@ throughout pyresample.
 """
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
 import os
+import shutil
+import tempfile
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
 from functools import update_wrapper
 from glob import glob
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
+
+import numpy as np
 
 import pyresample
+from pyresample.cache_stats import record_cache_event
+
+# number of arrays written to an on-disk entry, to detect partially removed entries
+_NUM_ARRAYS_FILENAME = "num_arrays.txt"
 
 
 class JSONCacheHelper:
-    """Decorator class to cache results to a JSON file on-disk."""
+    """Decorator class to cache results to a JSON file on-disk.
+
+    If ``memory_size_config_key`` is provided, the most recently used results
+    are also kept in memory for each cache directory. The number of results
+    kept is the value of that configuration key. Repeated calls with the same
+    arguments are then answered from memory without touching the filesystem
+    and the JSON files on disk are only used when a result isn't in memory.
+
+    The cache directory can be shared by multiple processes. Results are
+    written to a temporary file first and then renamed into place so a
+    partially written file is never read. While a result is computed a lock
+    file is held for its key so other processes missing on the same key wait
+    for the result instead of computing it again.
+
+    If ``max_entries_config_key`` is provided, the number of JSON files on
+    disk is bounded by the value of that configuration key. When the limit is
+    exceeded the least recently used files are removed. Usage is tracked
+    through the modification time of each file which is updated when the file
+    is read.
+
+    """
 
     def __init__(
             self,
             func: Callable,
             cache_config_key: str,
             cache_version: int = 1,
+            memory_size_config_key: str | None = None,
+            max_entries_config_key: str | None = None,
+            cache_name: str = "geometry_slices",
     ):
         self._callable = func
         self._cache_config_key = cache_config_key
         self._cache_version = cache_version
+        self._memory_size_config_key = memory_size_config_key
+        self._max_entries_config_key = max_entries_config_key
+        self._cache_name = cache_name
+        self._memory_cache: OrderedDict[str, Any] = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
         self._uncacheable_arg_type_names = ("",)
 
-    @staticmethod
-    def cache_clear(cache_dir: str | None = None):
-        """Remove all on-disk files associated with this function.
+    def cache_clear(self, cache_dir: str | None = None):
+        """Remove all in-memory results and on-disk files associated with this function.
 
         Intended to mimic the :func:`functools.cache` behavior.
         """
-        cache_path = _get_cache_dir_from_config(cache_dir=cache_dir, cache_version="*")
+        with self._memory_cache_lock:
+            self._memory_cache.clear()
+        cache_path = _get_cache_dir_from_config(cache_dir=cache_dir, cache_version="*",
+                                                cache_name=self._cache_name)
         for json_file in glob(str(cache_path / "*.json")):
             os.remove(json_file)
 
+    def prune(
+            self,
+            max_entries: int | None = None,
+            max_age: float | None = None,
+            cache_dir: str | None = None,
+    ) -> int:
+        """Remove old on-disk files associated with this function.
+
+        Args:
+            max_entries: Keep at most this many of the most recently used
+                files. Defaults to the value of the configuration key
+                controlling the maximum number of entries if one was provided.
+            max_age: Remove files that haven't been used for this many
+                seconds.
+            cache_dir: Cache directory to prune. Defaults to the configured
+                ``cache_dir``.
+
+        Returns:
+            Number of files removed.
+
+        """
+        if max_entries is None:
+            max_entries = self._get_max_entries()
+        base_cache_dir = _get_cache_dir_from_config(cache_dir=cache_dir, cache_version=self._cache_version,
+                                                    cache_name=self._cache_name)
+        return _prune_json_entries(base_cache_dir, max_entries=max_entries, max_age=max_age)
+
+    def stats(self, cache_dir: str | None = None) -> dict[str, Any]:
+        """Get information about the cached results of this function.
+
+        Returns:
+            Dictionary with the number of files on disk (``entries``), their
+            total size in bytes (``size``), the last time the least and most
+            recently used files were used (``oldest`` and ``newest``, as
+            seconds since the epoch or ``None`` if there are no files) and
+            the number of results kept in memory (``memory_entries``).
+
+        """
+        base_cache_dir = _get_cache_dir_from_config(cache_dir=cache_dir, cache_version=self._cache_version,
+                                                    cache_name=self._cache_name)
+        entries = _list_json_entries(base_cache_dir)
+        mtimes = [entry_mtime for entry_mtime, _, _ in entries]
+        with self._memory_cache_lock:
+            memory_entries = len(self._memory_cache)
+        return {
+            "entries": len(entries),
+            "size": sum(entry_size for _, entry_size, _ in entries),
+            "oldest": min(mtimes) if mtimes else None,
+            "newest": max(mtimes) if mtimes else None,
+            "memory_entries": memory_entries,
+        }
+
     def __call__(self, *args):
         """Call decorated function and cache the result to JSON."""
         should_cache = pyresample.config.get(self._cache_config_key, False)
@@ -58,25 +153,312 @@ class JSONCacheHelper:
         return self._run_and_cache(arg_hash, args)
 
     def _run_and_cache(self, arg_hash: str, args: tuple[Any]) -> Any:
-        base_cache_dir = _get_cache_dir_from_config(cache_version=self._cache_version)
+        base_cache_dir = _get_cache_dir_from_config(cache_version=self._cache_version,
+                                                    cache_name=self._cache_name)
+        memory_key = os.path.join(base_cache_dir, arg_hash)
+        memory_size = self._get_memory_size()
+        start_time = time.perf_counter()
+        if memory_size:
+            with self._memory_cache_lock:
+                if memory_key in self._memory_cache:
+                    self._memory_cache.move_to_end(memory_key)
+                    res = copy.deepcopy(self._memory_cache[memory_key])
+                    record_cache_event(self._cache_name, "hit", duration=time.perf_counter() - start_time)
+                    return res
+
         json_path = base_cache_dir / f"{arg_hash}.json"
-        if not json_path.is_file():
-            res = self._callable(*args)
-            json_path.parent.mkdir(exist_ok=True)
-            with open(json_path, "w") as json_cache:
-                json.dump(res, json_cache, cls=_JSONEncoderWithSlice)
-
-        # for consistency, always load the cached result
-        with open(json_path, "r") as json_cache:
-            res = json.load(json_cache, object_hook=_object_hook)
+        try:
+            res = _load_json_entry(json_path)
+            record_cache_event(self._cache_name, "hit", duration=time.perf_counter() - start_time)
+        except (OSError, ValueError):
+            res = self._run_and_write(json_path, args)
+
+        if memory_size:
+            self._add_to_memory_cache(memory_key, res, memory_size)
+        return res
+
+    def _run_and_write(self, json_path: Path, args: tuple[Any]) -> Any:
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        with _cache_entry_lock(json_path):
+            start_time = time.perf_counter()
+            try:
+                # another process may have written the result while we waited
+                res = _load_json_entry(json_path)
+                record_cache_event(self._cache_name, "hit", duration=time.perf_counter() - start_time)
+                return res
+            except (OSError, ValueError):
+                pass
+            res_json = json.dumps(self._callable(*args), cls=_JSONEncoderWithSlice)
+            record_cache_event(self._cache_name, "miss", duration=time.perf_counter() - start_time)
+            _write_json_entry(json_path, res_json)
+            record_cache_event(self._cache_name, "store", nbytes=len(res_json))
+
+        max_entries = self._get_max_entries()
+        if max_entries is not None:
+            _prune_json_entries(json_path.parent, max_entries=max_entries, keep=json_path)
+        # for consistency, always return what a later cache hit would return
+        return json.loads(res_json, object_hook=_object_hook)
+
+    def _get_memory_size(self) -> int:
+        if self._memory_size_config_key is None:
+            return 0
+        return int(pyresample.config.get(self._memory_size_config_key, 0) or 0)
+
+    def _get_max_entries(self) -> int | None:
+        if self._max_entries_config_key is None:
+            return None
+        max_entries = pyresample.config.get(self._max_entries_config_key, None)
+        return None if max_entries is None else int(max_entries)
+
+    def _add_to_memory_cache(self, memory_key: str, res: Any, memory_size: int) -> None:
+        with self._memory_cache_lock:
+            self._memory_cache[memory_key] = copy.deepcopy(res)
+            self._memory_cache.move_to_end(memory_key)
+            while len(self._memory_cache) > memory_size:
+                self._memory_cache.popitem(last=False)
+
+
+def _load_json_entry(json_path: Path) -> Any:
+    with open(json_path, "r") as json_cache:
+        res = json.load(json_cache, object_hook=_object_hook)
+    with suppress(FileNotFoundError):
+        # mark as recently used, the file may have been pruned by another process
+        os.utime(json_path)
+    return res
+
+
+def _write_json_entry(json_path: Path, res_json: str) -> None:
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=json_path.parent)
+    try:
+        with os.fdopen(tmp_fd, "w") as json_cache:
+            json_cache.write(res_json)
+        os.replace(tmp_path, json_path)
+    finally:
+        with suppress(FileNotFoundError):
+            os.remove(tmp_path)
+
+
+def _list_json_entries(base_cache_dir: Path) -> list[tuple[float, int, Path]]:
+    entries = []
+    with suppress(FileNotFoundError):
+        for json_file in base_cache_dir.glob("*.json"):
+            try:
+                json_stat = json_file.stat()
+            except FileNotFoundError:
+                # removed by another process
+                continue
+            entries.append((json_stat.st_mtime, json_stat.st_size, json_file))
+    return entries
+
+
+def _prune_json_entries(
+        base_cache_dir: Path,
+        max_entries: int | None = None,
+        max_age: float | None = None,
+        keep: Path | None = None,
+) -> int:
+    entries = sorted(_list_json_entries(base_cache_dir), key=lambda entry: entry[0], reverse=True)
+    min_mtime = None if max_age is None else time.time() - max_age
+    num_removed = 0
+    for entry_idx, (entry_mtime, _, json_file) in enumerate(entries):
+        too_many = max_entries is not None and entry_idx >= max_entries
+        too_old = min_mtime is not None and entry_mtime < min_mtime
+        if json_file == keep or not (too_many or too_old):
+            continue
+        with suppress(FileNotFoundError):
+            os.remove(json_file)
+            num_removed += 1
+    return num_removed
+
+
+_ENTRY_THREAD_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+
+@contextmanager
+def _cache_entry_lock(
+        entry_path: Path,
+        timeout: float = 60.0,
+        poll_interval: float = 0.01,
+) -> Iterator[None]:
+    """Hold a lock for one cache entry shared between threads and processes.
+
+    Other processes are excluded by exclusively creating a lock file next to
+    the entry. A lock file older than ``timeout`` seconds is assumed to be
+    left over from a crashed process and is removed. If the lock can't be
+    acquired within ``timeout`` seconds the caller continues without it.
+    Cache entries are written atomically so this only risks the same result
+    being computed more than once.
+
+    """
+    lock_path = entry_path.with_name(f".{entry_path.name}.lock")
+    with _ENTRY_THREAD_LOCKS[hash(str(entry_path)) % len(_ENTRY_THREAD_LOCKS)]:
+        has_lock = _acquire_lock_file(lock_path, timeout, poll_interval)
+        try:
+            yield
+        finally:
+            if has_lock:
+                with suppress(FileNotFoundError):
+                    os.remove(lock_path)
+
+
+def _acquire_lock_file(lock_path: Path, timeout: float, poll_interval: float) -> bool:
+    start_time = time.monotonic()
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            pass
+        with suppress(FileNotFoundError):
+            if time.time() - lock_path.stat().st_mtime > timeout:
+                os.remove(lock_path)
+                continue
+        if time.monotonic() - start_time > timeout:
+            return False
+        time.sleep(poll_interval)
+
+
+class NPYCacheHelper:
+    """Decorator class to cache a tuple of arrays to memory-mapped ``.npy`` files on-disk.
+
+    Every cached result is stored in its own sub-directory of the configured
+    ``cache_dir`` holding one ``.npy`` file per returned array. Cached arrays
+    are loaded as read-only memory maps so a cache hit costs little more than
+    opening the files. Results are written to a temporary directory first and
+    then renamed into place so concurrent processes never see a partial entry.
+    Entries with missing files, for example being removed by another process,
+    are treated as a cache miss and written again.
+
+    The total size of the cache is bounded by the value of the
+    ``max_size_config_key`` configuration key (in bytes). When the limit is
+    exceeded the least recently used entries are removed. Usage is tracked
+    through the modification time of each entry's directory.
+
+    """
+
+    def __init__(
+            self,
+            func: Callable,
+            cache_config_key: str,
+            cache_name: str,
+            hash_func: Callable[..., str],
+            max_size_config_key: str | None = None,
+            cache_version: int = 1,
+    ):
+        self._callable = func
+        self._cache_config_key = cache_config_key
+        self._cache_name = cache_name
+        self._hash_func = hash_func
+        self._max_size_config_key = max_size_config_key
+        self._cache_version = cache_version
+
+    def cache_clear(self, cache_dir: str | None = None):
+        """Remove all on-disk entries associated with this function.
+
+        Intended to mimic the :func:`functools.cache` behavior.
+        """
+        cache_path = _get_cache_dir_from_config(cache_dir=cache_dir, cache_version="*",
+                                                cache_name=self._cache_name)
+        for entry_dir in glob(str(cache_path / "*")):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def __call__(self, *args, **kwargs):
+        """Call decorated function and cache the resulting arrays to disk."""
+        should_cache = pyresample.config.get(self._cache_config_key, False)
+        if not should_cache:
+            return self._callable(*args, **kwargs)
+
+        arg_hash = self._hash_func(*args, **kwargs)
+        return self._run_and_cache(arg_hash, args, kwargs)
+
+    def _run_and_cache(self, arg_hash: str, args: tuple[Any], kwargs: dict[str, Any]) -> tuple:
+        base_cache_dir = _get_cache_dir_from_config(cache_version=self._cache_version,
+                                                    cache_name=self._cache_name)
+        entry_dir = base_cache_dir / arg_hash
+        start_time = time.perf_counter()
+        if entry_dir.is_dir():
+            try:
+                os.utime(entry_dir)
+                res = _load_npy_entry(entry_dir)
+            except (OSError, ValueError):
+                # removed by another process while loading it, recompute it
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            else:
+                record_cache_event(self._cache_name, "hit", duration=time.perf_counter() - start_time)
+                return res
+
+        res = self._callable(*args, **kwargs)
+        record_cache_event(self._cache_name, "miss", duration=time.perf_counter() - start_time)
+        base_cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_npy_entry(entry_dir, res)
+        record_cache_event(self._cache_name, "store", nbytes=sum(np.asarray(arr).nbytes for arr in res))
+        self._evict_old_entries(base_cache_dir, keep=entry_dir)
         return res
 
+    def _evict_old_entries(self, base_cache_dir: Path, keep: Path) -> None:
+        if self._max_size_config_key is None:
+            return
+        max_size = pyresample.config.get(self._max_size_config_key, None)
+        if max_size is None:
+            return
+
+        entries = []
+        for entry_dir in base_cache_dir.iterdir():
+            if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+                continue
+            try:
+                entry_size = sum(npy_file.stat().st_size for npy_file in entry_dir.iterdir())
+                entry_atime = entry_dir.stat().st_mtime
+            except FileNotFoundError:
+                # removed by another process
+                continue
+            entries.append((entry_atime, entry_size, entry_dir))
+
+        total_size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry_dir in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= int(max_size):
+                break
+            if entry_dir == keep:
+                continue
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= entry_size
+
+
+def _write_npy_entry(entry_dir: Path, arrays: tuple) -> None:
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp_", dir=entry_dir.parent))
+    try:
+        for arr_idx, arr in enumerate(arrays):
+            np.save(tmp_dir / f"{arr_idx}.npy", np.asarray(arr), allow_pickle=False)
+        (tmp_dir / _NUM_ARRAYS_FILENAME).write_text(str(len(arrays)))
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        # another process finished writing the same entry first
+        if not entry_dir.is_dir():
+            raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _load_npy_entry(entry_dir: Path) -> tuple:
+    """Load the arrays of a cache entry.
+
+    Raises OSError or ValueError if the entry is missing any of its arrays.
+
+    """
+    num_arrays = int((entry_dir / _NUM_ARRAYS_FILENAME).read_text())
+    return tuple(np.load(entry_dir / f"{arr_idx}.npy", mmap_mode="r", allow_pickle=False)
+                 for arr_idx in range(num_arrays))
 
-def _get_cache_dir_from_config(cache_dir: str | None = None, cache_version: int | str = 1) -> Path:
+
+def _get_cache_dir_from_config(
+        cache_dir: str | None = None,
+        cache_version: int | str = 1,
+        cache_name: str = "geometry_slices",
+) -> Path:
     cache_dir = cache_dir or pyresample.config.get("cache_dir")
     if cache_dir is None:
-        raise RuntimeError("Can't use JSON caching. No 'cache_dir' configured.")
-    subdir = f"geometry_slices_v{cache_version}"
+        raise RuntimeError("Can't use on-disk caching. No 'cache_dir' configured.")
+    subdir = f"{cache_name}_v{cache_version}"
     return Path(cache_dir) / subdir
 
 
@@ -88,8 +470,9 @@ def _hash_args(args: tuple[Any]) -> str:
     hashable_args = []
     for arg in args:
         if isinstance(arg, (SwathDefinition, LegacySwathDefinition)):
-            raise TypeError(f"Unhashable type ({type(arg)})")
-        if isinstance(arg, (AreaDefinition, LegacyAreaDefinition)):
+            # memoised on the swath, see BaseDefinition.update_hash
+            arg = "swath-" + arg.update_hash().hexdigest()
+        elif isinstance(arg, (AreaDefinition, LegacyAreaDefinition)):
             arg = hash(arg)
         hashable_args.append(arg)
     arg_hash = hashlib.sha1()  # nosec
@@ -110,19 +493,55 @@ def _object_hook(obj: object) -> Any:
     return obj
 
 
-def cache_to_json_if(cache_config_key: str) -> Callable:
+def cache_to_json_if(
+        cache_config_key: str,
+        memory_size_config_key: str | None = None,
+        max_entries_config_key: str | None = None,
+        cache_name: str = "geometry_slices",
+) -> Callable:
     """Decorate a function and cache the results to a JSON file on disk.
 
     This caching only happens if the ``pyresample.config`` boolean value for
     the provided key is ``True`` as well as some other conditions. See
-    :class:`JSONCacheHelper` for more information. Most importantly this
-    decorator does not limit how many items can be cached and does not clear
-    out old entries. It is up to the user to manage the size of the cache.
+    :class:`JSONCacheHelper` for more information. The number of results kept
+    in memory is limited by the value of ``memory_size_config_key`` and the
+    number of files kept on disk by the value of ``max_entries_config_key``.
+    If no maximum number of files is configured it is up to the user to
+    manage the size of the cache, for example with the ``prune`` method of
+    the decorated function. Results are stored in the ``<cache_name>_v1``
+    sub-directory of the configured ``cache_dir`` so every decorated function
+    should use its own ``cache_name``.
 
     """
     def _decorator(func: Callable) -> Callable:
-        zarr_cacher = JSONCacheHelper(func, cache_config_key)
+        zarr_cacher = JSONCacheHelper(func, cache_config_key,
+                                      memory_size_config_key=memory_size_config_key,
+                                      max_entries_config_key=max_entries_config_key,
+                                      cache_name=cache_name)
         wrapper = update_wrapper(zarr_cacher, func)
         return wrapper
 
     return _decorator
+
+
+def cache_to_npy_if(
+        cache_config_key: str,
+        cache_name: str,
+        hash_func: Callable[..., str],
+        max_size_config_key: str | None = None,
+) -> Callable:
+    """Decorate a function returning a tuple of arrays and cache the results to disk.
+
+    This caching only happens if the ``pyresample.config`` boolean value for
+    the provided key is ``True``. The cache key of each call is the string
+    returned by ``hash_func`` when called with the same arguments as the
+    decorated function. See :class:`NPYCacheHelper` for more information.
+
+    """
+    def _decorator(func: Callable) -> Callable:
+        npy_cacher = NPYCacheHelper(func, cache_config_key, cache_name, hash_func,
+                                    max_size_config_key=max_size_config_key)
+        wrapper = update_wrapper(npy_cacher, func)
+        return wrapper
+
+    return _decorator
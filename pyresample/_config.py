@@ -37,6 +37,15 @@ config = Config(
     defaults=[{
         "cache_dir": platformdirs.user_cache_dir("pyresample", "pytroll"),
         "cache_geometry_slices": False,
+        "cache_geometry_slices_memory_size": 128,
+        "cache_geometry_slices_max_entries": 10000,
+        "cache_neighbour_info": False,
+        "cache_neighbour_info_max_size": 4 * 1024 ** 3,
+        "source_kdtree_cache_size": 0,
+        "swath_hash_mode": "fast",
+        "area_lonlats_cache_size": 0,
+        "transformer_cache_size": 64,
+        "compact_dtypes": False,
         "features": {
             "future_geometries": False,
         },
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 Pyresample developers
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option) any
+# later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Vectorised geostationary satellite projection.
+
+Full disk geostationary areas are the largest grids pyresample works with.
+:class:`GeosProjection` implements the same forward and inverse ``+proj=geos``
+equations as PROJ with numpy. The 1D projection vectors of an area can be
+used directly (the trigonometry is then only done once per row and column),
+the work is split over several threads and the results can be float32.
+
+Invalid coordinates (pixels in space, points not visible from the satellite)
+are ``inf`` like the ones returned by pyproj.
+
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from pyproj import CRS, Proj
+
+# Number of rows of the broadcast input arrays computed at once
+BLOCK_ROWS = 256
+# Maximum differences with pyproj for the projection to be used
+LONLAT_TOLERANCE = 1e-9
+XY_TOLERANCE = 1e-6
+
+
+class GeosProjection:
+    """Forward and inverse geostationary projection.
+
+    Args:
+        a: Semi-major axis of the ellipsoid in metres.
+        b: Semi-minor axis of the ellipsoid in metres.
+        h: Height of the satellite above the ellipsoid in metres.
+        lon_0: Sub-satellite longitude in degrees.
+        sweep: Sweep angle axis of the instrument, ``"x"`` or ``"y"``.
+        x_0: False easting in metres.
+        y_0: False northing in metres.
+        to_meter: Size of the projection coordinate unit in metres.
+
+    """
+
+    def __init__(self, a, b, h, lon_0=0.0, sweep="y", x_0=0.0, y_0=0.0, to_meter=1.0):
+        """Compute the constants of the projection."""
+        self.a = a
+        self.lon_0 = lon_0
+        self.flip_axis = sweep == "x"
+        self.x_0 = x_0
+        self.y_0 = y_0
+        self.to_meter = to_meter
+        self.radius_g_1 = h / a
+        self.radius_g = 1.0 + self.radius_g_1
+        self.c = self.radius_g ** 2 - 1.0
+        self.radius_p2 = (b / a) ** 2
+        self.radius_p = b / a
+        self.radius_p_inv2 = 1.0 / self.radius_p2
+        # like PROJ, only check the visibility of points on ellipsoids
+        self.check_visibility = a != b
+
+    @classmethod
+    def from_crs(cls, crs):
+        """Create the projection from a pyproj CRS, None if the CRS isn't supported."""
+        operation = crs.coordinate_operation
+        if operation is None or not operation.method_name.startswith("Geostationary Satellite"):
+            return None
+        if crs.prime_meridian.longitude != 0 or crs.datum.name != crs.geodetic_crs.datum.name:
+            return None
+        params = {param.name.lower(): param.value * param.unit_conversion_factor for param in operation.params}
+        try:
+            lon_0 = np.rad2deg(params["longitude of natural origin"])
+            h = params["satellite height"]
+        except KeyError:
+            return None
+        sweep = "x" if "sweep x" in operation.method_name.lower() else "y"
+        return cls(crs.ellipsoid.semi_major_metre, crs.ellipsoid.semi_minor_metre, h,
+                   lon_0=lon_0, sweep=sweep,
+                   x_0=params.get("false easting", 0.0), y_0=params.get("false northing", 0.0),
+                   to_meter=crs.axis_info[0].unit_conversion_factor)
+
+    def forward(self, lons, lats, dtype=None, max_workers=None):
+        """Get the projection coordinates of longitudes and latitudes in degrees.
+
+        The inputs only have to be broadcastable to the same shape. Large
+        arrays are split in blocks of rows computed by `max_workers` threads
+        (the number of CPUs by default).
+        """
+        return _run_in_blocks(self._forward, lons, lats, dtype, max_workers)
+
+    def inverse(self, x, y, dtype=None, max_workers=None):
+        """Get the longitudes and latitudes in degrees of projection coordinates.
+
+        The inputs only have to be broadcastable to the same shape, for
+        example ``x[np.newaxis, :]`` and ``y[:, np.newaxis]`` for the
+        projection vectors of an area. Broadcast views (like the ones
+        returned by :meth:`~pyresample.geometry.AreaDefinition.get_proj_coords`
+        with ``broadcast=True``) are reduced to these vectors first.
+        """
+        return _run_in_blocks(self._inverse, x, y, dtype, max_workers)
+
+    def _forward(self, lons, lats):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._forward_no_warnings(lons, lats)
+
+    def _forward_no_warnings(self, lons, lats):
+        lam = np.deg2rad(lons - self.lon_0)
+        phi = np.deg2rad(lats)
+        invalid = np.abs(phi) > np.pi / 2
+        # geocentric latitude
+        phi = np.arctan(self.radius_p2 * np.tan(phi))
+        cos_phi = np.cos(phi)
+        sin_phi = np.sin(phi)
+        r = self.radius_p / np.hypot(self.radius_p * cos_phi, sin_phi)
+        vx = r * np.cos(lam) * cos_phi
+        vy = r * np.sin(lam) * cos_phi
+        vz = r * sin_phi
+        tmp = self.radius_g - vx
+        if self.check_visibility:
+            invalid |= (tmp * vx - vy * vy - vz * vz * self.radius_p_inv2) < 0
+        if self.flip_axis:
+            x = self.radius_g_1 * np.arctan(vy / np.hypot(vz, tmp))
+            y = self.radius_g_1 * np.arctan(vz / tmp)
+        else:
+            x = self.radius_g_1 * np.arctan(vy / tmp)
+            y = self.radius_g_1 * np.arctan(vz / np.hypot(vy, tmp))
+        x = (x * self.a + self.x_0) / self.to_meter
+        y = (y * self.a + self.y_0) / self.to_meter
+        return np.where(invalid, np.inf, x), np.where(invalid, np.inf, y)
+
+    def _inverse(self, x, y):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._inverse_no_warnings(x, y)
+
+    def _inverse_no_warnings(self, x, y):
+        x = (x * self.to_meter - self.x_0) / self.a
+        y = (y * self.to_meter - self.y_0) / self.a
+        if self.flip_axis:
+            vz = np.tan(y / self.radius_g_1)
+            vy = np.tan(x / self.radius_g_1) * np.hypot(1.0, vz)
+        else:
+            vy = np.tan(x / self.radius_g_1)
+            vz = np.tan(y / self.radius_g_1) * np.hypot(1.0, vy)
+        # intersection of the line of sight (vx = -1) with the ellipsoid
+        quad_a = vy * vy + (vz / self.radius_p) ** 2 + 1.0
+        quad_b = -2.0 * self.radius_g
+        det = quad_b * quad_b - 4.0 * quad_a * self.c
+        k = (-quad_b - np.sqrt(det)) / (2.0 * quad_a)
+        vx = self.radius_g - k
+        vy = vy * k
+        vz = vz * k
+        lam = np.arctan2(vy, vx)
+        phi = np.arctan(vz * np.cos(lam) / vx)
+        # geodetic latitude
+        phi = np.arctan(self.radius_p_inv2 * np.tan(phi))
+        lons = np.rad2deg(lam) + self.lon_0
+        lons = np.where(np.abs(lons) > 180, (lons + 180) % 360 - 180, lons)
+        lats = np.rad2deg(phi)
+        space = det < 0
+        return np.where(space, np.inf, lons), np.where(space, np.inf, lats)
+
+
+def _run_in_blocks(func, arr1, arr2, dtype, max_workers):
+    """Run a coordinate transformation on blocks of rows in several threads.
+
+    The computations are done in float64 and the results are cast to
+    `dtype` (float64 by default) block by block.
+    """
+    arr1 = _squeeze_broadcast_axes(np.asarray(arr1, dtype=np.float64))
+    arr2 = _squeeze_broadcast_axes(np.asarray(arr2, dtype=np.float64))
+    shape = np.broadcast_shapes(arr1.shape, arr2.shape)
+    dtype = np.dtype(np.float64 if dtype is None else dtype)
+    if len(shape) == 0:
+        res1, res2 = func(np.atleast_1d(arr1), np.atleast_1d(arr2))
+        return float(res1[0]), float(res2[0])
+    res1 = np.empty(shape, dtype=dtype)
+    res2 = np.empty(shape, dtype=dtype)
+
+    def _run_block(rows):
+        block1 = arr1[rows] if arr1.ndim == len(shape) and arr1.shape[0] > 1 else arr1
+        block2 = arr2[rows] if arr2.ndim == len(shape) and arr2.shape[0] > 1 else arr2
+        res1[rows], res2[rows] = func(block1, block2)
+
+    blocks = [slice(start, start + BLOCK_ROWS) for start in range(0, shape[0], BLOCK_ROWS)]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if len(blocks) == 1 or max_workers <= 1 or res1.size < 2 ** 16:
+        for rows in blocks:
+            _run_block(rows)
+    else:
+        with ThreadPoolExecutor(min(len(blocks), max_workers)) as executor:
+            list(executor.map(_run_block, blocks))
+    return res1, res2
+
+
+def _squeeze_broadcast_axes(arr):
+    """Keep only one element along the axes of broadcast views so computations are done once."""
+    index = tuple(slice(0, 1) if arr.strides[axis] == 0 else slice(None) for axis in range(arr.ndim))
+    return arr[index]
+
+
+@lru_cache(maxsize=32)
+def get_geos_projection(crs_wkt: str) -> GeosProjection | None:
+    """Get the vectorised projection of a geostationary CRS.
+
+    None is returned if the CRS isn't a geostationary projection, if some of
+    its parameters aren't supported or if the results of the projection
+    differ from pyproj by more than :data:`LONLAT_TOLERANCE` degrees or
+    :data:`XY_TOLERANCE` metres for a few probe points.
+
+    """
+    crs = CRS.from_wkt(crs_wkt)
+    geos_proj = GeosProjection.from_crs(crs)
+    if geos_proj is None or not _matches_pyproj(geos_proj, Proj(crs)):
+        return None
+    return geos_proj
+
+
+def _matches_pyproj(geos_proj, proj):
+    lons = geos_proj.lon_0 + np.array([0.0, 10.0, -30.0, 45.5, -75.0, 80.0, 100.0, 179.0])
+    lats = np.array([0.0, 5.0, 50.0, -60.5, 20.0, -80.0, 10.0, 0.0])
+    exp_x, exp_y = proj(lons, lats)
+    x, y = geos_proj.forward(lons, lats)
+    exp_lons, exp_lats = proj(exp_x, exp_y, inverse=True)
+    res_lons, res_lats = geos_proj.inverse(exp_x, exp_y)
+    visible = np.isfinite(exp_x)
+    return bool(np.array_equal(visible, np.isfinite(x)) and
+                np.array_equal(visible, np.isfinite(res_lons)) and
+                np.allclose(x[visible], exp_x[visible], rtol=0, atol=XY_TOLERANCE / geos_proj.to_meter) and
+                np.allclose(y[visible], exp_y[visible], rtol=0, atol=XY_TOLERANCE / geos_proj.to_meter) and
+                np.allclose(res_lons[visible], exp_lons[visible], rtol=0, atol=LONLAT_TOLERANCE) and
+                np.allclose(res_lats[visible], exp_lats[visible], rtol=0, atol=LONLAT_TOLERANCE))
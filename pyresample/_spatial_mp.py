@@ -23,8 +23,6 @@ import ctypes
 import multiprocessing as mp
 
 import numpy as np
-import pyproj
-from pyproj import CRS
 from pyproj.enums import TransformDirection
 
 try:
@@ -33,7 +31,7 @@ except ImportError:
     ne = None
 
 from ._multi_proc import Scheduler, shmem_as_ndarray
-from .utils.proj4 import get_geodetic_crs_with_no_datum_shift
+from .utils.proj4 import get_geodetic_transformer
 
 # Earth radius
 R = 6370997.0
@@ -156,6 +154,11 @@ class Cartesian(object):
         """Transform longitudes and latitues to cartesian coordinates."""
         if np.issubdtype(lons.dtype, np.integer):
             lons = lons.astype(np.float64)
+        separable_vectors = get_separable_lonlat_vectors(lons, lats)
+        if separable_vectors is not None:
+            return separable_lonlats_to_xyz(*separable_vectors, dtype=lons.dtype)
+        lons = lons.ravel()
+        lats = lats.ravel()
         coords = np.zeros((lons.size, 3), dtype=lons.dtype)
         if ne:
             deg2rad = np.pi / 180  # noqa: F841
@@ -172,6 +175,47 @@ class Cartesian(object):
 Cartesian_MP = Cartesian
 
 
+def get_separable_lonlat_vectors(lons, lats):
+    """Get the 1D vectors of separable 2D longitude and latitude arrays.
+
+    Longitudes and latitudes of geographic (lon/lat) areas only vary along the
+    columns and the rows respectively and are returned by
+    :meth:`~pyresample.geometry.AreaDefinition.get_lonlats` as broadcast
+    views of 1D vectors. For these the longitude vector (one value per
+    column) and the latitude vector (one value per row) are returned,
+    otherwise ``None``.
+
+    """
+    if type(lons) is not np.ndarray or type(lats) is not np.ndarray:
+        return None
+    if lons.ndim != 2 or lons.shape != lats.shape or 0 in lons.shape:
+        return None
+    if lons.strides[0] != 0 or lats.strides[1] != 0:
+        return None
+    return lons[0], lats[:, 0]
+
+
+def separable_lonlats_to_xyz(lon_vector, lat_vector, dtype=None):
+    """Convert the broadcast product of 1D lon/lat vectors to geocentric x/y/z coordinates.
+
+    The trigonometric functions are only evaluated once per row and column.
+    The result is the same as converting the flattened 2D arrays of ``lat``
+    rows and ``lon`` columns: a ``(lat_vector.size * lon_vector.size, 3)``
+    array.
+
+    """
+    if dtype is None:
+        dtype = np.result_type(lon_vector, lat_vector, np.float32)
+    lons = np.deg2rad(lon_vector)
+    lats = np.deg2rad(lat_vector)
+    coords = np.empty((lats.size, lons.size, 3), dtype=dtype)
+    r_cos_lats = (R * np.cos(lats))[:, np.newaxis]
+    coords[:, :, 0] = r_cos_lats * np.cos(lons)
+    coords[:, :, 1] = r_cos_lats * np.sin(lons)
+    coords[:, :, 2] = (R * np.sin(lats))[:, np.newaxis]
+    return coords.reshape(-1, 3)
+
+
 def _run_jobs(target, args, nprocs):
     """Run process pool."""
     # return status in shared memory
@@ -242,9 +286,7 @@ def _parallel_proj(scheduler, data1, data2, res1, res2, proj_args, proj_kwargs,
 
         # Initialise pyproj
         proj_def = proj_args[0] if proj_args else proj_kwargs
-        crs = CRS.from_user_input(proj_def)
-        gcrs = get_geodetic_crs_with_no_datum_shift(crs)
-        transformer = pyproj.Transformer.from_crs(gcrs, crs, always_xy=True)
+        transformer = get_geodetic_transformer(proj_def, always_xy=True)
         trans_kwargs = {"radians": radians, "errcheck": errcheck,
                         "direction": TransformDirection.INVERSE if inverse else TransformDirection.FORWARD}
 
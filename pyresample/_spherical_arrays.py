@@ -0,0 +1,384 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 Pyresample developers
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option) any
+# later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Vectorised great circle geometry on arrays of unit vectors.
+
+Points are stored as Cartesian unit vectors in the last dimension of the
+arrays (``(..., 3)``) and every function works on any number of points,
+arcs or polygons at once with the usual numpy broadcasting rules. The
+functions give the same results as the corresponding methods of the objects
+in :mod:`pyresample.spherical_geometry`, which handle one item at a time.
+
+Degenerate inputs (zero length arcs, a point on a corner) give ``nan``
+angles and ``False`` results instead of raising ``ZeroDivisionError``.
+
+"""
+from __future__ import annotations
+
+import numpy as np
+
+EPSILON = 0.0000001
+
+
+def lonlat_to_xyz(lons, lats):
+    """Convert longitudes and latitudes in degrees to unit vectors."""
+    lons = np.deg2rad(lons)
+    lats = np.deg2rad(lats)
+    cos_lats = np.cos(lats)
+    return np.stack((cos_lats * np.cos(lons), cos_lats * np.sin(lons), np.sin(lats)), axis=-1)
+
+
+def xyz_to_lonlat(points):
+    """Convert unit vectors to longitudes and latitudes in degrees."""
+    lons = np.rad2deg(np.arctan2(points[..., 1], points[..., 0]))
+    lats = np.rad2deg(np.arcsin(np.clip(points[..., 2], -1, 1)))
+    return lons, lats
+
+
+# np.cross and np.linalg.norm have a large overhead for the small arrays of
+# the methods working on a single geometry
+def _dot(vec1, vec2):
+    return np.einsum("...i,...i->...", vec1, vec2)
+
+
+def _norm(vectors):
+    return np.sqrt(_dot(vectors, vectors))
+
+
+def _cross(vec1, vec2):
+    x1, y1, z1 = vec1[..., 0], vec1[..., 1], vec1[..., 2]
+    x2, y2, z2 = vec2[..., 0], vec2[..., 1], vec2[..., 2]
+    return np.stack((y1 * z2 - z1 * y2, z1 * x2 - x1 * z2, x1 * y2 - y1 * x2), axis=-1)
+
+
+def _normalize(vectors):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return vectors / _norm(vectors)[..., np.newaxis]
+
+
+def _modpi(val):
+    """Put *val* between -pi and pi."""
+    return (val + np.pi) % (2 * np.pi) - np.pi
+
+
+def distances(points1, points2):
+    """Get the great circle distances in radians between points."""
+    return np.arctan2(_norm(_cross(points1, points2)), _dot(points1, points2))
+
+
+def arc_angles(vertex, end1, end2, snap=True):
+    """Get the oriented angles at `vertex` between the arcs to `end1` and to `end2`.
+
+    Same as :meth:`pyresample.spherical_geometry.Arc.angle` for two arcs
+    sharing the point `vertex`. With ``snap`` angles within ``EPSILON`` of
+    0 or pi are snapped to these values.
+
+    """
+    ua_ = _cross(vertex, end1)
+    ub_ = _cross(vertex, end2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        val = _dot(ua_, ub_) / (_norm(ua_) * _norm(ub_))
+        angles = np.arccos(val)
+    if snap:
+        angles = np.where(np.abs(val - 1) < EPSILON, 0, angles)
+        angles = np.where(np.abs(val + 1) < EPSILON, np.pi, angles)
+    else:
+        angles = np.where((val - 1 >= 0) & (val - 1 < EPSILON), 0, angles)
+        angles = np.where((val + 1 > -EPSILON) & (val + 1 <= 0), np.pi, angles)
+    return np.where(_dot(_normalize(ua_), end2) > 0, -angles, angles)
+
+
+def great_circles_intersection(starts1, ends1, starts2, ends2):
+    """Get an intersection point of the great circles through arcs.
+
+    The great circles through the arcs from `starts1` to `ends1` and from
+    `starts2` to `ends2` also intersect at the antipode of the returned
+    point. Like the scalar versions, parallel great circles get the prime
+    meridian on the equator.
+
+    """
+    cross = _cross(_normalize(_cross(starts1, ends1)), _normalize(_cross(starts2, ends2)))
+    norm = _norm(cross)[..., np.newaxis]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(norm == 0, np.array([1.0, 0.0, 0.0]), cross / norm)
+
+
+def points_on_arcs(points, starts, ends, lengths=None):
+    """Check if points are on the great circle arcs from `starts` to `ends`.
+
+    `lengths` are the precomputed lengths of the arcs, if available.
+
+    """
+    if lengths is None:
+        lengths = distances(starts, ends)
+    return np.abs(distances(starts, points) + distances(ends, points) - lengths) < EPSILON
+
+
+def arcs_intersection(starts1, ends1, starts2, ends2):
+    """Get the intersection points of great circle arcs.
+
+    Same as :meth:`pyresample.spherical_geometry.Arc.intersection` for the
+    arcs from `starts1` to `ends1` and from `starts2` to `ends2`. Arcs which
+    don't intersect get ``nan`` intersections.
+
+    """
+    candidate = great_circles_intersection(starts1, ends1, starts2, ends2)
+    len1 = distances(starts1, ends1)
+    len2 = distances(starts2, ends2)
+    result = np.full(candidate.shape, np.nan)
+    for point in (-candidate, candidate):
+        on_arcs = points_on_arcs(point, starts1, ends1, len1) & points_on_arcs(point, starts2, ends2, len2)
+        result = np.where(on_arcs[..., np.newaxis], point, result)
+    return result
+
+
+def arcs_intersect(starts1, ends1, starts2, ends2):
+    """Check if great circle arcs intersect.
+
+    Same as :meth:`pyresample.spherical_geometry.Arc.intersects` for the
+    arcs from `starts1` to `ends1` and from `starts2` to `ends2`.
+
+    """
+    return ~np.isnan(arcs_intersection(starts1, ends1, starts2, ends2)[..., 0])
+
+
+def points_inside_quadrilaterals(points, corners):
+    """Check if points are inside quadrilaterals.
+
+    Same as :func:`pyresample.spherical_geometry.point_inside`. `corners`
+    has the shape ``(..., 4, 3)`` and is broadcast against ``(..., 3)``
+    `points`.
+
+    """
+    c0_, c1_, c2_, c3_ = (corners[..., idx, :] for idx in range(4))
+    angle1 = _modpi(arc_angles(c1_, c0_, c2_))
+    angle1bis = _modpi(arc_angles(c1_, c0_, points))
+    angle2 = _modpi(arc_angles(c3_, c2_, c0_))
+    angle2bis = _modpi(arc_angles(c3_, c2_, points))
+    return ((np.sign(angle1) == np.sign(angle1bis)) & (np.abs(angle1) > np.abs(angle1bis)) &
+            (np.sign(angle2) == np.sign(angle2bis)) & (np.abs(angle2) > np.abs(angle2bis)))
+
+
+def points_inside_polygon(points, vertices, block_size=2 ** 22):
+    """Check if points are inside a spherical polygon.
+
+    The ``(n, 3)`` `vertices` go clockwise around the inside of the polygon
+    like the ones of :class:`pyresample.spherical.SphPolygon`, which doesn't
+    need to be convex. The arcs from the ``(..., 3)`` `points` to a point
+    just inside one of the sides of the polygon are checked for crossings
+    with the sides, the points with an even number of crossings are inside.
+    At most `block_size` pairs of points and sides are checked at once.
+    Points which aren't finite are outside, the ones on a side can be either.
+
+    """
+    points = np.asarray(points, dtype=np.float64)
+    starts = np.asarray(vertices, dtype=np.float64)
+    ends = np.roll(starts, -1, axis=0)
+    normals = _cross(starts, ends)
+    reference = _get_reference_inside(starts, ends, normals)
+    flat_points = points.reshape(-1, 3)
+    res = np.empty(len(flat_points), dtype=bool)
+    rows = max(1, block_size // len(starts))
+    for start in range(0, len(flat_points), rows):
+        block = slice(start, start + rows)
+        res[block] = _count_crossings(flat_points[block], reference, starts, ends, normals) % 2 == 0
+    res &= np.isfinite(flat_points).all(axis=1)
+    return res.reshape(points.shape[:-1])
+
+
+def _count_crossings(points, reference, starts, ends, normals):
+    """Count the sides crossed by the arcs from ``(n, 3)`` `points` to `reference`."""
+    # same tests as S2's SimpleCrossing between the sides and the arcs to the reference
+    point_sides = -(points @ normals.T)
+    arc_normals = _cross(points, reference)
+    crossings = ((point_sides * (normals @ reference) > 0) &
+                 (point_sides * -(arc_normals @ ends.T) > 0) &
+                 (point_sides * (arc_normals @ starts.T) > 0))
+    return np.count_nonzero(crossings, axis=1)
+
+
+def _get_reference_inside(starts, ends, normals):
+    """Get a point just inside a side of a clockwise polygon.
+
+    The point is moved away from the middle of the longest side possible,
+    less far when another side is closer than that, for narrow polygons.
+
+    """
+    for side in np.argsort(-distances(starts, ends), kind="stable"):
+        middle = _normalize(starts[side:side + 1] + ends[side:side + 1])
+        # the inside is on the right of the sides, opposite to their normals
+        inward = -_normalize(normals[side])
+        others = np.arange(len(starts)) != side
+        for offset in 10.0 ** -np.arange(6, 14):
+            reference = _normalize(middle[0] + offset * inward)
+            if not _count_crossings(middle, reference, starts[others], ends[others], normals[others]).any():
+                return reference
+    return reference
+
+
+def quadrilaterals_overlap(corners1, corners2):
+    """Check if quadrilaterals overlap.
+
+    Same as :meth:`pyresample.geometry.BaseDefinition.overlaps` for two
+    ``(..., 4, 3)`` arrays of corners: a corner of one quadrilateral is
+    inside the other or two of their sides intersect.
+
+    """
+    corners1 = np.asarray(corners1)
+    corners2 = np.asarray(corners2)
+    inside = points_inside_quadrilaterals(corners1, corners2[..., np.newaxis, :, :]).any(axis=-1)
+    inside |= points_inside_quadrilaterals(corners2, corners1[..., np.newaxis, :, :]).any(axis=-1)
+    ends1 = np.roll(corners1, -1, axis=-2)
+    ends2 = np.roll(corners2, -1, axis=-2)
+    sides_intersect = arcs_intersect(corners1[..., :, np.newaxis, :], ends1[..., :, np.newaxis, :],
+                                     corners2[..., np.newaxis, :, :], ends2[..., np.newaxis, :, :])
+    return inside | sides_intersect.any(axis=(-2, -1))
+
+
+def get_bounding_caps(vertices):
+    """Get spherical caps containing convex polygons.
+
+    Returns the unit vectors of the centres and the angular radii of the caps
+    containing the ``(..., n, 3)`` polygon vertices. Caps which would be
+    larger than a hemisphere get a radius of pi as great circle arcs could
+    then leave them.
+
+    """
+    centers = _normalize(np.sum(vertices, axis=-2))
+    radii = np.max(distances(centers[..., np.newaxis, :], vertices), axis=-1)
+    radii = np.where(np.isfinite(radii) & (radii < np.pi / 2), radii, np.pi)
+    return np.nan_to_num(centers), radii
+
+
+def caps_overlap(centers1, radii1, centers2, radii2, block_size=4096):
+    """Get the ``(n, m)`` boolean matrix of the caps overlapping each other."""
+    res = np.empty((len(centers1), len(centers2)), dtype=bool)
+    for start in range(0, len(centers1), block_size):
+        block = slice(start, start + block_size)
+        cos_dists = np.clip(centers1[block] @ centers2.T, -1, 1)
+        res[block] = np.arccos(cos_dists) <= radii1[block, np.newaxis] + radii2 + EPSILON
+    return res
+
+
+def clip_convex_polygons(vertices, clip_vertices):
+    """Get the intersections of convex polygons.
+
+    The ``(..., n, 3)`` `vertices` are clipped to the great circles of the
+    sides of the ``(..., m, 3)`` convex `clip_vertices` (Sutherland-Hodgman
+    algorithm). Returns the ``(..., k, 3)`` vertices of the intersections
+    and the number of valid vertices of each of them, the following ones
+    are padding.
+
+    """
+    shape = np.broadcast_shapes(vertices.shape[:-2], clip_vertices.shape[:-2])
+    vertices = np.broadcast_to(vertices, shape + vertices.shape[-2:]).reshape((-1,) + vertices.shape[-2:])
+    clip_vertices = np.broadcast_to(clip_vertices, shape + clip_vertices.shape[-2:]).reshape(
+        (-1,) + clip_vertices.shape[-2:])
+    counts = np.full(len(vertices), vertices.shape[1])
+    orientation = np.sign(_dot(_cross(clip_vertices[:, 0], clip_vertices[:, 1]), clip_vertices[:, 2]))
+    rows = np.arange(len(vertices))[:, np.newaxis]
+    for side in range(clip_vertices.shape[1]):
+        normal = _cross(clip_vertices[:, side], clip_vertices[:, (side + 1) % clip_vertices.shape[1]])
+        normal = normal * orientation[:, np.newaxis]
+        idx = np.arange(vertices.shape[1])
+        valid = idx < counts[:, np.newaxis]
+        next_idx = (idx + 1) % np.maximum(counts, 1)[:, np.newaxis]
+        starts = vertices
+        ends = vertices[rows, next_idx]
+        start_side = _dot(normal[:, np.newaxis], starts)
+        end_side = _dot(normal[:, np.newaxis], ends)
+        end_inside = end_side >= 0
+        crossing = ((start_side >= 0) != end_inside) & valid
+        crossings = _normalize(start_side[..., np.newaxis] * ends - end_side[..., np.newaxis] * starts)
+        crossings *= np.sign(_dot(crossings, starts + ends))[..., np.newaxis]
+
+        candidates = np.stack((crossings, ends), axis=2).reshape(len(vertices), -1, 3)
+        keep = np.stack((crossing, end_inside & valid), axis=2).reshape(len(vertices), -1)
+        order = np.argsort(~keep, axis=1, kind="stable")
+        counts = keep.sum(axis=1)
+        vertices = candidates[rows, order][:, :max(counts.max(initial=0), 1)]
+    return vertices.reshape(shape + vertices.shape[1:]), counts.reshape(shape)
+
+
+def intersection_polygons(corners1, corners2):
+    """Get the intersection polygons of quadrilaterals.
+
+    Same as :func:`pyresample.spherical_geometry.intersection_polygon` for
+    ``(..., 4, 3)`` arrays of corners. The polygons go round in the same
+    direction as `corners1` and start at the same vertex as the scalar
+    version: the first corner of `corners1` inside the other quadrilateral
+    or the first intersection of the sides of `corners1` with the other
+    sides. Returns the ``(..., k, 3)`` padded vertices and the number of
+    valid vertices of each polygon, 0 if the quadrilaterals don't intersect.
+
+    """
+    corners1 = np.asarray(corners1, dtype=np.float64)
+    corners2 = np.asarray(corners2, dtype=np.float64)
+    vertices, counts = clip_convex_polygons(corners1, corners2)
+    vertices, counts = _remove_repeated_vertices(vertices, counts)
+    counts = np.where(counts < 3, 0, counts)
+
+    ends1 = np.roll(corners1, -1, axis=-2)
+    ends2 = np.roll(corners2, -1, axis=-2)
+    side_intersections = arcs_intersection(corners1[..., :, np.newaxis, :], ends1[..., :, np.newaxis, :],
+                                           corners2[..., np.newaxis, :, :], ends2[..., np.newaxis, :, :])
+    side_dists = distances(corners1[..., :, np.newaxis, :], side_intersections)
+    side_dists = np.where(np.isnan(side_dists), np.inf, side_dists)
+    closest = np.take_along_axis(side_intersections, np.argmin(side_dists, axis=-1)[..., np.newaxis, np.newaxis],
+                                 axis=-2)[..., 0, :]
+    inside = points_inside_quadrilaterals(corners1, corners2[..., np.newaxis, :, :])
+    starts = np.where(inside[..., np.newaxis], corners1, closest)
+    first_side = np.argmax(inside | np.isfinite(side_dists).any(axis=-1), axis=-1)
+    start = np.take_along_axis(starts, first_side[..., np.newaxis, np.newaxis], axis=-2)
+
+    start_dists = np.where(np.arange(vertices.shape[-2]) < counts[..., np.newaxis],
+                           distances(vertices, start), np.inf)
+    shift = np.argmin(start_dists, axis=-1)[..., np.newaxis]
+    order = (np.arange(vertices.shape[-2]) + shift) % np.maximum(counts, 1)[..., np.newaxis]
+    return np.take_along_axis(vertices, order[..., np.newaxis], axis=-2), counts
+
+
+def _remove_repeated_vertices(vertices, counts):
+    """Remove the vertices equal to the previous vertex of padded polygons."""
+    idx = np.arange(vertices.shape[-2])
+    previous = np.take_along_axis(vertices, ((idx - 1) % np.maximum(counts, 1)[..., np.newaxis])[..., np.newaxis],
+                                  axis=-2)
+    keep = (idx < counts[..., np.newaxis]) & ~(distances(vertices, previous) < EPSILON)
+    # a polygon made of a single repeated point keeps one vertex
+    keep[..., 0] |= (counts > 0) & ~keep.any(axis=-1)
+    order = np.argsort(~keep, axis=-1, kind="stable")
+    return np.take_along_axis(vertices, order[..., np.newaxis], axis=-2), keep.sum(axis=-1)
+
+
+def get_polygon_areas(vertices, counts=None):
+    """Get the areas of convex polygons on the unit sphere.
+
+    Same as :func:`pyresample.spherical_geometry.get_polygon_area` for
+    ``(..., n, 3)`` vertices of which only the first `counts` are used.
+
+    """
+    num_vertices = vertices.shape[-2]
+    if counts is None:
+        counts = num_vertices
+    first = vertices[..., :1, :]
+    second = vertices[..., 1:-1, :]
+    third = vertices[..., 2:, :]
+    # spherical excess of the triangles of a fan from the first vertex
+    excess = 2 * np.arctan2(np.abs(_dot(first, _cross(second, third))),
+                            1 + _dot(first, second) + _dot(second, third) + _dot(third, first))
+    in_polygon = np.arange(2, num_vertices) < np.asarray(counts)[..., np.newaxis]
+    return np.sum(np.where(in_polygon, excess, 0), axis=-1)
@@ -34,11 +34,11 @@ import warnings
 
 import numpy as np
 from pykdtree.kdtree import KDTree
-from pyproj import Proj
 
 from pyresample import data_reduce, geometry
+from pyresample.utils.proj4 import get_proj
 
-from ..future.resamplers._transform_utils import lonlat2xyz
+from ..future.resamplers._transform_utils import lonlat2xyz, resolve_compact_dtypes
 
 
 class BilinearBase(object):
@@ -50,7 +50,8 @@ class BilinearBase(object):
                  radius_of_influence,
                  neighbours=32,
                  epsilon=0,
-                 reduce_data=True):
+                 reduce_data=True,
+                 compact_dtypes=None):
         """Initialize resampler.
 
         Parameters
@@ -69,6 +70,14 @@ class BilinearBase(object):
         reduce_data : bool, optional
             Perform initial coarse reduction of source dataset in order
             to reduce execution time
+        compact_dtypes : bool, optional
+            Search the neighbours with ``float32`` instead of ``float64``
+            longitudes, latitudes and Cartesian coordinates, halving the
+            memory used by the KDTree. The fractional distances are still
+            computed from ``float64`` projection coordinates. See
+            :func:`pyresample.kd_tree.get_neighbour_info` for the accuracy
+            implications. If ``None`` the ``compact_dtypes`` configuration
+            option is used.
 
         """
         self.bilinear_t = None
@@ -86,6 +95,7 @@ class BilinearBase(object):
         self._neighbours = neighbours
         self._epsilon = epsilon
         self._reduce_data = reduce_data
+        self._compact_dtypes = resolve_compact_dtypes(compact_dtypes)
         self._source_geo_def = source_geo_def
         self._target_geo_def = target_geo_def
         self._radius_of_influence = radius_of_influence
@@ -110,7 +120,8 @@ class BilinearBase(object):
         if self._resample_kdtree is None:
             return
 
-        self._target_lons, self._target_lats = self._target_geo_def.get_lonlats()
+        self._target_lons, self._target_lats = self._target_geo_def.get_lonlats(
+            dtype=np.float32 if self._compact_dtypes else None)
         self._get_index_array()
 
         # Calculate vertical and horizontal fractional distances t and s
@@ -152,7 +163,7 @@ class BilinearBase(object):
             self._target_lons, self._target_lats,
             self._valid_output_indices, self._resample_kdtree,
             self._neighbours, self._epsilon,
-            self._radius_of_influence)
+            self._radius_of_influence, dtype=self._coordinate_dtype)
         self._index_array = self._reduce_index_array(index_array)
 
     def _reduce_index_array(self, index_array):
@@ -170,15 +181,16 @@ class BilinearBase(object):
         self.bilinear_t, self.bilinear_s = _get_fractional_distances(
             corner_points, out_x, out_y)
 
+    @property
+    def _coordinate_dtype(self):
+        return np.float32 if self._compact_dtypes else np.float64
+
     def _get_output_xy(self):
-        out_x, out_y = _get_output_xy(self._target_geo_def)
-        out_x = out_x[self._valid_output_indices]
-        out_y = out_y[self._valid_output_indices]
-        return out_x, out_y
+        return _get_output_xy(self._target_geo_def, self._valid_output_indices)
 
     def _get_input_xy(self):
         return _get_input_xy(self._source_geo_def,
-                             Proj(self._target_geo_def.proj_str),
+                             get_proj(self._target_geo_def.proj_str),
                              self._valid_input_index, self._index_array)
 
     def _get_target_proj_vectors(self):
@@ -223,9 +235,9 @@ class BilinearBase(object):
                                    self._target_geo_def,
                                    self._reduce_data,
                                    self._radius_of_influence)
-        input_coords = lonlat2xyz(source_lons, source_lats)
         valid_input_index = np.ravel(valid_input_index)
-        input_coords = input_coords[valid_input_index, :].astype(np.float64)
+        input_coords = lonlat2xyz(source_lons[valid_input_index], source_lats[valid_input_index],
+                                  dtype=self._coordinate_dtype)
 
         return valid_input_index, input_coords
 
@@ -272,9 +284,14 @@ def _check_fill_value(fill_value, dtype):
     return fill_value
 
 
-def _get_output_xy(target_geo_def):
-    out_x, out_y = target_geo_def.get_proj_coords()
-    return np.ravel(out_x), np.ravel(out_y)
+def _get_output_xy(target_geo_def, valid_output_indices=None):
+    out_x, out_y = target_geo_def.get_proj_coords(broadcast=True)
+    if valid_output_indices is None:
+        return np.ravel(out_x), np.ravel(out_y)
+    # select the valid locations directly from the broadcast coordinates
+    # without creating the full 2D arrays
+    valid_output_indices = np.reshape(valid_output_indices, out_x.shape)
+    return out_x[valid_output_indices], out_y[valid_output_indices]
 
 
 def _get_input_xy(source_geo_def, proj, valid_input_index, index_array):
@@ -643,13 +660,13 @@ def _resample(corner_points, fractional_distances):
 
 
 def _query_no_distance(target_lons, target_lats,
-                       valid_output_index, kdtree, neighbours, epsilon, radius):
-    """Query the kdtree. No distances are returned."""
+                       valid_output_index, kdtree, neighbours, epsilon, radius, dtype=np.float64):
+    """Query the kdtree with coordinates of type ``dtype``. No distances are returned."""
     target_lons_valid = np.ravel(target_lons)[valid_output_index]
     target_lats_valid = np.ravel(target_lats)[valid_output_index]
 
     _, index_array = kdtree.query(
-        lonlat2xyz(target_lons_valid, target_lats_valid),
+        lonlat2xyz(target_lons_valid, target_lats_valid, dtype=dtype),
         k=neighbours,
         eps=epsilon,
         distance_upper_bound=radius)
@@ -24,13 +24,13 @@
 
 """XArray version of bilinear interpolation."""
 
+import time
 import warnings
 
 import dask.array as da
 import numpy as np
 import zarr
 from dask import delayed
-from pyproj import Proj
 from xarray import DataArray, Dataset
 
 from pyresample import CHUNK_SIZE
@@ -43,7 +43,9 @@ from pyresample.bilinear._base import (
     is_swath_to_grid_or_grid_to_grid,
     mask_coordinates,
 )
+from pyresample.cache_stats import record_cache_event
 from pyresample.future.resamplers._transform_utils import lonlat2xyz
+from pyresample.utils.proj4 import get_proj
 
 CACHE_INDICES = ['bilinear_s',
                  'bilinear_t',
@@ -84,7 +86,7 @@ class XArrayBilinearResampler(BilinearBase):
 
     def _get_input_xy(self):
         return _get_input_xy(self._source_geo_def,
-                             Proj(self._target_geo_def.proj_str),
+                             get_proj(self._target_geo_def.proj_str),
                              self._valid_input_index, self._index_array)
 
     def _get_output_xy(self):
@@ -192,9 +194,9 @@ class XArrayBilinearResampler(BilinearBase):
                                    self._target_geo_def,
                                    self._reduce_data,
                                    self._radius_of_influence)
-        input_coords = lonlat2xyz(source_lons, source_lats)
         valid_input_index = np.ravel(valid_input_index)
-        input_coords = input_coords[valid_input_index, :].astype(np.float64)
+        input_coords = lonlat2xyz(source_lons, source_lats, dtype=self._coordinate_dtype)
+        input_coords = input_coords[valid_input_index, :]
 
         return da.compute(valid_input_index, input_coords)
 
@@ -209,20 +211,27 @@ class XArrayBilinearResampler(BilinearBase):
                 var = var.rechunk(CHUNK_SIZE)
             zarr_out[idx_name] = (coord, var)
         zarr_out.to_zarr(filename)
+        record_cache_event("bilinear_resampling_info", "store", nbytes=zarr_out.nbytes)
 
     def load_resampling_info(self, filename):
         """Load bilinear resampling look-up tables and initialize the resampler."""
+        start_time = time.perf_counter()
         try:
             fid = zarr.open(filename, 'r')
             for val in BIL_COORDINATES:
                 cache = da.array(fid[val])
                 setattr(self, val, cache)
         except ValueError as err:
+            record_cache_event("bilinear_resampling_info", "miss")
             raise IOError("Invalid information loaded from resampling cache") from err
+        except (IOError, KeyError):
+            record_cache_event("bilinear_resampling_info", "miss")
+            raise
+        record_cache_event("bilinear_resampling_info", "hit", duration=time.perf_counter() - start_time)
 
 
 def _get_output_xy(target_geo_def):
-    out_x, out_y = target_geo_def.get_proj_coords(chunks=CHUNK_SIZE)
+    out_x, out_y = target_geo_def.get_proj_coords(chunks=CHUNK_SIZE, broadcast=True)
     return da.compute(np.ravel(out_x), np.ravel(out_y))
 
 
@@ -24,7 +24,9 @@ import dask
 import dask.array as da
 import numpy as np
 import xarray as xr
-from pyproj import Proj
+
+from pyresample.future.resamplers._transform_utils import resolve_compact_dtypes
+from pyresample.utils.proj4 import get_proj
 
 LOG = logging.getLogger(__name__)
 
@@ -139,13 +141,21 @@ class BucketResampler(object):
     >>> fractions = resampler.get_fractions(data, categories=[0, 1])
     >>> import matplotlib.pyplot as plt
     >>> plt.imshow(fractions[0]); plt.show()
+
+    With ``compact_dtypes=True`` (or the ``compact_dtypes`` configuration
+    option) the projection coordinates of the source pixels are kept as
+    ``float32``, halving the memory used while computing the bucket
+    indices. The ``float32`` coordinates have a resolution of up to 1 m in
+    typical projections so pixels closer than that to the edge of a bucket
+    may be put in the neighbouring bucket.
     """
 
-    def __init__(self, target_area, source_lons, source_lats):
+    def __init__(self, target_area, source_lons, source_lats, compact_dtypes=None):
         self.target_area = target_area
         self.source_lons = source_lons
         self.source_lats = source_lats
-        self.prj = Proj(self.target_area.proj_dict)
+        self.compact_dtypes = resolve_compact_dtypes(compact_dtypes)
+        self.prj = get_proj(self.target_area.crs)
         self.x_idxs = None
         self.y_idxs = None
         self.idxs = None
@@ -163,6 +173,8 @@ class BucketResampler(object):
             Latitude coordinates
         """
         proj_x, proj_y = self.prj(lons, lats)
+        if self.compact_dtypes:
+            return np.stack((proj_x, proj_y)).astype(np.float32, copy=False)
         return np.stack((proj_x, proj_y))
 
     def _get_indices(self):
@@ -180,9 +192,10 @@ class BucketResampler(object):
         # Transform source lons/lats to target projection coordinates x/y
         lons = self.source_lons.ravel()
         lats = self.source_lats.ravel()
+        dtype = np.float32 if self.compact_dtypes else lons.dtype
         result = da.map_blocks(self._get_proj_coordinates, lons, lats,
-                               meta=np.array((), dtype=lons.dtype),
-                               dtype=lons.dtype,
+                               meta=np.array((), dtype=dtype),
+                               dtype=dtype,
                                new_axis=0, chunks=(2,) + lons.chunks)
         proj_x = result[0, :]
         proj_y = result[1, :]
@@ -0,0 +1,138 @@
+"""Statistics about the use of the caches in pyresample.
+
+Every cache in pyresample reports when it is used. Each cache is identified
+by a name:
+
+* ``geometry_slices`` and ``swath_slices``: Slices of areas and swaths
+  cached by the ``cache_geometry_slices`` option, in memory or on disk.
+* ``neighbour_info``: On-disk neighbour information cached by the
+  ``cache_neighbour_info`` option.
+* ``source_kdtree``: Source KDTrees shared through
+  :func:`~pyresample.future.resamplers.nearest.get_source_kdtree`.
+* ``nearest_precompute``: The in-memory cache of
+  :class:`~pyresample.future.resamplers.nearest.KDTreeNearestXarrayResampler`.
+* ``bilinear_resampling_info``: Look-up tables saved and loaded with the
+  ``save_resampling_info`` and ``load_resampling_info`` methods of the
+  bilinear resamplers.
+* ``ewa_ll2cr``: The in-memory cache of the EWA resamplers.
+* ``area_lonlats``: Longitudes and latitudes of areas cached by the
+  ``area_lonlats_cache_size`` option.
+* ``transformers``: pyproj transformers cached by the
+  ``transformer_cache_size`` option.
+
+For each cache the number of ``hits`` and ``misses``, the number of bytes
+written (``bytes_stored``) and the time in seconds spent loading results on
+a hit (``load_time``) and computing results on a miss (``compute_time``) are
+collected. Caches holding dask arrays only time how long it takes to create
+the dask task graph, not the time needed to compute it.
+
+.. code-block:: python
+
+    from pyresample import cache_stats
+    # ... resampling code ...
+    print(cache_stats.get_cache_stats())
+
+Functions added with :func:`add_cache_callback` are called with every
+recorded event which can be used to forward the statistics to other
+monitoring tools.
+
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+CACHE_EVENTS = ("hit", "miss", "store")
+
+_STATS: dict[str, dict[str, float]] = {}
+_CALLBACKS: list[Callable[[str, str, float, int], None]] = []
+_LOCK = threading.Lock()
+
+
+def _empty_stats() -> dict[str, float]:
+    return {"hits": 0, "misses": 0, "bytes_stored": 0, "load_time": 0.0, "compute_time": 0.0}
+
+
+def record_cache_event(cache_name: str, event: str, duration: float = 0.0, nbytes: int = 0) -> None:
+    """Record that a cache was used.
+
+    Args:
+        cache_name: Name of the cache.
+        event: One of ``"hit"`` (a result was found in the cache and
+            ``duration`` seconds were spent loading it), ``"miss"`` (a
+            result wasn't found and ``duration`` seconds were spent computing
+            it) or ``"store"`` (``nbytes`` bytes were written to the cache).
+        duration: Time in seconds spent loading or computing the result.
+        nbytes: Number of bytes written to the cache.
+
+    """
+    if event not in CACHE_EVENTS:
+        raise ValueError(f"Unknown cache event '{event}', expected one of {CACHE_EVENTS}")
+    with _LOCK:
+        stats = _STATS.setdefault(cache_name, _empty_stats())
+        if event == "hit":
+            stats["hits"] += 1
+            stats["load_time"] += duration
+        elif event == "miss":
+            stats["misses"] += 1
+            stats["compute_time"] += duration
+        else:
+            stats["bytes_stored"] += nbytes
+        callbacks = list(_CALLBACKS)
+    for callback in callbacks:
+        callback(cache_name, event, duration, nbytes)
+
+
+@contextmanager
+def timed_cache_event(cache_name: str, event: str) -> Iterator[None]:
+    """Record a cache event that took as long as the wrapped block of code."""
+    start_time = time.perf_counter()
+    yield
+    record_cache_event(cache_name, event, duration=time.perf_counter() - start_time)
+
+
+def get_cache_stats(cache_name: str | None = None) -> dict:
+    """Get a copy of the statistics collected so far.
+
+    Args:
+        cache_name: Only return the statistics of this cache. Caches that
+            haven't been used yet report zero for everything.
+
+    Returns:
+        Dictionary of statistics (``hits``, ``misses``, ``bytes_stored``,
+        ``load_time`` and ``compute_time``) if ``cache_name`` is provided,
+        otherwise a dictionary mapping the name of every used cache to its
+        statistics.
+
+    """
+    with _LOCK:
+        if cache_name is not None:
+            return dict(_STATS.get(cache_name, _empty_stats()))
+        return {name: dict(stats) for name, stats in _STATS.items()}
+
+
+def reset_cache_stats() -> None:
+    """Forget all statistics collected so far."""
+    with _LOCK:
+        _STATS.clear()
+
+
+def add_cache_callback(callback: Callable[[str, str, float, int], None]) -> None:
+    """Call a function for every recorded cache event.
+
+    The function is called with the same arguments as
+    :func:`record_cache_event`: the name of the cache, the event, the
+    duration in seconds and the number of bytes stored. It is called from
+    the thread using the cache and should return quickly.
+
+    """
+    with _LOCK:
+        _CALLBACKS.append(callback)
+
+
+def remove_cache_callback(callback: Callable[[str, str, float, int], None]) -> None:
+    """Stop calling a function added with :func:`add_cache_callback`."""
+    with _LOCK:
+        _CALLBACKS.remove(callback)
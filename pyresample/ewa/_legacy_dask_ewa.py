@@ -18,12 +18,14 @@
 """EWA algorithms operating on numpy arrays."""
 
 import logging
+import time
 
 import dask
 import dask.array as da
 import numpy as np
 
 from pyresample import CHUNK_SIZE
+from pyresample.cache_stats import record_cache_event
 from pyresample.ewa import fornav, ll2cr
 from pyresample.future.resamplers.resampler import update_resampled_coords
 from pyresample.geometry import SwathDefinition
@@ -131,7 +133,9 @@ class LegacyDaskEWAResampler(BaseResampler):
         if self.cache:
             # this resampler should be used for one SwathDefinition
             # no need to recompute ll2cr output again
+            record_cache_event("ewa_ll2cr", "hit")
             return None
+        start_time = time.perf_counter()
 
         if kwargs.get('mask') is not None:
             LOG.warning("'mask' parameter has no affect during EWA "
@@ -167,6 +171,7 @@ class LegacyDaskEWAResampler(BaseResampler):
             "cols": cols,
         }
 
+        record_cache_event("ewa_ll2cr", "miss", duration=time.perf_counter() - start_time)
         return None
 
     def _call_fornav(self, cols, rows, target_geo_def, data,
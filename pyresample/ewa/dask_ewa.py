@@ -30,6 +30,7 @@ usage until necessary.
 """
 import logging
 import math
+import time
 from functools import partial
 
 import dask
@@ -38,6 +39,7 @@ import numpy as np
 from dask.array.core import normalize_chunks
 from dask.highlevelgraph import HighLevelGraph
 
+from pyresample.cache_stats import record_cache_event
 from pyresample.ewa import ll2cr
 from pyresample.ewa._fornav import (
     fornav_weights_and_sums_wrapper,
@@ -256,7 +258,9 @@ class DaskEWAResampler(BaseResampler):
         if self.cache:
             # this resampler should be used for one SwathDefinition
             # no need to recompute ll2cr output again
+            record_cache_event("ewa_ll2cr", "hit")
             return None
+        start_time = time.perf_counter()
 
         if kwargs.get('mask') is not None:
             logger.warning("'mask' parameter has no affect during EWA "
@@ -282,6 +286,7 @@ class DaskEWAResampler(BaseResampler):
             'll2cr_result': ll2cr_result,
             'll2cr_blocks': block_cache,
         }
+        record_cache_event("ewa_ll2cr", "miss", duration=time.perf_counter() - start_time)
         return None
 
     def _get_input_tuples(self, data):
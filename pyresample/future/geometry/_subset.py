@@ -18,7 +18,9 @@ if TYPE_CHECKING:
     from pyresample import AreaDefinition
 
 
-@cache_to_json_if("cache_geometry_slices")
+@cache_to_json_if("cache_geometry_slices",
+                  memory_size_config_key="cache_geometry_slices_memory_size",
+                  max_entries_config_key="cache_geometry_slices_max_entries")
 def get_area_slices(
         src_area: AreaDefinition,
         area_to_cover: AreaDefinition,
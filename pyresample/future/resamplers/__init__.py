@@ -19,7 +19,12 @@
 
 from __future__ import annotations
 
-from .nearest import KDTreeNearestXarrayResampler  # noqa
+from .nearest import (  # noqa
+    KDTreeNearestXarrayResampler,
+    SourceKDTree,
+    clear_source_kdtree_cache,
+    get_source_kdtree,
+)
 from .registry import (  # noqa
     create_resampler,
     list_resamplers,
@@ -18,9 +18,40 @@
 """Helper functions related to transforming coordinates."""
 import numpy as np
 
+from pyresample import config
+from pyresample._spatial_mp import (
+    get_separable_lonlat_vectors,
+    separable_lonlats_to_xyz,
+)
 
-def lonlat2xyz(lons, lats):
-    """Convert lon/lat degrees to geocentric x/y/z coordinates."""
+
+def resolve_compact_dtypes(compact_dtypes=None):
+    """Get whether coordinates should be kept as ``float32``.
+
+    If ``compact_dtypes`` is ``None`` the ``compact_dtypes`` configuration
+    option is used. See :doc:`/howtos/configuration` for details.
+
+    """
+    if compact_dtypes is None:
+        compact_dtypes = config.get("compact_dtypes", False)
+    return bool(compact_dtypes)
+
+
+def lonlat2xyz(lons, lats, dtype=None):
+    """Convert lon/lat degrees to geocentric x/y/z coordinates.
+
+    If ``dtype`` is provided the longitudes and latitudes are converted to
+    it first so the whole computation is done with that precision.
+
+    """
+    separable_vectors = get_separable_lonlat_vectors(lons, lats)
+    if separable_vectors is not None:
+        if dtype is None:
+            dtype = np.result_type(lons, lats, np.float32)
+        return separable_lonlats_to_xyz(*separable_vectors, dtype=dtype)
+    if dtype is not None:
+        lons = lons.astype(dtype, copy=False)
+        lats = lats.astype(dtype, copy=False)
     R = 6370997.0
     lats = np.deg2rad(lats)
     r_cos_lats = R * np.cos(lats)
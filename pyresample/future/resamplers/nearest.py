@@ -15,18 +15,22 @@
 """Nearest neighbor resampler."""
 from __future__ import annotations
 
+import threading
+import uuid
 import warnings
+from collections import OrderedDict
 from copy import deepcopy
 from logging import getLogger
 
 import numpy as np
 from pykdtree.kdtree import KDTree
 
-from pyresample import CHUNK_SIZE, geometry
+from pyresample import CHUNK_SIZE, config, geometry
+from pyresample.cache_stats import record_cache_event, timed_cache_event
 from pyresample.utils.errors import PerformanceWarning
 
 from ..geometry import StaticGeometry, SwathDefinition
-from ._transform_utils import lonlat2xyz
+from ._transform_utils import lonlat2xyz, resolve_compact_dtypes
 from .resampler import Resampler, update_resampled_coords
 
 logger = getLogger(__name__)
@@ -44,9 +48,14 @@ except ImportError:
 def query_no_distance(target_lons, target_lats, valid_output_index,
                       mask=None, valid_input_index=None,
                       neighbours=None, epsilon=None, radius=None,
-                      kdtree=None):
+                      kdtree=None, index_dtype=int):
     """Query the kdtree. No distances are returned.
 
+    The returned index array has the type ``index_dtype`` and uses ``-1``
+    for target pixels without a valid neighbor. The query coordinates are
+    converted to the data type of the kdtree so the tree may be built from
+    ``float32`` coordinates.
+
     NOTE: Dask array arguments must always come before other keyword arguments
           for `da.blockwise` arguments to work.
     """
@@ -58,7 +67,7 @@ def query_no_distance(target_lons, target_lats, valid_output_index,
     target_lons_valid = target_lons.ravel()[voir]
     target_lats_valid = target_lats.ravel()[voir]
 
-    coords = lonlat2xyz(target_lons_valid, target_lats_valid)
+    coords = lonlat2xyz(target_lons_valid, target_lats_valid, dtype=kdtree.data.dtype)
     distance_array, index_array = kdtree.query(
         coords,
         k=neighbours,
@@ -76,7 +85,7 @@ def query_no_distance(target_lons, target_lats, valid_output_index,
     # index_array is 2D (valid output pixels, neighbors)
     # there are as many Trues in voi as rows in index_array
     good_pixels = index_array < kdtree.n
-    res_ia = np.empty(shape, dtype=int)
+    res_ia = np.empty(shape, dtype=index_dtype)
     mask = np.zeros(shape, dtype=bool)
     mask[voi, :] = good_pixels
     res_ia[mask] = index_array[good_pixels]
@@ -98,6 +107,401 @@ def _my_index(index_arr, vii, data_arr, vii_slices=None, ia_slices=None,
     return res
 
 
+class SourceKDTree:
+    """KDTree of the valid pixels of a source geometry.
+
+    The KDTree of a source geometry only depends on the source geolocation,
+    so a single instance can be shared by any number of resamplers and calls
+    to :func:`pyresample.kd_tree.get_neighbour_info` that resample the same
+    source to different target geometries. The tree is built the first time
+    it is needed and kept for the lifetime of this object.
+
+    Use :func:`get_source_kdtree` to get an instance that is also shared
+    with other users of the same source geometry.
+
+    Args:
+        source_geo_def: Geometry definition of the source.
+        compact_dtypes: Build the tree from ``float32`` instead of ``float64``
+            geocentric coordinates. If ``None`` the ``compact_dtypes``
+            configuration option is used.
+
+    """
+
+    def __init__(self, source_geo_def, compact_dtypes=None):
+        """Prepare the tree without building it."""
+        self.source_geo_def = source_geo_def
+        self.compact_dtypes = resolve_compact_dtypes(compact_dtypes)
+        self._valid_input_index = None
+        self._kdtree = None
+        self._lock = threading.Lock()
+        self._token = uuid.uuid4().hex
+
+    @property
+    def is_built(self):
+        """Whether or not the tree has been built."""
+        return self._valid_input_index is not None
+
+    @property
+    def valid_input_index(self):
+        """Flat boolean array of the source pixels with valid coordinates."""
+        if not self.is_built:
+            self._build()
+        return self._valid_input_index
+
+    @property
+    def kdtree(self):
+        """KDTree of the geocentric coordinates of the valid source pixels.
+
+        Raises a ``ValueError`` if the source has no valid pixels.
+
+        """
+        if not self.is_built:
+            self._build()
+        if self._kdtree is None:
+            raise ValueError('No valid data points in input data')
+        return self._kdtree
+
+    @property
+    def _coordinate_dtype(self):
+        return np.float32 if self.compact_dtypes else np.float64
+
+    def _build(self):
+        source_lons, source_lats = self.source_geo_def.get_lonlats(
+            dtype=np.float32 if self.compact_dtypes else None)
+        source_lons = np.asanyarray(source_lons).ravel()
+        source_lats = np.asanyarray(source_lats).ravel()
+        valid_input_idx = ((source_lons >= -180) & (source_lons <= 180) & (source_lats <= 90) & (source_lats >= -90))
+        if isinstance(valid_input_idx, np.ma.MaskedArray):
+            valid_input_idx = valid_input_idx.filled(False)
+        input_coords = lonlat2xyz(np.asarray(source_lons[valid_input_idx]),
+                                  np.asarray(source_lats[valid_input_idx]),
+                                  dtype=self._coordinate_dtype)
+        self._get_kdtree(valid_input_idx, input_coords)
+
+    def __getstate__(self):
+        """Get the state to pickle, for example to send to dask workers.
+
+        Neither the lock nor the KDTree can be pickled, the tree is built
+        again in the other process when it is needed.
+
+        """
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_valid_input_index"] = None
+        state["_kdtree"] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore the pickled state with a new lock."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _get_kdtree(self, valid_input_idx=None, input_coords=None):
+        if input_coords is None:
+            # already built, or to build again after being pickled
+            if not self.is_built:
+                self._build()
+            return self._kdtree
+        with self._lock:
+            if not self.is_built:
+                if input_coords.size:
+                    self._kdtree = KDTree(input_coords.astype(self._coordinate_dtype, copy=False))
+                self._valid_input_index = np.asarray(valid_input_idx).ravel()
+        return self._kdtree
+
+    def to_dask(self, chunks=CHUNK_SIZE):
+        """Get the valid input index and the KDTree for use in dask graphs.
+
+        Args:
+            chunks: Chunk size of the returned valid input index.
+
+        Returns:
+            Tuple of the valid input index as a boolean dask array with the
+            shape of the source geometry and a ``Delayed`` object for the
+            KDTree. If the tree hasn't been built yet it is built the first
+            time the delayed object is computed and kept for later use.
+
+        """
+        if self.is_built:
+            valid_input_idx = da.from_array(
+                self._valid_input_index.reshape(self.source_geo_def.shape), chunks=chunks)
+            delayed_kdtree = dask.delayed(self._get_kdtree, pure=True)(
+                dask_key_name="source-kdtree-built-" + self._token)
+            return valid_input_idx, delayed_kdtree
+
+        source_lons, source_lats = self.source_geo_def.get_lonlats(
+            chunks=chunks, dtype=np.float32 if self.compact_dtypes else None)
+        valid_input_idx = ((source_lons >= -180) & (source_lons <= 180) & (source_lats <= 90) & (source_lats >= -90))
+        input_coords = lonlat2xyz(source_lons, source_lats, dtype=self._coordinate_dtype)
+        input_coords = input_coords[valid_input_idx.ravel(), :]
+        delayed_kdtree = dask.delayed(self._get_kdtree, pure=True)(
+            valid_input_idx, input_coords, dask_key_name="source-kdtree-" + self._token)
+        return valid_input_idx, delayed_kdtree
+
+
+_SOURCE_KDTREE_CACHE: OrderedDict[tuple, SourceKDTree] = OrderedDict()
+_SOURCE_KDTREE_CACHE_LOCK = threading.Lock()
+
+
+def get_source_kdtree(source_geo_def, compact_dtypes=None):
+    """Get a :class:`SourceKDTree` for a source geometry.
+
+    The ``source_kdtree_cache_size`` most recently used instances are kept
+    in memory, keyed by the hash of the source geometry, and returned again
+    for the same source geometry. If the cache size is 0 (the default) a new
+    instance is returned. See :doc:`/howtos/configuration` for details.
+
+    Args:
+        source_geo_def: Geometry definition of the source.
+        compact_dtypes: Build the tree from ``float32`` instead of ``float64``
+            geocentric coordinates. If ``None`` the ``compact_dtypes``
+            configuration option is used.
+
+    """
+    compact_dtypes = resolve_compact_dtypes(compact_dtypes)
+    max_size = config.get("source_kdtree_cache_size", 0)
+    if not max_size:
+        return SourceKDTree(source_geo_def, compact_dtypes=compact_dtypes)
+
+    key = (source_geo_def.update_hash().hexdigest(), bool(compact_dtypes))
+    with _SOURCE_KDTREE_CACHE_LOCK:
+        source_kdtree = _SOURCE_KDTREE_CACHE.pop(key, None)
+        record_cache_event("source_kdtree", "miss" if source_kdtree is None else "hit")
+        if source_kdtree is None:
+            source_kdtree = SourceKDTree(source_geo_def, compact_dtypes=compact_dtypes)
+        _SOURCE_KDTREE_CACHE[key] = source_kdtree
+        while len(_SOURCE_KDTREE_CACHE) > max_size:
+            _SOURCE_KDTREE_CACHE.popitem(last=False)
+    return source_kdtree
+
+
+def clear_source_kdtree_cache():
+    """Remove all instances from the :func:`get_source_kdtree` cache."""
+    with _SOURCE_KDTREE_CACHE_LOCK:
+        _SOURCE_KDTREE_CACHE.clear()
+
+
+def _valid_lonlats(lons, lats):
+    return (lons >= -180) & (lons <= 180) & (lats <= 90) & (lats >= -90)
+
+
+def _lonlat_xyz_bbox(lons, lats):
+    """Get the geocentric bounding box of the valid coordinates of one chunk.
+
+    Returns a ``(2, 3)`` array of the minimum and maximum x, y and z or
+    ``None`` if there are no valid coordinates.
+
+    """
+    valid = _valid_lonlats(lons, lats)
+    if not valid.any():
+        return None
+    coords = lonlat2xyz(lons[valid], lats[valid])
+    return np.stack((coords.min(axis=0), coords.max(axis=0)))
+
+
+def _create_chunk_kdtree(lons, lats, block_offset, source_shape, dtype=np.float64):
+    """Create the KDTree of the valid pixels of one source chunk.
+
+    Returns the tree, the flat indexes of the tree's pixels in the full
+    source array and the valid pixel mask of the chunk, or ``None`` if the
+    chunk has no valid pixels. The tree is built from coordinates of type
+    ``dtype``.
+
+    """
+    valid = _valid_lonlats(lons, lats)
+    if not valid.any():
+        return None
+    coords = lonlat2xyz(lons[valid], lats[valid], dtype=dtype)
+    block_rows_cols = np.nonzero(valid)
+    source_rows_cols = tuple(block_rows_cols[dim] + offset for dim, offset in enumerate(block_offset))
+    source_index = np.ravel_multi_index(source_rows_cols, source_shape)
+    return KDTree(coords), source_index, valid.ravel()
+
+
+def _query_chunk_kdtrees(target_lons, target_lats, chunk_kdtrees, mask_blocks,
+                         neighbours=1, epsilon=0, radius=None):
+    """Query the KDTrees of several source chunks for one target chunk.
+
+    The neighbours found in all trees are merged by distance. Returned indexes
+    are flat indexes in to the full source array with ``-1`` for target pixels
+    without a valid neighbor.
+
+    """
+    valid_output_index = _valid_lonlats(target_lons, target_lats).ravel()
+    res_ia = np.full((valid_output_index.size, neighbours), -1, dtype=np.int64)
+    coords = lonlat2xyz(target_lons.ravel()[valid_output_index],
+                        target_lats.ravel()[valid_output_index])
+    all_distances = []
+    all_indexes = []
+    for chunk_idx, chunk_kdtree in enumerate(chunk_kdtrees):
+        if chunk_kdtree is None or not coords.shape[0]:
+            continue
+        kdtree, source_index, valid = chunk_kdtree
+        mask = mask_blocks[chunk_idx]
+        if mask is not None:
+            mask = mask.ravel()[valid]
+        distance_array, index_array = kdtree.query(
+            coords.astype(kdtree.data.dtype, copy=False), k=neighbours, eps=epsilon,
+            distance_upper_bound=radius, mask=mask)
+        distance_array = distance_array.reshape(-1, neighbours)
+        index_array = index_array.reshape(-1, neighbours)
+        good_pixels = index_array < kdtree.n
+        chunk_ia = np.full(index_array.shape, -1, dtype=np.int64)
+        chunk_ia[good_pixels] = source_index[index_array[good_pixels]]
+        all_distances.append(np.where(good_pixels, distance_array, np.inf))
+        all_indexes.append(chunk_ia)
+
+    if all_distances:
+        distance_array = np.concatenate(all_distances, axis=1)
+        index_array = np.concatenate(all_indexes, axis=1)
+        closest = np.argsort(distance_array, axis=1, kind="stable")[:, :neighbours]
+        res_ia[valid_output_index] = np.take_along_axis(index_array, closest, axis=1)
+    return res_ia.reshape(target_lons.shape + (neighbours,))
+
+
+def _query_area_nearest(target_lons, target_lats, source_area, radius=None, max_steps=50):
+    """Find the nearest source pixel of target pixels by projecting them in to a source area.
+
+    Instead of searching a KDTree of all source pixels, each target pixel is
+    projected to the source area's array coordinates and the geocentric
+    distances to the 3x3 source pixels around the closest array position are
+    compared. While the closest of these is not the center pixel the search
+    is repeated around it, up to ``max_steps`` times. This finds the same
+    neighbor as a KDTree search, except for target pixels that can't be
+    projected to the source projection or that only have invalid source
+    pixels around them, like the space beyond the limb of a geostationary
+    source area.
+
+    Returns:
+        Tuple of the flat index in to the source area and the geocentric
+        distance for every target pixel. Target pixels without a source pixel
+        closer than ``radius`` get an index of ``-1`` and an infinite
+        distance.
+
+    """
+    target_lons = np.asarray(target_lons, dtype=np.float64)
+    target_lats = np.asarray(target_lats, dtype=np.float64)
+    index_array = np.full(target_lons.size, -1, dtype=np.int64)
+    distance_array = np.full(target_lons.size, np.inf)
+    target_pos = np.flatnonzero(_valid_lonlats(target_lons, target_lats))
+    cols, rows = source_area.get_array_coordinates_from_lonlat(target_lons.ravel()[target_pos],
+                                                               target_lats.ravel()[target_pos])
+    cols = np.atleast_1d(cols)
+    rows = np.atleast_1d(rows)
+    projectable = np.isfinite(cols) & np.isfinite(rows)
+    target_pos = target_pos[projectable]
+    best_rows = np.clip(np.round(rows[projectable]), 0, source_area.height - 1).astype(np.intp)
+    best_cols = np.clip(np.round(cols[projectable]), 0, source_area.width - 1).astype(np.intp)
+    best_dist2 = np.full(target_pos.size, np.inf)
+    target_coords = lonlat2xyz(target_lons.ravel()[target_pos], target_lats.ravel()[target_pos])
+
+    active = np.arange(target_pos.size)
+    for _ in range(max_steps):
+        if not active.size:
+            break
+        center_rows = best_rows[active]
+        center_cols = best_cols[active]
+        moved = _search_closest_pixels(center_rows, center_cols, target_coords[active], source_area,
+                                       best_rows, best_cols, best_dist2, active)
+        active = active[moved]
+
+    best_dist = np.sqrt(best_dist2)
+    found = best_dist < (np.inf if radius is None else radius)
+    index_array[target_pos[found]] = best_rows[found] * source_area.width + best_cols[found]
+    distance_array[target_pos[found]] = best_dist[found]
+    return index_array.reshape(target_lons.shape), distance_array.reshape(target_lons.shape)
+
+
+def _search_closest_pixels(center_rows, center_cols, target_coords, source_area,
+                           best_rows, best_cols, best_dist2, active):
+    """Update the closest source pixels with the 3x3 pixels around the current ones.
+
+    Returns a boolean array of the targets whose closest pixel changed.
+
+    """
+    # only compute the coordinates of the source pixels that are candidates
+    row_start = max(center_rows.min() - 1, 0)
+    col_start = max(center_cols.min() - 1, 0)
+    window_width = min(center_cols.max() + 2, source_area.width) - col_start
+    window_height = min(center_rows.max() + 2, source_area.height) - row_start
+    candidates = list(_get_candidate_pixels(center_rows, center_cols, source_area.shape))
+    is_candidate = np.zeros(window_height * window_width, dtype=bool)
+    for cand_rows, cand_cols in candidates:
+        is_candidate[(cand_rows - row_start) * window_width + cand_cols - col_start] = True
+    window_index = np.flatnonzero(is_candidate)
+    source_lons, source_lats = source_area.get_lonlat_from_array_coordinates(
+        col_start + window_index % window_width, row_start + window_index // window_width)
+    source_lons = np.atleast_1d(source_lons)
+    source_lats = np.atleast_1d(source_lats)
+    source_coords = lonlat2xyz(source_lons, source_lats)
+    source_coords[~_valid_lonlats(source_lons, source_lats)] = np.nan
+    window_lookup = np.empty(is_candidate.size, dtype=np.intp)
+    window_lookup[window_index] = np.arange(window_index.size)
+
+    dist2 = best_dist2[active]
+    rows = center_rows.copy()
+    cols = center_cols.copy()
+    for cand_rows, cand_cols in candidates:
+        diff = source_coords[window_lookup[(cand_rows - row_start) * window_width + cand_cols - col_start]]
+        diff -= target_coords
+        cand_dist2 = np.einsum('ij,ij->i', diff, diff)
+        closer = cand_dist2 < dist2
+        dist2[closer] = cand_dist2[closer]
+        rows[closer] = cand_rows[closer]
+        cols[closer] = cand_cols[closer]
+    moved = (rows != center_rows) | (cols != center_cols)
+    best_dist2[active] = dist2
+    best_rows[active] = rows
+    best_cols[active] = cols
+    return moved
+
+
+def _get_candidate_pixels(center_rows, center_cols, shape):
+    # center first so that it is kept when a neighbor is at the same distance
+    for row_offset in (0, -1, 1):
+        cand_rows = np.clip(center_rows + row_offset, 0, shape[0] - 1)
+        for col_offset in (0, -1, 1):
+            yield cand_rows, np.clip(center_cols + col_offset, 0, shape[1] - 1)
+
+
+def _query_area_nearest_no_distance(target_lons, target_lats, source_area=None, radius=None):
+    """Query the nearest source area pixels for use with ``da.blockwise``."""
+    index_array = _query_area_nearest(target_lons, target_lats, source_area, radius=radius)[0]
+    return index_array[..., np.newaxis]
+
+
+# Projections of the view from a point in space. Near their limb the source
+# pixels are too distorted for the search around the projected position.
+_PERSPECTIVE_PROJECTION_METHODS = ("geostationary", "orthographic", "perspective", "tpers")
+
+
+def _can_project_to_source_area(source_geo_def, target_geo_def):
+    """Check if the nearest source pixels can be found by projecting the target pixels."""
+    if not (isinstance(source_geo_def, geometry.AreaDefinition) and
+            isinstance(target_geo_def, geometry.AreaDefinition)):
+        return False
+    coord_operation = source_geo_def.crs.coordinate_operation
+    method_name = "" if coord_operation is None else coord_operation.method_name.lower()
+    return not any(perspective_name in method_name for perspective_name in _PERSPECTIVE_PROJECTION_METHODS)
+
+
+def _bboxes_overlap(bbox1, bbox2, margin):
+    if bbox1 is None or bbox2 is None:
+        return False
+    return bool(np.all(bbox1[0] <= bbox2[1] + margin) and np.all(bbox1[1] >= bbox2[0] - margin))
+
+
+def _get_block_offset(chunks, block_index):
+    return tuple(sum(chunks[dim][:idx]) for dim, idx in enumerate(block_index))
+
+
+def _get_shared_source_kdtree(source_kdtree, source_geo_def, compact_dtypes=None):
+    """Get the source kdtree a dask resampler should use, if any."""
+    if source_kdtree is None and config.get("source_kdtree_cache_size", 0):
+        source_kdtree = get_source_kdtree(source_geo_def, compact_dtypes=compact_dtypes)
+    return source_kdtree
+
+
 # TODO: Add decorator for geom<->geom support
 # TODO: Add decorator for object type support
 # Must be decorators so that we can both add class attributes with this information
@@ -108,7 +512,10 @@ class KDTreeNearestXarrayResampler(Resampler):
     def __init__(self,
                  source_geo_def: StaticGeometry,
                  target_geo_def: StaticGeometry,
-                 cache=None):
+                 cache=None,
+                 source_kdtree: SourceKDTree | None = None,
+                 chunked_kdtree: bool = False,
+                 compact_dtypes: bool | None = None):
         """Resampler for xarray DataArrays using a nearest neighbor algorithm.
 
         Parameters
@@ -117,12 +524,42 @@ class KDTreeNearestXarrayResampler(Resampler):
             Geometry definition of source
         target_geo_def : object
             Geometry definition of target
+        source_kdtree : SourceKDTree, optional
+            KDTree of the source geometry shared with other resamplers. If
+            not provided one is taken from :func:`get_source_kdtree` when
+            its cache is enabled, otherwise a new tree is built.
+        chunked_kdtree : bool, optional
+            Build one KDTree per chunk of the source geolocation instead of
+            a single tree for the whole source. Each target chunk only
+            queries the trees of the source chunks whose geocentric
+            bounding box is within ``radius_of_influence`` of its own, and
+            the closest of the neighbors found in these trees is used. This
+            avoids loading the full source geolocation in to one task, but
+            the bounding boxes of all source and target chunks are computed
+            when the neighbor info is generated. The source and target
+            geolocation is then persisted and reused by the returned dask
+            arrays. Can't be combined with ``source_kdtree``.
+        compact_dtypes : bool, optional
+            Build the KDTrees from ``float32`` instead of ``float64``
+            geocentric coordinates and compute the longitudes and latitudes
+            of source areas as ``float32``. If ``None`` the value of
+            ``source_kdtree`` is used when given, otherwise the
+            ``compact_dtypes`` configuration option.
 
         """
         if DataArray is None:
             raise ImportError("Missing 'xarray' and 'dask' dependencies")
+        if chunked_kdtree and source_kdtree is not None:
+            raise ValueError("'chunked_kdtree' can't be used with a 'source_kdtree'")
         super().__init__(source_geo_def, target_geo_def, cache=cache)
         self._internal_cache: dict[tuple, dict] = {}
+        self.source_kdtree = source_kdtree
+        self.chunked_kdtree = chunked_kdtree
+        if compact_dtypes is None and source_kdtree is not None:
+            compact_dtypes = source_kdtree.compact_dtypes
+        self.compact_dtypes = resolve_compact_dtypes(compact_dtypes)
+        if source_kdtree is not None and bool(source_kdtree.compact_dtypes) != self.compact_dtypes:
+            raise ValueError("'compact_dtypes' does not match the 'compact_dtypes' of 'source_kdtree'")
         if self.target_geo_def.ndim != 2:
             raise ValueError("Target area definition must be 2 dimensions")
 
@@ -152,16 +589,25 @@ class KDTreeNearestXarrayResampler(Resampler):
             radius_of_influence = 10000
         return radius_of_influence
 
+    @property
+    def _lonlat_dtype(self):
+        """Data type requested for the longitudes and latitudes of areas."""
+        return np.float32 if self.compact_dtypes else None
+
+    @property
+    def _coordinate_dtype(self):
+        """Data type of the geocentric coordinates the KDTrees are built from."""
+        return np.float32 if self.compact_dtypes else np.float64
+
     def _create_resample_kdtree(self, chunks=CHUNK_SIZE):
         """Set up kd tree on input."""
         source_lons, source_lats = self.source_geo_def.get_lonlats(
-            chunks=chunks)
+            chunks=chunks, dtype=self._lonlat_dtype)
         valid_input_idx = ((source_lons >= -180) & (source_lons <= 180) & (source_lats <= 90) & (source_lats >= -90))
-        input_coords = lonlat2xyz(source_lons, source_lats)
+        input_coords = lonlat2xyz(source_lons, source_lats, dtype=self._coordinate_dtype)
         input_coords = input_coords[valid_input_idx.ravel(), :]
 
         # Build kd-tree on input
-        input_coords = input_coords.astype(np.float64)
         delayed_kdtree = dask.delayed(KDTree, pure=True)(input_coords)
         return valid_input_idx, delayed_kdtree
 
@@ -206,17 +652,28 @@ class KDTreeNearestXarrayResampler(Resampler):
             warnings.warn('Searching for %s neighbors in %s data points' %
                           (neighbors, self.source_geo_def.size), stacklevel=3)
 
+        if mask is not None and mask.shape != self.source_geo_def.shape:
+            raise ValueError("'mask' must be the same shape as the source geo definition")
+        if mask is None and neighbors == 1 and self.source_kdtree is None and \
+                _can_project_to_source_area(self.source_geo_def, self.target_geo_def):
+            return self._get_area_neighbor_info(radius_of_influence)
+        if self.chunked_kdtree:
+            return self._get_neighbor_info_chunked(mask, neighbors, radius_of_influence, epsilon)
+
         # Create kd-tree
         chunks = mask.chunks if mask is not None else CHUNK_SIZE
-        valid_input_idx, resample_kdtree = self._create_resample_kdtree(chunks=chunks)
+        source_kdtree = _get_shared_source_kdtree(self.source_kdtree, self.source_geo_def,
+                                                  compact_dtypes=self.compact_dtypes)
+        if source_kdtree is None:
+            valid_input_idx, resample_kdtree = self._create_resample_kdtree(chunks=chunks)
+        else:
+            valid_input_idx, resample_kdtree = source_kdtree.to_dask(chunks=chunks)
 
         # TODO: Add 'chunks' keyword argument to this method and use it
-        target_lons, target_lats = self.target_geo_def.get_lonlats(chunks=CHUNK_SIZE)
+        target_lons, target_lats = geometry._get_lonlats_to_read(self.target_geo_def, chunks=CHUNK_SIZE)
         valid_output_idx = ((target_lons >= -180) & (target_lons <= 180) & (target_lats <= 90) & (target_lats >= -90))
 
         if mask is not None:
-            if mask.shape != self.source_geo_def.shape:
-                raise ValueError("'mask' must be the same shape as the source geo definition")
             mask = mask.data
         index_arr = self._query_resample_kdtree(
             resample_kdtree, target_lons, target_lats, valid_input_idx,
@@ -225,6 +682,86 @@ class KDTreeNearestXarrayResampler(Resampler):
 
         return valid_input_idx, index_arr
 
+    def _get_area_neighbor_info(self, radius_of_influence):
+        """Return neighbor info between two areas without a kd-tree.
+
+        Target pixels are projected to the source area to find their nearest
+        source pixel. The returned index array holds flat indexes in to the
+        full source array so all source pixels are marked as valid input.
+
+        """
+        target_lons, target_lats = geometry._get_lonlats_to_read(self.target_geo_def, chunks=CHUNK_SIZE)
+        index_arr = da.blockwise(
+            _query_area_nearest_no_distance, 'jik', target_lons, 'ji', target_lats, 'ji',
+            source_area=self.source_geo_def, radius=radius_of_influence,
+            dtype=np.int64, meta=np.array((), dtype=np.int64),
+            new_axes={'k': 1}, concatenate=True)
+        valid_input_idx = da.ones(self.source_geo_def.shape, dtype=bool, chunks=CHUNK_SIZE)
+        return valid_input_idx, index_arr
+
+    def _get_neighbor_info_chunked(self, mask, neighbors, radius_of_influence, epsilon):
+        """Return neighbor info using one kd-tree per source chunk.
+
+        The returned index array holds flat indexes in to the full source
+        array so all source pixels are marked as valid input.
+
+        The source chunks queried for each target chunk are selected when
+        the graph is built, so this explicitly computes the bounding boxes
+        of all the chunks first. The source and target longitudes and
+        latitudes are persisted for that and the returned graph reuses them
+        instead of computing them again.
+
+        """
+        chunks = mask.chunks if mask is not None else CHUNK_SIZE
+        source_lons, source_lats = self.source_geo_def.get_lonlats(chunks=chunks, dtype=self._lonlat_dtype)
+        source_lons = da.asarray(getattr(source_lons, "data", source_lons))
+        source_lats = da.asarray(getattr(source_lats, "data", source_lats))
+        target_lons, target_lats = geometry._get_lonlats_to_read(self.target_geo_def, chunks=CHUNK_SIZE)
+        target_lons = da.asarray(getattr(target_lons, "data", target_lons))
+        target_lats = da.asarray(getattr(target_lats, "data", target_lats))
+        source_lons, source_lats, target_lons, target_lats = dask.persist(
+            source_lons, source_lats, target_lons, target_lats)
+
+        source_blocks = list(np.ndindex(source_lons.numblocks))
+        target_blocks = list(np.ndindex(target_lons.numblocks))
+        source_lon_blocks = source_lons.to_delayed()
+        source_lat_blocks = source_lats.to_delayed()
+        target_lon_blocks = target_lons.to_delayed()
+        target_lat_blocks = target_lats.to_delayed()
+        mask_blocks = mask.data.to_delayed() if mask is not None else None
+
+        bbox_func = dask.delayed(_lonlat_xyz_bbox, pure=True)
+        bboxes = dask.compute(
+            [bbox_func(source_lon_blocks[blk], source_lat_blocks[blk]) for blk in source_blocks],
+            [bbox_func(target_lon_blocks[blk], target_lat_blocks[blk]) for blk in target_blocks])
+        source_bboxes, target_bboxes = bboxes
+
+        chunk_kdtrees = [
+            dask.delayed(_create_chunk_kdtree, pure=True)(
+                source_lon_blocks[blk], source_lat_blocks[blk],
+                _get_block_offset(source_lons.chunks, blk), source_lons.shape,
+                dtype=self._coordinate_dtype)
+            for blk in source_blocks]
+        query_func = dask.delayed(_query_chunk_kdtrees, pure=True)
+        index_blocks = np.empty(target_lons.numblocks, dtype=object)
+        for target_idx, blk in enumerate(target_blocks):
+            candidates = [source_idx for source_idx in range(len(source_blocks))
+                          if _bboxes_overlap(source_bboxes[source_idx], target_bboxes[target_idx],
+                                             radius_of_influence)]
+            block_ia = query_func(
+                target_lon_blocks[blk], target_lat_blocks[blk],
+                [chunk_kdtrees[source_idx] for source_idx in candidates],
+                [None if mask_blocks is None else mask_blocks[source_blocks[source_idx]]
+                 for source_idx in candidates],
+                neighbours=neighbors, epsilon=epsilon, radius=radius_of_influence)
+            block_shape = tuple(target_lons.chunks[dim][idx] for dim, idx in enumerate(blk))
+            index_blocks[blk] = da.from_delayed(block_ia, block_shape + (neighbors,), dtype=np.int64,
+                                                meta=np.array((), dtype=np.int64))
+        index_arr = da.block([[[index_blocks[row, col]] for col in range(index_blocks.shape[1])]
+                              for row in range(index_blocks.shape[0])])
+        valid_input_idx = da.ones(source_lons.shape, dtype=bool, chunks=source_lons.chunks)
+        return valid_input_idx, index_arr
+
     def get_sample_from_neighbor_info(
             self,
             data,
@@ -380,6 +917,15 @@ class KDTreeNearestXarrayResampler(Resampler):
     def precompute(self, mask=None, radius_of_influence=None, epsilon=0):
         """Generate neighbor indexes using geolocation information and optional data mask.
 
+        If both the source and target geometries are ``AreaDefinition``
+        objects and no ``mask`` is given, no kd-tree is built. Instead each
+        target pixel is projected to the source area and the closest of the
+        source pixels around that position is used. This gives the same
+        result as the kd-tree except where source pixels are equally close
+        or at the edge of the source projection's valid domain. Source areas
+        in a geostationary or other perspective projection always use the
+        kd-tree.
+
         Args:
             mask (ArrayLike, optional):
                 Boolean array where True represents invalid pixels in the data
@@ -409,14 +955,17 @@ class KDTreeNearestXarrayResampler(Resampler):
         mask_hash = None if mask is None else mask.data.name
         internal_cache_key = (mask_hash, neighbors, radius_of_influence, epsilon)
         in_int_cache = internal_cache_key in self._internal_cache
-        if not in_int_cache:
+        if in_int_cache:
+            record_cache_event("nearest_precompute", "hit")
+            return
+        with timed_cache_event("nearest_precompute", "miss"):
             valid_input_index, index_arr = self._get_neighbor_info(
                 mask, neighbors, radius_of_influence, epsilon)
-            item_to_cache = {
-                "valid_input_index": valid_input_index,
-                "index_array": index_arr,
-            }
-            self._internal_cache[internal_cache_key] = item_to_cache
+        item_to_cache = {
+            "valid_input_index": valid_input_index,
+            "index_array": index_arr,
+        }
+        self._internal_cache[internal_cache_key] = item_to_cache
 
     def resample(self, data, mask_area=None, fill_value=np.nan,
                  radius_of_influence=None, epsilon=0):
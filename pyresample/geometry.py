@@ -20,28 +20,34 @@ from __future__ import annotations
 
 import hashlib
 import math
+import threading
+import time
 import warnings
 from collections import OrderedDict
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
 from logging import getLogger
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional, Sequence, Union
 
 import numpy as np
 import numpy.typing as npt
-import pyproj
 import yaml
 from pyproj import Geod, Proj
 from pyproj.aoi import AreaOfUse
 
 from pyresample import CHUNK_SIZE
+from pyresample._config import config
+from pyresample._geos import get_geos_projection
 from pyresample._spatial_mp import Cartesian, Cartesian_MP, Proj_MP
 from pyresample.area_config import create_area_def
 from pyresample.boundary import SimpleBoundary
+from pyresample.cache_stats import record_cache_event
 from pyresample.utils import load_cf_area
 from pyresample.utils.proj4 import (
-    get_geodetic_crs_with_no_datum_shift,
+    get_geodetic_transformer,
     get_geostationary_height,
+    get_proj,
+    get_transformer,
     ignore_pyproj_proj_warnings,
     proj4_dict_to_str,
     proj4_radius_parameters,
@@ -64,6 +70,11 @@ try:
 except ModuleNotFoundError:
     odc_geo = None
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 from pyproj import CRS
 from pyproj.enums import TransformDirection
 
@@ -115,6 +126,7 @@ class BaseDefinition:
         self.ndim = None
         self.cartesian_coords = None
         self.hash = None
+        self._content_digests: dict[str, bytes] = {}
 
     def __getitem__(self, key):
         """Slice a 2D geographic definition."""
@@ -132,18 +144,29 @@ class BaseDefinition:
         return self.hash
 
     def update_hash(self, existing_hash: Optional[_Hash] = None) -> _Hash:
-        """Update the hash."""
+        """Update the hash.
+
+        The longitude and latitude arrays are only read the first time this
+        is called for each ``swath_hash_mode`` configuration value. See
+        :doc:`/howtos/configuration` for the available modes.
+
+        """
         if existing_hash is None:
             existing_hash = hashlib.sha1()  # nosec: B324
-        existing_hash.update(get_array_hashable(self.lons))
-        existing_hash.update(get_array_hashable(self.lats))
-        try:
-            if self.lons.mask is not False:
-                existing_hash.update(get_array_hashable(self.lons.mask))
-        except AttributeError:
-            pass
+        existing_hash.update(self._get_content_digest())
         return existing_hash
 
+    def _get_content_digest(self) -> bytes:
+        hash_mode = config.get("swath_hash_mode", "fast")
+        digest = self._content_digests.get(hash_mode)
+        if digest is None:
+            digest = get_array_digest(self.lons, hash_mode) + get_array_digest(self.lats, hash_mode)
+            mask = getattr(self.lons, "mask", False)
+            if mask is not False:
+                digest += get_array_digest(mask, hash_mode)
+            self._content_digests[hash_mode] = digest
+        return digest
+
     def __eq__(self, other):
         """Test for approximate equality."""
         if self is other:
@@ -522,24 +545,29 @@ class BaseDefinition:
                 Coordinate(*self.get_lonlat(-1, -1)),
                 Coordinate(*self.get_lonlat(-1, 0))]
 
+    def _get_corners_xyz(self):
+        """Get the corners as a ``(4, 3)`` array of unit vectors."""
+        return np.array([[corner.x__, corner.y__, corner.z__] for corner in self.corners], dtype=np.float64)
+
     def __contains__(self, point):
         """Check if a point is inside the 4 corners of the current area.
 
         This uses great circle arcs as area boundaries.
         """
-        from pyresample.spherical_geometry import Coordinate, point_inside
-        corners = self.corners
+        from pyresample._spherical_arrays import points_inside_quadrilaterals
+        from pyresample.spherical_geometry import Coordinate
 
         if isinstance(point, tuple):
-            return point_inside(Coordinate(*point), corners)
-        else:
-            return point_inside(point, corners)
+            point = Coordinate(*point)
+        point_xyz = np.array([point.x__, point.y__, point.z__], dtype=np.float64)
+        return bool(points_inside_quadrilaterals(point_xyz, self._get_corners_xyz()))
 
     def overlaps(self, other):
         """Test if the current area overlaps the *other* area.
 
         This is based solely on the corners of areas, assuming the
-        boundaries to be great circles.
+        boundaries to be great circles. Use :func:`get_overlap_matrix` to
+        check many pairs of geometries at once.
 
         Parameters
         ----------
@@ -550,34 +578,8 @@ class BaseDefinition:
         -------
         overlaps : bool
         """
-        from pyresample.spherical_geometry import Arc
-
-        self_corners = self.corners
-
-        other_corners = other.corners
-
-        for i in self_corners:
-            if i in other:
-                return True
-        for i in other_corners:
-            if i in self:
-                return True
-
-        self_arc1 = Arc(self_corners[0], self_corners[1])
-        self_arc2 = Arc(self_corners[1], self_corners[2])
-        self_arc3 = Arc(self_corners[2], self_corners[3])
-        self_arc4 = Arc(self_corners[3], self_corners[0])
-
-        other_arc1 = Arc(other_corners[0], other_corners[1])
-        other_arc2 = Arc(other_corners[1], other_corners[2])
-        other_arc3 = Arc(other_corners[2], other_corners[3])
-        other_arc4 = Arc(other_corners[3], other_corners[0])
-
-        for i in (self_arc1, self_arc2, self_arc3, self_arc4):
-            for j in (other_arc1, other_arc2, other_arc3, other_arc4):
-                if i.intersects(j):
-                    return True
-        return False
+        rows, _ = _get_overlapping_pairs(self._get_corners_xyz()[np.newaxis], other._get_corners_xyz()[np.newaxis])
+        return bool(rows.size)
 
     def get_area(self):
         """Get the area of the convex area defined by the corners of the curren area."""
@@ -751,7 +753,7 @@ class CoordinateDefinition(BaseDefinition):
         lats = lats.ravel()
         alt = np.zeros_like(lons)
 
-        transformer = pyproj.Transformer.from_crs(src, dst)
+        transformer = get_transformer(src, dst)
         xyz = np.stack(transformer.transform(lons, lats, alt), axis=1)
         dist = np.linalg.norm(xyz[1] - xyz[0])
         dist = dist[np.isfinite(dist)]
@@ -808,6 +810,49 @@ def get_array_hashable(arr):
             return np.ascontiguousarray(arr).view(np.uint8)  # np array
 
 
+SWATH_HASH_MODES = ("fast", "sample", "strict")
+_HASH_SAMPLE_SIZE = 1_000_000
+
+
+def get_array_digest(arr, hash_mode: str = "fast") -> bytes:
+    """Compute a short digest identifying the contents of the array `arr`.
+
+    Dask arrays and DataArrays with a precomputed ``hash`` attribute are
+    identified the same way as in :func:`get_array_hashable` and are never
+    computed. The contents of numpy arrays are digested depending on
+    ``hash_mode``:
+
+    * ``"fast"``: all values with a 128-bit hash function. The XXH3
+      function of the ``xxhash`` package is used if it is installed,
+      otherwise the slower BLAKE2b function. The digests are used as keys
+      of the on-disk caches, so both are safe against accidental collisions.
+    * ``"sample"``: like ``"fast"`` but only about one million values
+      evenly spaced through the array, plus the shape and data type.
+    * ``"strict"``: all values with SHA1.
+
+    """
+    if hash_mode not in SWATH_HASH_MODES:
+        raise ValueError(f"Unknown hash mode '{hash_mode}', expected one of {SWATH_HASH_MODES}")
+    data = arr
+    if isinstance(arr, DataArray) and np.ndarray is not DataArray:
+        if "hash" in arr.attrs:
+            return arr.attrs["hash"]
+        data = arr.data
+    if not isinstance(data, np.ndarray):
+        return get_array_hashable(data)
+
+    if hash_mode == "strict":
+        return hashlib.sha1(np.ascontiguousarray(data).view(np.uint8)).digest()  # nosec: B324
+    header = repr((hash_mode, data.shape, data.dtype.str)).encode("utf-8")
+    if hash_mode == "sample":
+        flat_data = data.ravel(order="K")
+        data = flat_data[::max(1, flat_data.size // _HASH_SAMPLE_SIZE)]
+    buffer = np.ascontiguousarray(data).view(np.uint8).reshape(-1)
+    if xxhash is not None:
+        return header + xxhash.xxh3_128(buffer).digest()
+    return header + hashlib.blake2b(buffer, digest_size=16).digest()
+
+
 class SwathDefinition(CoordinateDefinition):
     """Swath defined by lons and lats.
 
@@ -855,7 +900,7 @@ class SwathDefinition(CoordinateDefinition):
     @staticmethod
     def _do_transform(src, dst, lons, lats, alt):
         """Run pyproj.transform and stack the results."""
-        transformer = pyproj.Transformer.from_crs(src, dst)
+        transformer = get_transformer(src, dst)
         x, y, z = transformer.transform(lons, lats, alt)
         return np.dstack((x, y, z))
 
@@ -1335,12 +1380,22 @@ class DynamicAreaDefinition(object):
         return xmin, xmax
 
 
+def _get_geos_projection(area):
+    """Get the vectorised geostationary projection of an area, None if it can't be used."""
+    crs_wkt = getattr(area, "crs_wkt", None)
+    if not isinstance(crs_wkt, str):
+        return None
+    return get_geos_projection(crs_wkt)
+
+
 def _invproj(data_x, data_y, proj_wkt):
     """Perform inverse projection."""
+    geos_proj = get_geos_projection(proj_wkt)
+    if geos_proj is not None:
+        # dask already runs the chunks in parallel
+        return np.stack(geos_proj.inverse(data_x, data_y, dtype=data_x.dtype, max_workers=1))
     # XXX: does pyproj copy arrays? What can we do so it doesn't?
-    crs = CRS.from_wkt(proj_wkt)
-    gcrs = get_geodetic_crs_with_no_datum_shift(crs)
-    transformer = pyproj.Transformer.from_crs(gcrs, crs, always_xy=True)
+    transformer = get_geodetic_transformer(proj_wkt, always_xy=True)
     lon, lat = transformer.transform(data_x, data_y, direction=TransformDirection.INVERSE)
     return np.stack([lon.astype(data_x.dtype), lat.astype(data_y.dtype)])
 
@@ -1397,6 +1452,94 @@ def _chunks_to_yx_chunks(chunks):
     return y_chunks, x_chunks
 
 
+@lru_cache(maxsize=32)
+def _is_separable_lonlat_crs(crs_wkt: str) -> bool:
+    """Check if the projection coordinates of a CRS are its longitudes and latitudes.
+
+    This is the case for geographic CRSs like EPSG:4326 or ``+proj=longlat``
+    where the inverse transformation done by
+    :meth:`AreaDefinition.get_lonlats` doesn't change the coordinates (no
+    prime meridian shift, degree units, no longitude wrapping).
+
+    """
+    if not CRS.from_wkt(crs_wkt).is_geographic:
+        return False
+    transformer = get_geodetic_transformer(crs_wkt, always_xy=True)
+    probe_x = np.array([-180.0, -179.5, -90.0, 0.0, 45.25, 90.0, 179.5, 180.0, 190.0, 359.5])
+    probe_y = np.array([-90.0, -89.5, -45.0, 0.0, 30.25, 45.0, 60.0, 89.5, 90.0, 10.0])
+    lons, lats = transformer.transform(probe_x, probe_y, direction=TransformDirection.INVERSE)
+    return bool(np.allclose(lons, probe_x, rtol=0, atol=1e-9) and np.allclose(lats, probe_y, rtol=0, atol=1e-9))
+
+
+_LONLATS_CACHE: OrderedDict[tuple, tuple] = OrderedDict()
+_LONLATS_CACHE_LOCK = threading.Lock()
+_LONLATS_CACHE_MAX_DASK_ENTRIES = 256
+
+
+def _get_lonlats_to_read(geo_def, **kwargs):
+    """Get the longitudes and latitudes of a geometry which are only read, not modified.
+
+    Geographic areas return read-only broadcast views of their longitude and
+    latitude vectors (see :meth:`AreaDefinition.get_lonlats`), which
+    consumers like the Cartesian transform of the kd-tree resampler only
+    process once per row and column.
+
+    """
+    if isinstance(geo_def, AreaDefinition):
+        kwargs["broadcast"] = True
+    return geo_def.get_lonlats(**kwargs)
+
+
+def _get_lonlats_cache_key(area, data_slice, dtype, chunks):
+    """Get the key of the lon/lat cache or None if the result can't be cached."""
+    if not config.get("area_lonlats_cache_size", 0):
+        return None
+    if area.is_separable_lonlat:
+        # broadcast views are cheaper to create than to cache
+        return None
+    slices = data_slice if isinstance(data_slice, tuple) else (data_slice,)
+    if not all(sli is None or isinstance(sli, (slice, int, np.integer)) for sli in slices):
+        # fancy indexing
+        return None
+    return hash(area), np.dtype(dtype).str, repr(data_slice), repr(chunks)
+
+
+def _get_cached_lonlats(cache_key):
+    with _LONLATS_CACHE_LOCK:
+        lonlats = _LONLATS_CACHE.get(cache_key)
+        if lonlats is not None:
+            _LONLATS_CACHE.move_to_end(cache_key)
+        return lonlats
+
+
+def _add_cached_lonlats(cache_key, lons, lats):
+    max_size = config.get("area_lonlats_cache_size", 0) or 0
+    is_dask = hasattr(lons, "chunks")
+    nbytes = 0 if is_dask else lons.nbytes + lats.nbytes
+    if nbytes > max_size:
+        return
+    if not is_dask:
+        # the same arrays are returned to every caller
+        lons.flags.writeable = False
+        lats.flags.writeable = False
+    with _LONLATS_CACHE_LOCK:
+        _LONLATS_CACHE[cache_key] = (lons, lats, nbytes)
+        total_size = sum(entry[2] for entry in _LONLATS_CACHE.values())
+        num_dask = sum(1 for entry in _LONLATS_CACHE.values() if entry[2] == 0)
+        for old_key in list(_LONLATS_CACHE):
+            if total_size <= max_size and num_dask <= _LONLATS_CACHE_MAX_DASK_ENTRIES:
+                break
+            old_nbytes = _LONLATS_CACHE.pop(old_key)[2]
+            total_size -= old_nbytes
+            num_dask -= old_nbytes == 0
+
+
+def clear_lonlats_cache():
+    """Remove all longitudes and latitudes cached by :meth:`AreaDefinition.get_lonlats`."""
+    with _LONLATS_CACHE_LOCK:
+        _LONLATS_CACHE.clear()
+
+
 class _ProjectionDefinition(BaseDefinition):
     """Base class for definitions based on CRS and area extents."""
 
@@ -1484,6 +1627,12 @@ def preserve_scalars(func):
     return wrapper
 
 
+def _are_numpy_coordinates(coord1, coord2):
+    """Check that coordinates are numpy arrays or scalars, which is what pyproj returns for them."""
+    return all(type(coord) is np.ndarray or isinstance(coord, (float, int, np.number))
+               for coord in (coord1, coord2))
+
+
 def daskify_2in_2out(func):
     """Daskify the coordinate conversion functions."""
     @wraps(func)
@@ -2235,7 +2384,10 @@ class AreaDefinition(_ProjectionDefinition):
         Returns:
             floats or arrays of floats: the projection coordinates x, y in meters
         """
-        p = Proj(self.crs)
+        geos_proj = _get_geos_projection(self)
+        if geos_proj is not None and _are_numpy_coordinates(lon, lat):
+            return geos_proj.forward(lon, lat)
+        p = get_proj(self.crs)
         return p(lon, lat)
 
     @daskify_2in_2out
@@ -2295,7 +2447,10 @@ class AreaDefinition(_ProjectionDefinition):
             floats or arrays of floats: the longitude, latitude in degrees
 
         """
-        p = Proj(self.crs)
+        geos_proj = _get_geos_projection(self)
+        if geos_proj is not None and _are_numpy_coordinates(xm, ym):
+            return geos_proj.inverse(xm, ym)
+        p = get_proj(self.crs)
         return p(xm, ym, inverse=True)
 
     def colrow2lonlat(self, cols, rows):
@@ -2304,7 +2459,7 @@ class AreaDefinition(_ProjectionDefinition):
         Both scalars and arrays are supported. To be used with scarse
         data points instead of slices (see get_lonlats).
         """
-        p = Proj(self.crs)
+        p = get_proj(self.crs)
         x = self.projection_x_coords
         y = self.projection_y_coords
         return p(x[cols], y[rows], inverse=True)
@@ -2432,7 +2587,7 @@ class AreaDefinition(_ProjectionDefinition):
             chunks = CHUNK_SIZE  # FUTURE: Use a global config object instead
         return self.get_proj_coords(chunks=chunks, dtype=dtype)
 
-    def get_proj_coords(self, data_slice=None, dtype=None, chunks=None):
+    def get_proj_coords(self, data_slice=None, dtype=None, chunks=None, broadcast=False):
         """Get projection coordinates of grid.
 
         Parameters
@@ -2443,6 +2598,14 @@ class AreaDefinition(_ProjectionDefinition):
             Data type of the returned arrays
         chunks: int or tuple, optional
             Create dask arrays and use this chunk size
+        broadcast: bool, optional
+            Return read-only broadcast views of the 1D projection vectors
+            (see :meth:`get_proj_vectors`) instead of full 2D arrays. The
+            x coordinates only vary along the columns and the y coordinates
+            only along the rows, so the views have the same values but
+            don't use any memory. With `chunks` the dask arrays broadcast
+            chunks of the 1D vectors. Use ``np.array(target_x)`` to get a
+            writable copy.
 
         Returns
         -------
@@ -2458,7 +2621,10 @@ class AreaDefinition(_ProjectionDefinition):
             dtype = self.dtype
         y_slice, x_slice = self._get_yx_data_slice(data_slice)
         if chunks is not None:
-            target_x, target_y = self._proj_coords_dask(chunks, dtype)
+            if broadcast:
+                target_x, target_y = self._broadcast_proj_coords_dask(chunks, dtype)
+            else:
+                target_x, target_y = self._proj_coords_dask(chunks, dtype)
             if y_slice is not None:
                 target_x = target_x[y_slice, x_slice]
                 target_y = target_y[y_slice, x_slice]
@@ -2470,9 +2636,23 @@ class AreaDefinition(_ProjectionDefinition):
         if x_slice is not None:
             target_x = target_x[x_slice]
 
+        if broadcast:
+            target_x, target_y = np.meshgrid(target_x, target_y, copy=False)
+            target_x.flags.writeable = False
+            target_y.flags.writeable = False
+            return target_x, target_y
         target_x, target_y = np.meshgrid(target_x, target_y)
         return target_x, target_y
 
+    @property
+    def is_separable_lonlat(self):
+        """Whether the projection coordinates of this area are its longitudes and latitudes.
+
+        This is true for geographic areas (ex. EPSG:4326). The longitudes then
+        only depend on the column and the latitudes only on the row.
+        """
+        return _is_separable_lonlat_crs(self.crs_wkt)
+
     @staticmethod
     def _get_yx_data_slice(data_slice):
         if data_slice is not None and isinstance(data_slice, slice):
@@ -2508,6 +2688,15 @@ class AreaDefinition(_ProjectionDefinition):
         target_x, target_y = res[0], res[1]
         return target_x, target_y
 
+    def _broadcast_proj_coords_dask(self, chunks, dtype):
+        """Generate 2D x and y coordinate arrays broadcasting the 1D projection vectors."""
+        y_chunks, x_chunks = _chunks_to_yx_chunks(chunks)
+        norm_chunks = da.core.normalize_chunks((y_chunks, x_chunks), self.shape, dtype=dtype)
+        x, y = self._get_proj_vectors(dtype=dtype, chunks=(norm_chunks[0], norm_chunks[1]))
+        target_x = da.broadcast_to(x[np.newaxis, :], self.shape, chunks=norm_chunks)
+        target_y = da.broadcast_to(y[:, np.newaxis], self.shape, chunks=norm_chunks)
+        return target_x, target_y
+
     @property
     def projection_x_coords(self):
         """Return projection X coordinates."""
@@ -2541,7 +2730,7 @@ class AreaDefinition(_ProjectionDefinition):
             chunks = CHUNK_SIZE  # FUTURE: Use a global config object instead
         return self.get_lonlats(chunks=chunks, dtype=dtype)
 
-    def get_lonlats(self, nprocs=None, data_slice=None, cache=False, dtype=None, chunks=None):
+    def get_lonlats(self, nprocs=None, data_slice=None, cache=False, dtype=None, chunks=None, broadcast=False):
         """Return lon and lat arrays of area.
 
         Note that this historically this method always returns
@@ -2566,11 +2755,28 @@ class AreaDefinition(_ProjectionDefinition):
             Data type of the returned arrays
         chunks: int or tuple, optional
             Create dask arrays and use this chunk size
+        broadcast: bool, optional
+            For geographic areas (see :attr:`is_separable_lonlat`) return
+            read-only broadcast views of the 1D longitude and latitude
+            vectors like :meth:`get_proj_coords` does, instead of full 2D
+            arrays. Ignored for the other areas.
 
         Returns
         -------
         (lons, lats) : tuple of numpy arrays
             Grids of area lons and and lats
+
+        For geographic areas no projection is needed, the longitudes and
+        latitudes are the projection coordinates. Geostationary areas use a vectorised,
+        multi-threaded implementation of the projection instead of pyproj
+        which matches pyproj within 1e-9 degrees.
+
+        If the ``area_lonlats_cache_size`` configuration option is larger
+        than 0, the results are kept in memory for all areas with the same
+        hash and returned again for the same ``data_slice``, ``dtype`` and
+        ``chunks``. Cached numpy arrays are read-only. See
+        :doc:`/howtos/configuration` for details.
+
         """
         if cache:
             warnings.warn("'cache' keyword argument will be removed in the "
@@ -2587,14 +2793,44 @@ class AreaDefinition(_ProjectionDefinition):
                 lats = lats[data_slice]
             return lons, lats
 
-        # Get X/Y coordinates for the whole area
-        target_x, target_y = self.get_proj_coords(data_slice=data_slice, chunks=chunks, dtype=dtype)
-        if nprocs is None and not hasattr(target_x, 'chunks'):
-            nprocs = self.nprocs
-        if nprocs is not None and hasattr(target_x, 'chunks'):
+        if nprocs is not None and chunks is not None:
             # we let 'get_proj_coords' decide if dask arrays should be made
             # but if the user provided nprocs then this doesn't make sense
             raise ValueError("Can't specify 'nprocs' and 'chunks' at the same time")
+        cache_key = _get_lonlats_cache_key(self, data_slice, dtype, chunks)
+        if cache_key is not None:
+            start_time = time.perf_counter()
+            lonlats = _get_cached_lonlats(cache_key)
+            if lonlats is not None:
+                record_cache_event("area_lonlats", "hit", duration=time.perf_counter() - start_time)
+                return lonlats[0], lonlats[1]
+        lons, lats = self._compute_lonlats(nprocs, data_slice, dtype, chunks, broadcast)
+        if cache_key is not None:
+            record_cache_event("area_lonlats", "miss", duration=time.perf_counter() - start_time)
+            _add_cached_lonlats(cache_key, lons, lats)
+
+        if cache and data_slice is None:
+            # Cache the result if requested
+            self.lons = lons
+            self.lats = lats
+
+        return lons, lats
+
+    def _compute_lonlats(self, nprocs, data_slice, dtype, chunks, broadcast=False):
+        if self.is_separable_lonlat:
+            # projection coordinates are the lons/lats
+            return self.get_proj_coords(data_slice=data_slice, chunks=chunks, dtype=dtype, broadcast=broadcast)
+        geos_proj = _get_geos_projection(self)
+        # Get X/Y coordinates for the whole area, the transformations below
+        # copy their input so broadcast views are enough for numpy arrays
+        target_x, target_y = self.get_proj_coords(data_slice=data_slice, chunks=chunks, dtype=dtype,
+                                                  broadcast=chunks is None or geos_proj is not None)
+        if geos_proj is not None and not hasattr(target_x, 'chunks'):
+            # the geos projection only computes the broadcast rows and
+            # columns once and uses several threads
+            return geos_proj.inverse(target_x, target_y, dtype=dtype)
+        if nprocs is None and not hasattr(target_x, 'chunks'):
+            nprocs = self.nprocs
 
         if hasattr(target_x, 'chunks'):
             # we are using dask arrays, map blocks to th
@@ -2613,8 +2849,7 @@ class AreaDefinition(_ProjectionDefinition):
             proj_kwargs["nprocs"] = nprocs
             proj_kwargs["inverse"] = True
         else:
-            gcrs = get_geodetic_crs_with_no_datum_shift(self.crs)
-            target_trans = pyproj.Transformer.from_crs(gcrs, self.crs, always_xy=True)
+            target_trans = get_geodetic_transformer(self.crs, always_xy=True)
             target_proj = target_trans.transform
             proj_kwargs["direction"] = TransformDirection.INVERSE
 
@@ -2622,12 +2857,6 @@ class AreaDefinition(_ProjectionDefinition):
         lons, lats = target_proj(target_x, target_y, **proj_kwargs)
         lons = np.asanyarray(lons, dtype=dtype)
         lats = np.asanyarray(lats, dtype=dtype)
-
-        if cache and data_slice is None:
-            # Cache the result if requested
-            self.lons = lons
-            self.lats = lats
-
         return lons, lats
 
     @property
@@ -2835,7 +3064,10 @@ def get_geostationary_bounding_box_in_lonlats(geos_area, nb_points=50):
       nb_points: Number of points on the polygon
     """
     x, y = get_geostationary_bounding_box_in_proj_coords(geos_area, nb_points)
-    lons, lats = Proj(geos_area.crs)(x, y, inverse=True)
+    geos_proj = _get_geos_projection(geos_area)
+    if geos_proj is not None:
+        return geos_proj.inverse(x, y)
+    lons, lats = get_proj(geos_area.crs)(x, y, inverse=True)
     return lons, lats
 
 
@@ -3119,5 +3351,98 @@ def enclose_areas(*areas, area_id="joint-area"):
         resolution=first.resolution)
 
 
+def get_overlap_matrix(geometries, other_geometries):
+    """Check which geometries overlap which other geometries.
+
+    Vectorised version of :meth:`BaseDefinition.overlaps` for many pairs of
+    geometries at once, for example to find which areas each of many swaths
+    touches. Pairs whose bounding spherical caps don't intersect are
+    discarded first, only the remaining ones are checked with the corners
+    of the geometries like :meth:`BaseDefinition.overlaps` does.
+
+    Args:
+        geometries: Sequence of ``n`` geometry definitions.
+        other_geometries: Sequence of ``m`` geometry definitions.
+
+    Returns:
+        Boolean array of shape ``(n, m)`` where element ``[i, j]`` is
+        ``geometries[i].overlaps(other_geometries[j])``.
+
+    """
+    corners, other_corners = _get_corners_xyz(geometries), _get_corners_xyz(other_geometries)
+    res = np.zeros((len(corners), len(other_corners)), dtype=bool)
+    res[_get_overlapping_pairs(corners, other_corners)] = True
+    return res
+
+
+def get_overlap_rate_matrix(geometries, other_geometries):
+    """Get how much geometries overlap other geometries.
+
+    Vectorised version of :meth:`BaseDefinition.overlap_rate` for many
+    pairs of geometries at once. Only the pairs found by
+    :func:`get_overlap_matrix` are intersected, the others get a rate of 0.
+
+    Args:
+        geometries: Sequence of ``n`` geometry definitions.
+        other_geometries: Sequence of ``m`` geometry definitions.
+
+    Returns:
+        Array of shape ``(n, m)`` where element ``[i, j]`` is the fraction
+        of ``other_geometries[j]`` covered by ``geometries[i]``.
+
+    """
+    from pyresample import _spherical_arrays
+
+    corners, other_corners = _get_corners_xyz(geometries), _get_corners_xyz(other_geometries)
+    rows, cols = _get_overlapping_pairs(corners, other_corners)
+    intersections, counts = _spherical_arrays.clip_convex_polygons(corners[rows], other_corners[cols])
+    res = np.zeros((len(corners), len(other_corners)))
+    res[rows, cols] = (_spherical_arrays.get_polygon_areas(intersections, counts) /
+                       _spherical_arrays.get_polygon_areas(other_corners)[cols])
+    return res
+
+
+def _get_overlapping_pairs(corners, other_corners):
+    """Get the indices of the overlapping pairs of ``(n, 4, 3)`` and ``(m, 4, 3)`` corners."""
+    from pyresample import _spherical_arrays
+
+    candidates = _spherical_arrays.caps_overlap(*_spherical_arrays.get_bounding_caps(corners),
+                                                *_spherical_arrays.get_bounding_caps(other_corners))
+    rows, cols = np.nonzero(candidates)
+    overlapping = _spherical_arrays.quadrilaterals_overlap(corners[rows], other_corners[cols])
+    return rows[overlapping], cols[overlapping]
+
+
+def _get_corners_xyz(geometries):
+    """Get the unit vectors of the corners of geometries as a ``(n, 4, 3)`` array.
+
+    The corners are in the same order as in :attr:`BaseDefinition.corners`.
+    The corners of swaths with dask arrays are computed together.
+
+    """
+    from pyresample._spherical_arrays import lonlat_to_xyz
+
+    corner_rows = np.array([0, 0, -1, -1])
+    corner_cols = np.array([0, -1, -1, 0])
+    corner_lonlats = []
+    for geometry in geometries:
+        if isinstance(geometry, AreaDefinition):
+            corner_lonlats.append(geometry.get_lonlat_from_array_coordinates(corner_cols % geometry.width,
+                                                                             corner_rows % geometry.height))
+            continue
+        if geometry.ndim != 2:
+            raise DimensionError('operation undefined for %sD geometry ' % geometry.ndim)
+        lons, lats = geometry.get_lonlats()
+        corner_lonlats.append(([lons[corner_rows[idx], corner_cols[idx]] for idx in range(4)],
+                               [lats[corner_rows[idx], corner_cols[idx]] for idx in range(4)]))
+    if da is not None:
+        corner_lonlats = da.compute(*corner_lonlats)
+    lonlats = np.array(corner_lonlats, dtype=np.float64).reshape(len(corner_lonlats), 2, 4)
+    lons, lats = lonlats[:, 0], lonlats[:, 1]
+    if not (np.all(np.abs(lons) <= 180) and np.all(np.abs(lats) <= 90)):
+        raise ValueError('Illegal (lon, lat) coordinates in the corners of the geometries')
+    return lonlat_to_xyz(lons, lats)
+
+
 def _numpy_values_to_native(values):
     return [n.item() if isinstance(n, np.number) else n for n in values]
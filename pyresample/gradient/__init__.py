@@ -46,6 +46,7 @@ from pyresample.gradient._gradient_search import (
     one_step_gradient_search,
 )
 from pyresample.resampler import BaseResampler, resample_blocks
+from pyresample.utils.proj4 import get_proj, get_transformer
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +71,7 @@ def create_gradient_search_resampler(source_geo_def, target_geo_def):
 @da.as_gufunc(signature='(),()->(),()')
 def transform(x_coords, y_coords, src_prj=None, dst_prj=None):
     """Calculate projection coordinates."""
-    transformer = pyproj.Transformer.from_crs(src_prj, dst_prj)
+    transformer = get_transformer(src_prj, dst_prj)
     return transformer.transform(x_coords, y_coords)
 
 
@@ -104,7 +105,7 @@ class StackingGradientSearchResampler(BaseResampler):
         if self.use_input_coords is None:
             try:
                 self.src_x, self.src_y = self.source_geo_def.get_proj_coords(
-                    chunks=datachunks)
+                    chunks=datachunks, broadcast=True)
                 src_crs = self.source_geo_def.crs
                 self.use_input_coords = True
             except AttributeError:
@@ -114,7 +115,7 @@ class StackingGradientSearchResampler(BaseResampler):
                 self.use_input_coords = False
             try:
                 self.dst_x, self.dst_y = self.target_geo_def.get_proj_coords(
-                    chunks=CHUNK_SIZE)
+                    chunks=CHUNK_SIZE, broadcast=True)
                 dst_crs = self.target_geo_def.crs
             except AttributeError as err:
                 if self.use_input_coords is False:
@@ -126,12 +127,12 @@ class StackingGradientSearchResampler(BaseResampler):
                 self.dst_x, self.dst_y = transform(
                     self.dst_x, self.dst_y,
                     src_prj=dst_crs, dst_prj=src_crs)
-                self.prj = pyproj.Proj(self.source_geo_def.crs)
+                self.prj = get_proj(self.source_geo_def.crs)
             else:
                 self.src_x, self.src_y = transform(
                     self.src_x, self.src_y,
                     src_prj=src_crs, dst_prj=dst_crs)
-                self.prj = pyproj.Proj(self.target_geo_def.crs)
+                self.prj = get_proj(self.target_geo_def.crs)
 
     def _get_prj_poly(self, geo_def):
         # - None if out of Earth Disk
@@ -595,13 +596,13 @@ def gradient_resampler_indices(source_area, target_area, block_info=None, **kwar
 
 def _get_coordinates_in_same_projection(source_area, target_area):
     try:
-        src_x, src_y = source_area.get_proj_coords()
-        transformer = pyproj.Transformer.from_crs(target_area.crs, source_area.crs, always_xy=True)
+        src_x, src_y = source_area.get_proj_coords(broadcast=True)
+        transformer = get_transformer(target_area.crs, source_area.crs, always_xy=True)
     except AttributeError as err:
         raise NotImplementedError("Cannot resample from Swath for now.") from err
 
     try:
-        dst_x, dst_y = transformer.transform(*target_area.get_proj_coords())
+        dst_x, dst_y = transformer.transform(*target_area.get_proj_coords(broadcast=True))
     except AttributeError as err:
         raise NotImplementedError("Cannot resample to Swath for now.") from err
     src_gradient_xl, src_gradient_xp = np.gradient(src_x, axis=[0, 1])
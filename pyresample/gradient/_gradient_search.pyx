@@ -96,14 +96,14 @@ ctypedef void (*FN)(const DTYPE_t[:, :, :] data, int l0, int p0, double dl, doub
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cpdef one_step_gradient_search(const DTYPE_t [:, :, :] data,
-                               DTYPE_t [:, :] src_x,
-                               DTYPE_t [:, :] src_y,
-                               DTYPE_t [:, :] xl,
-                               DTYPE_t [:, :] xp,
-                               DTYPE_t [:, :] yl,
-                               DTYPE_t [:, :] yp,
-                               DTYPE_t [:, :] dst_x,
-                               DTYPE_t [:, :] dst_y,
+                               const DTYPE_t [:, :] src_x,
+                               const DTYPE_t [:, :] src_y,
+                               const DTYPE_t [:, :] xl,
+                               const DTYPE_t [:, :] xp,
+                               const DTYPE_t [:, :] yl,
+                               const DTYPE_t [:, :] yp,
+                               const DTYPE_t [:, :] dst_x,
+                               const DTYPE_t [:, :] dst_y,
                                str method='bilinear'):
     """Gradient search, simple case variant."""
     cdef FN fun
@@ -220,14 +220,14 @@ cdef void one_step_gradient_search_no_gil(const DTYPE_t[:, :, :] data,
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef one_step_gradient_indices(DTYPE_t [:, :] src_x,
-                                DTYPE_t [:, :] src_y,
-                                DTYPE_t [:, :] xl,
-                                DTYPE_t [:, :] xp,
-                                DTYPE_t [:, :] yl,
-                                DTYPE_t [:, :] yp,
-                                DTYPE_t [:, :] dst_x,
-                                DTYPE_t [:, :] dst_y):
+cpdef one_step_gradient_indices(const DTYPE_t [:, :] src_x,
+                                const DTYPE_t [:, :] src_y,
+                                const DTYPE_t [:, :] xl,
+                                const DTYPE_t [:, :] xp,
+                                const DTYPE_t [:, :] yl,
+                                const DTYPE_t [:, :] yp,
+                                const DTYPE_t [:, :] dst_x,
+                                const DTYPE_t [:, :] dst_y):
     """Gradient search, simple case variant, returning float indices.
 
     This is appropriate for monotonous gradients only, i.e. not modis or viirs in satellite projection.
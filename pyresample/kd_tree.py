@@ -24,6 +24,8 @@ from __future__ import annotations
 import sys
 import types
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from logging import getLogger
 from typing import Any
@@ -34,8 +36,18 @@ from pykdtree.kdtree import KDTree
 
 from pyresample import CHUNK_SIZE, _spatial_mp, data_reduce, geometry
 
-from .future.resamplers._transform_utils import lonlat2xyz
-from .future.resamplers.nearest import _my_index, query_no_distance
+from ._caching import cache_to_npy_if
+from .future.resamplers._transform_utils import lonlat2xyz, resolve_compact_dtypes
+from .future.resamplers.nearest import (  # noqa: F401
+    SourceKDTree,
+    _can_project_to_source_area,
+    _get_shared_source_kdtree,
+    _my_index,
+    _query_area_nearest,
+    get_source_kdtree,
+    query_no_distance,
+)
+from .future.resamplers.resampler import hash_resampler_geometries
 from .utils.row_appendable_array import RowAppendableArray
 
 logger = getLogger(__name__)
@@ -53,6 +65,11 @@ except ImportError:
     da = None
     dask = None
 
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
 if sys.version >= '3':
     long = int
 
@@ -69,7 +86,9 @@ def resample_nearest(source_geo_def,
                      fill_value=0,
                      reduce_data=True,
                      nprocs=1,
-                     segments=None):
+                     segments=None,
+                     executor=None,
+                     compact_dtypes=None):
     """Resamples data using kd-tree nearest neighbour approach.
 
     Parameters
@@ -98,22 +117,41 @@ def resample_nearest(source_geo_def,
     segments : int or None
         Number of segments to use when resampling.
         If set to None an estimate will be calculated
+    executor : concurrent.futures.Executor, 'threads' or None, optional
+        Query the segments of the target geometry concurrently.
+        See :func:`get_neighbour_info` for details.
+    compact_dtypes : bool, optional
+        Compute the neighbour info with 32-bit indices and distances to
+        reduce memory usage. See :func:`get_neighbour_info` for details.
 
     Returns
     -------
     data : numpy array
         Source data resampled to target geometry
+
+    Notes
+    -----
+    If both ``source_geo_def`` and ``target_geo_def`` are
+    ``AreaDefinition`` objects no kd-tree is built. Instead each target
+    pixel is projected to the source area and the closest of the source
+    pixels around that position is used. This gives the same result as the
+    kd-tree except where source pixels are equally close or at the edge of
+    the source projection's valid domain. ``epsilon``, ``reduce_data``,
+    ``nprocs`` and ``executor`` are not used in this case. Source areas in a
+    geostationary or other perspective projection always use the kd-tree.
     """
     return _resample(source_geo_def, data, target_geo_def, 'nn',
                      radius_of_influence, neighbours=1,
                      epsilon=epsilon, fill_value=fill_value,
-                     reduce_data=reduce_data, nprocs=nprocs, segments=segments)
+                     reduce_data=reduce_data, nprocs=nprocs, segments=segments,
+                     executor=executor, compact_dtypes=compact_dtypes)
 
 
 def resample_gauss(source_geo_def, data, target_geo_def,
                    radius_of_influence, sigmas, neighbours=8, epsilon=0,
                    fill_value=0, reduce_data=True, nprocs=1, segments=None,
-                   with_uncert=False):
+                   with_uncert=False, executor=None, compact_dtypes=None,
+                   block_size=None):
     """Resamples data using kd-tree gaussian weighting neighbour approach.
 
     Parameters
@@ -150,6 +188,15 @@ def resample_gauss(source_geo_def, data, target_geo_def,
         If set to None an estimate will be calculated
     with_uncert : bool, optional
         Calculate uncertainty estimates
+    executor : concurrent.futures.Executor, 'threads' or None, optional
+        Query the segments of the target geometry concurrently.
+        See :func:`get_neighbour_info` for details.
+    compact_dtypes : bool, optional
+        Compute the neighbour info with 32-bit indices and distances to
+        reduce memory usage. See :func:`get_neighbour_info` for details.
+    block_size : int or None, optional
+        Maximum number of target pixels to weight at once.
+        See :func:`get_sample_from_neighbour_info` for details.
 
     Returns
     -------
@@ -186,13 +233,16 @@ def resample_gauss(source_geo_def, data, target_geo_def,
     return _resample(source_geo_def, data, target_geo_def, 'custom',
                      radius_of_influence, neighbours=neighbours,
                      epsilon=epsilon, weight_funcs=weight_funcs, fill_value=fill_value,
-                     reduce_data=reduce_data, nprocs=nprocs, segments=segments, with_uncert=with_uncert)
+                     reduce_data=reduce_data, nprocs=nprocs, segments=segments, with_uncert=with_uncert,
+                     executor=executor, compact_dtypes=compact_dtypes,
+                     block_size=block_size)
 
 
 def resample_custom(source_geo_def, data, target_geo_def,
                     radius_of_influence, weight_funcs, neighbours=8,
                     epsilon=0, fill_value=0, reduce_data=True, nprocs=1,
-                    segments=None, with_uncert=False):
+                    segments=None, with_uncert=False, executor=None,
+                    compact_dtypes=None, block_size=None, weight_table_size=None):
     """Resamples data using kd-tree custom radial weighting neighbour approach.
 
     Parameters
@@ -228,6 +278,32 @@ def resample_custom(source_geo_def, data, target_geo_def,
     segments : {int, None}
         Number of segments to use when resampling.
         If set to None an estimate will be calculated
+    with_uncert : bool, optional
+        Calculate uncertainty estimates
+    executor : concurrent.futures.Executor, 'threads' or None, optional
+        Query the segments of the target geometry concurrently.
+        See :func:`get_neighbour_info` for details.
+    compact_dtypes : bool, optional
+        Compute the neighbour info with 32-bit indices and distances to
+        reduce memory usage. See :func:`get_neighbour_info` for details.
+    block_size : int or None, optional
+        Maximum number of target pixels to weight at once.
+        See :func:`get_sample_from_neighbour_info` for details.
+    weight_table_size : int or None, optional
+        If given, each weight function is evaluated only once on this
+        many equally spaced distances from 0 to ``radius_of_influence``.
+        The weights are then looked up from this table with linear
+        interpolation instead of calling the weight function for every
+        neighbour and channel. This is much faster for expensive Python
+        weight functions. The interpolation error is at most
+        ``h ** 2 / 8 * max(abs(f''))`` where
+        ``h = radius_of_influence / (weight_table_size - 1)`` and ``f''``
+        is the second derivative of the weight function between 0 and
+        ``radius_of_influence``. For example, for the Gaussian
+        ``exp(-r ** 2 / sigma ** 2)`` with ``max(abs(f'')) = 2 / sigma ** 2``,
+        a radius of 50 km, a sigma of 25 km and 10001 table entries,
+        ``h`` is 5 m and the error is at most 1e-8. The weight function
+        must be continuous.
 
     Returns
     -------
@@ -246,17 +322,47 @@ def resample_custom(source_geo_def, data, target_geo_def,
             if not isinstance(weight_func, types.FunctionType):
                 raise TypeError('weight_func must be function object')
 
+    if weight_table_size is not None:
+        if isinstance(weight_funcs, (list, tuple)):
+            weight_funcs = [_tabulate_weight_func(weight_func, radius_of_influence, weight_table_size)
+                            for weight_func in weight_funcs]
+        else:
+            weight_funcs = _tabulate_weight_func(weight_funcs, radius_of_influence, weight_table_size)
+
     return _resample(source_geo_def, data, target_geo_def, 'custom',
                      radius_of_influence, neighbours=neighbours,
                      epsilon=epsilon, weight_funcs=weight_funcs,
                      fill_value=fill_value, reduce_data=reduce_data,
-                     nprocs=nprocs, segments=segments, with_uncert=with_uncert)
+                     nprocs=nprocs, segments=segments, with_uncert=with_uncert,
+                     executor=executor, compact_dtypes=compact_dtypes,
+                     block_size=block_size)
+
+
+def _tabulate_weight_func(weight_func, max_distance, table_size):
+    """Sample a weight function once and return a function interpolating those samples."""
+    if table_size < 2:
+        raise ValueError("weight_table_size must be at least 2")
+    table_distances = np.linspace(0, max_distance, int(table_size))
+    table_weights = np.broadcast_to(weight_func(table_distances), table_distances.shape).astype(np.float64)
+
+    def tabulated_weight_func(dist):
+        return np.interp(dist, table_distances, table_weights)
+    return tabulated_weight_func
 
 
 def _resample(source_geo_def, data, target_geo_def, resample_type,
               radius_of_influence, neighbours=8, epsilon=0, weight_funcs=None,
-              fill_value=0, reduce_data=True, nprocs=1, segments=None, with_uncert=False):
+              fill_value=0, reduce_data=True, nprocs=1, segments=None, with_uncert=False,
+              executor=None, compact_dtypes=None, block_size=None):
     """Resamples swath using kd-tree approach."""
+    compact_dtypes = resolve_compact_dtypes(compact_dtypes)
+    if resample_type == 'nn' and _can_project_to_source_area(source_geo_def, target_geo_def):
+        neighbour_info = _get_area_neighbour_info(source_geo_def, target_geo_def,
+                                                  radius_of_influence, segments=segments,
+                                                  compact_dtypes=compact_dtypes)
+        return get_sample_from_neighbour_info(resample_type, target_geo_def.shape, data,
+                                              *neighbour_info, fill_value=fill_value)
+
     valid_input_index, valid_output_index, index_array, distance_array = \
         get_neighbour_info(source_geo_def,
                            target_geo_def,
@@ -265,7 +371,9 @@ def _resample(source_geo_def, data, target_geo_def, resample_type,
                            epsilon=epsilon,
                            reduce_data=reduce_data,
                            nprocs=nprocs,
-                           segments=segments)
+                           segments=segments,
+                           executor=executor,
+                           compact_dtypes=compact_dtypes)
 
     return get_sample_from_neighbour_info(resample_type,
                                           target_geo_def.shape,
@@ -275,12 +383,14 @@ def _resample(source_geo_def, data, target_geo_def, resample_type,
                                           distance_array=distance_array,
                                           weight_funcs=weight_funcs,
                                           fill_value=fill_value,
-                                          with_uncert=with_uncert)
+                                          with_uncert=with_uncert,
+                                          block_size=block_size)
 
 
 def get_neighbour_info(source_geo_def, target_geo_def, radius_of_influence,
                        neighbours=8, epsilon=0, reduce_data=True,
-                       nprocs=1, segments=None):
+                       nprocs=1, segments=None, executor=None,
+                       compact_dtypes=None, source_kdtree=None):
     """Return neighbour info.
 
     Parameters
@@ -304,17 +414,84 @@ def get_neighbour_info(source_geo_def, target_geo_def, radius_of_influence,
     segments : int or None
         Number of segments to use when resampling.
         If set to None an estimate will be calculated
+    executor : concurrent.futures.Executor, 'threads' or None, optional
+        Query the segments of the target geometry concurrently using this
+        executor. The coordinate calculations and KDTree queries of each
+        segment release the GIL so a
+        :class:`~concurrent.futures.ThreadPoolExecutor` can use multiple
+        cores without copying data between processes. If ``'threads'``, a
+        thread pool with ``nprocs`` workers is created for this call.
+        When an executor is used ``nprocs`` does not start any extra
+        processes. Set it to the number of workers of the executor instead,
+        at most two segments per worker are submitted ahead of the one
+        whose result is being collected. Has no effect if only one segment
+        is used.
+    compact_dtypes : bool, optional
+        Return ``index_array`` as ``uint32`` and ``distance_array`` as
+        ``float32`` instead of 64-bit types, halving the memory used by
+        the neighbour info. The longitudes and latitudes of areas are
+        computed as ``float32`` and the KDTree is built from and queried
+        with ``float32`` Cartesian coordinates so no 64-bit coordinate
+        arrays are created. At the Earth's radius the ``float32``
+        coordinates have a resolution of about 0.5 m and ``float32``
+        longitudes of about 1 m, which limits the accuracy of the returned
+        distances. Neighbours closer to each other than that may be
+        returned in a different order. If ``None`` the ``compact_dtypes``
+        configuration option is used (``False`` by default).
+    source_kdtree : SourceKDTree, optional
+        Already built KDTree of ``source_geo_def``, for example from
+        :func:`~pyresample.future.resamplers.nearest.get_source_kdtree`.
+        Sharing one tree between calls with different target geometries
+        avoids building it again for every target. The source data is
+        then not reduced to the target geometry with ``reduce_data``, so
+        ``valid_input_index`` includes all valid source pixels. Its
+        ``compact_dtypes`` must match ``compact_dtypes``.
 
     Returns
     -------
     (valid_input_index, valid_output_index,
     index_array, distance_array) : tuple of numpy arrays
         Neighbour resampling info
+
+    Notes
+    -----
+    If the ``cache_neighbour_info`` configuration option is enabled the
+    returned arrays are cached to ``cache_dir`` and loaded as read-only
+    memory-mapped arrays on later calls with the same geometries and
+    query parameters. See :doc:`/howtos/configuration` for details.
     """
     if source_geo_def.size < neighbours:
         warnings.warn('Searching for %s neighbours in %s data points' %
                       (neighbours, source_geo_def.size), stacklevel=2)
 
+    compact_dtypes = resolve_compact_dtypes(compact_dtypes)
+    valid_input_index, valid_output_index, index_array, distance_array = \
+        _get_cached_neighbour_info(source_geo_def, target_geo_def, radius_of_influence,
+                                   neighbours=neighbours, epsilon=epsilon,
+                                   reduce_data=reduce_data, nprocs=nprocs,
+                                   segments=segments, executor=executor,
+                                   compact_dtypes=compact_dtypes,
+                                   source_kdtree=source_kdtree)
+
+    # Check if number of neighbours is potentially too low
+    if neighbours > 1:
+        if not np.all(np.isinf(distance_array[:, -1])):
+            warnings.warn(('Possible more than %s neighbours '
+                           'within %s m for some data points') %
+                          (neighbours, radius_of_influence), stacklevel=2)
+
+    return valid_input_index, valid_output_index, index_array, distance_array
+
+
+def _get_area_neighbour_info(source_geo_def, target_geo_def, radius_of_influence,
+                             segments=None, compact_dtypes=False):
+    """Get nearest neighbour info between two areas without a kd-tree.
+
+    Target pixels are projected to the source area to find their nearest
+    source pixel. All source pixels are marked as valid input so the
+    returned indexes are flat indexes in to the full source array.
+
+    """
     if segments is None:
         cut_off = 3000000
         if target_geo_def.size > cut_off:
@@ -322,25 +499,84 @@ def get_neighbour_info(source_geo_def, target_geo_def, radius_of_influence,
         else:
             segments = 1
 
-    # Find reduced input coordinate set
-    valid_input_index, source_lons, source_lats = _get_valid_input_index(source_geo_def, target_geo_def,
-                                                                         reduce_data,
-                                                                         radius_of_influence,
-                                                                         nprocs=nprocs)
+    index_dtype = np.uint32 if source_geo_def.size < 2 ** 32 else np.uint64
+    distance_dtype = np.float32 if compact_dtypes else np.float64
+    valid_output_index = []
+    index_array = []
+    distance_array = []
+    for target_slice in geometry._get_slice(segments, target_geo_def.shape):
+        target_lons, target_lats = target_geo_def.get_lonlats(data_slice=target_slice)
+        target_lons = target_lons.ravel()
+        target_lats = target_lats.ravel()
+        next_ia, next_da = _query_area_nearest(target_lons, target_lats, source_geo_def,
+                                               radius=radius_of_influence)
+        next_voi = ((target_lons >= -180) & (target_lons <= 180) & (target_lats <= 90) & (target_lats >= -90))
+        next_ia = next_ia[next_voi]
+        next_ia[next_ia < 0] = source_geo_def.size
+        valid_output_index.append(next_voi)
+        index_array.append(next_ia.astype(index_dtype))
+        distance_array.append(next_da[next_voi].astype(distance_dtype))
+
+    valid_input_index = np.ones(source_geo_def.size, dtype=bool)
+    return (valid_input_index, np.concatenate(valid_output_index),
+            np.concatenate(index_array), np.concatenate(distance_array))
+
+
+def _hash_neighbour_info_args(source_geo_def, target_geo_def, radius_of_influence,
+                              neighbours=8, epsilon=0, reduce_data=True,
+                              nprocs=1, segments=None, executor=None,
+                              compact_dtypes=False, source_kdtree=None):
+    """Get the cache key for neighbour info.
+
+    ``nprocs``, ``segments`` and ``executor`` only affect how the result is
+    computed and are therefore not part of the key.
 
-    # Create kd-tree
-    try:
-        resample_kdtree = _create_resample_kdtree(source_lons, source_lats,
-                                                  valid_input_index,
-                                                  nprocs=nprocs)
-    except EmptyResult:
+    """
+    return hash_resampler_geometries(source_geo_def, target_geo_def,
+                                     radius_of_influence=float(radius_of_influence),
+                                     neighbours=int(neighbours),
+                                     epsilon=float(epsilon),
+                                     reduce_data=bool(reduce_data),
+                                     compact_dtypes=bool(compact_dtypes),
+                                     shared_source_kdtree=source_kdtree is not None)
+
+
+@cache_to_npy_if("cache_neighbour_info", "neighbour_info", _hash_neighbour_info_args,
+                 max_size_config_key="cache_neighbour_info_max_size")
+def _get_cached_neighbour_info(source_geo_def, target_geo_def, radius_of_influence,
+                               neighbours=8, epsilon=0, reduce_data=True,
+                               nprocs=1, segments=None, executor=None,
+                               compact_dtypes=False, source_kdtree=None):
+    num_workers = nprocs
+    if executor is not None:
+        # parallelism comes from the executor, not from extra processes
+        nprocs = 1
+
+    if segments is None:
+        cut_off = 3000000
+        if target_geo_def.size > cut_off:
+            segments = int(target_geo_def.size / cut_off)
+        else:
+            segments = 1
+
+    valid_input_index, resample_kdtree = _get_source_kdtree(source_geo_def, target_geo_def,
+                                                            radius_of_influence, reduce_data,
+                                                            nprocs, compact_dtypes, source_kdtree)
+    if resample_kdtree is None:
         # Handle if all input data is reduced away
         valid_output_index, index_array, distance_array = \
-            _create_empty_info(source_geo_def, target_geo_def, neighbours)
+            _create_empty_info(source_geo_def, target_geo_def, neighbours,
+                               compact_dtypes=compact_dtypes)
         return (valid_input_index, valid_output_index, index_array,
                 distance_array)
 
-    if segments > 1:
+    if segments > 1 and executor is not None:
+        valid_output_index, index_array, distance_array = \
+            _query_resample_kdtree_segments_concurrently(
+                executor, resample_kdtree, source_geo_def, target_geo_def,
+                radius_of_influence, segments, neighbours=neighbours,
+                epsilon=epsilon, reduce_data=reduce_data, num_workers=num_workers)
+    elif segments > 1:
         # Iterate through segments
         appendable_valid_output_index = RowAppendableArray(target_geo_def.size)
         appendable_index_array = RowAppendableArray(target_geo_def.size)
@@ -376,23 +612,121 @@ def get_neighbour_info(source_geo_def, target_geo_def, radius_of_influence,
                                    reduce_data=reduce_data,
                                    nprocs=nprocs)
 
-    # Check if number of neighbours is potentially too low
-    if neighbours > 1:
-        if not np.all(np.isinf(distance_array[:, -1])):
-            warnings.warn(('Possible more than %s neighbours '
-                           'within %s m for some data points') %
-                          (neighbours, radius_of_influence), stacklevel=2)
-
     return valid_input_index, valid_output_index, index_array, distance_array
 
 
+def _get_source_kdtree(source_geo_def, target_geo_def, radius_of_influence,
+                       reduce_data, nprocs, compact_dtypes, source_kdtree):
+    """Get the valid input index and the kd-tree of the source.
+
+    The kd-tree is ``None`` if there are no valid source pixels.
+
+    """
+    if source_kdtree is not None:
+        if bool(source_kdtree.compact_dtypes) != bool(compact_dtypes):
+            raise ValueError("'compact_dtypes' does not match the 'compact_dtypes' of 'source_kdtree'")
+        valid_input_index = source_kdtree.valid_input_index
+        if valid_input_index.size != source_geo_def.size:
+            raise ValueError("'source_kdtree' was not built for 'source_geo_def'")
+        if not valid_input_index.any():
+            return valid_input_index, None
+        return valid_input_index, source_kdtree.kdtree
+
+    # Find reduced input coordinate set
+    valid_input_index, source_lons, source_lats = _get_valid_input_index(source_geo_def, target_geo_def,
+                                                                         reduce_data,
+                                                                         radius_of_influence,
+                                                                         nprocs=nprocs,
+                                                                         compact_dtypes=compact_dtypes)
+    # Create kd-tree
+    try:
+        resample_kdtree = _create_resample_kdtree(source_lons, source_lats,
+                                                  valid_input_index,
+                                                  nprocs=nprocs,
+                                                  compact_dtypes=compact_dtypes)
+    except EmptyResult:
+        resample_kdtree = None
+    return valid_input_index, resample_kdtree
+
+
+def _query_resample_kdtree_segments_concurrently(executor,
+                                                 resample_kdtree,
+                                                 source_geo_def,
+                                                 target_geo_def,
+                                                 radius_of_influence,
+                                                 segments,
+                                                 neighbours=8,
+                                                 epsilon=0,
+                                                 reduce_data=True,
+                                                 num_workers=1):
+    """Query kd-tree on all segments of the target coordinates concurrently.
+
+    Results are copied in segment order into arrays that are allocated once
+    for the full target size. At most two segments per worker, as given by
+    ``num_workers``, are submitted ahead of the one being copied, so only
+    these segment results are kept in memory at the same time.
+
+    """
+    if executor == "threads":
+        with ThreadPoolExecutor(max_workers=num_workers) as thread_pool:
+            return _query_resample_kdtree_segments_concurrently(
+                thread_pool, resample_kdtree, source_geo_def, target_geo_def,
+                radius_of_influence, segments, neighbours=neighbours,
+                epsilon=epsilon, reduce_data=reduce_data, num_workers=num_workers)
+
+    max_in_flight = 2 * max(num_workers, 1)
+    results = _iter_results_in_order(
+        (executor.submit(_query_resample_kdtree, resample_kdtree, source_geo_def,
+                         target_geo_def, radius_of_influence, target_slice,
+                         neighbours=neighbours, epsilon=epsilon,
+                         reduce_data=reduce_data)
+         for target_slice in geometry._get_slice(segments, target_geo_def.shape)),
+        max_in_flight)
+
+    valid_output_index = np.empty(target_geo_def.size, dtype=bool)
+    index_array = distance_array = None
+    output_cursor = 0
+    valid_cursor = 0
+    for next_voi, next_ia, next_da in results:
+        if index_array is None:
+            index_array = np.empty((target_geo_def.size,) + next_ia.shape[1:], dtype=next_ia.dtype)
+            distance_array = np.empty((target_geo_def.size,) + next_da.shape[1:], dtype=next_da.dtype)
+        valid_output_index[output_cursor:output_cursor + next_voi.size] = next_voi
+        index_array[valid_cursor:valid_cursor + next_ia.shape[0]] = next_ia
+        distance_array[valid_cursor:valid_cursor + next_da.shape[0]] = next_da
+        output_cursor += next_voi.size
+        valid_cursor += next_ia.shape[0]
+        del next_voi, next_ia, next_da
+
+    index_array = index_array[:valid_cursor]
+    distance_array = distance_array[:valid_cursor]
+    if valid_cursor < target_geo_def.size // 2:
+        # don't keep the full size allocation alive behind small views
+        index_array = index_array.copy()
+        distance_array = distance_array.copy()
+    return valid_output_index, index_array, distance_array
+
+
+def _iter_results_in_order(futures, max_in_flight):
+    """Get the results of lazily submitted futures in order, with at most `max_in_flight` pending."""
+    pending = deque()
+    for future in futures:
+        pending.append(future)
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
 def _get_valid_input_index(source_geo_def,
                            target_geo_def,
                            reduce_data,
                            radius_of_influence,
-                           nprocs=1):
+                           nprocs=1,
+                           compact_dtypes=False):
     """Find indices of reduced inputput data."""
-    source_lons, source_lats = source_geo_def.get_lonlats(nprocs=nprocs)
+    lonlat_dtype = np.float32 if compact_dtypes else None
+    source_lons, source_lats = source_geo_def.get_lonlats(nprocs=nprocs, dtype=lonlat_dtype)
     source_lons = np.asanyarray(source_lons).ravel()
     source_lats = np.asanyarray(source_lats).ravel()
 
@@ -464,10 +798,20 @@ def _get_valid_output_index(source_geo_def, target_geo_def, target_lons,
 def _create_resample_kdtree(source_lons,
                             source_lats,
                             valid_input_index,
-                            nprocs=1):
-    """Set up kd tree on input."""
+                            nprocs=1,
+                            compact_dtypes=False):
+    """Set up kd tree on input.
+
+    With ``compact_dtypes`` the tree is built from ``float32`` coordinates so
+    that queries return ``float32`` distances and ``uint32`` indices.
+
+    """
     source_lons_valid = source_lons[valid_input_index]
     source_lats_valid = source_lats[valid_input_index]
+    if compact_dtypes:
+        # compute the cartesian coordinates directly as float32
+        source_lons_valid = source_lons_valid.astype(np.float32, copy=False)
+        source_lats_valid = source_lats_valid.astype(np.float32, copy=False)
 
     if nprocs > 1:
         cartesian = _spatial_mp.Cartesian_MP(nprocs)
@@ -481,7 +825,9 @@ def _create_resample_kdtree(source_lons,
         raise EmptyResult('No valid data points in input data')
 
     # Build kd-tree on input
-    if nprocs > 1:
+    if compact_dtypes:
+        resample_kdtree = KDTree(input_coords.astype(np.float32, copy=False))
+    elif nprocs > 1:
         resample_kdtree = _spatial_mp.cKDTree_MP(input_coords, nprocs=nprocs)
     else:
         resample_kdtree = KDTree(input_coords)
@@ -509,9 +855,17 @@ def _query_resample_kdtree(resample_kdtree,
     elif not isinstance(epsilon, (long, int, float)):
         raise TypeError('epsilon must be number')
 
-    # Get sliced target coordinates
-    target_lons, target_lats = target_geo_def.get_lonlats(nprocs=nprocs,
-                                                          data_slice=data_slice, dtype=source_geo_def.dtype)
+    # pykdtree requires query points have same data type as kdtree.
+    try:
+        dt = resample_kdtree.data.dtype
+    except AttributeError:
+        # use a sensible default
+        dt = np.dtype('d')
+
+    # Get sliced target coordinates, as float32 for float32 trees
+    lonlat_dtype = dt if dt == np.float32 else source_geo_def.dtype
+    target_lons, target_lats = geometry._get_lonlats_to_read(target_geo_def, nprocs=nprocs,
+                                                             data_slice=data_slice, dtype=lonlat_dtype)
 
     # Find indiced of reduced target coordinates
     valid_output_index = _get_valid_output_index(source_geo_def,
@@ -527,18 +881,20 @@ def _query_resample_kdtree(resample_kdtree,
     else:
         cartesian = _spatial_mp.Cartesian()
 
-    target_lons_valid = target_lons.ravel()[valid_output_index]
-    target_lats_valid = target_lats.ravel()[valid_output_index]
+    if valid_output_index.all():
+        # keep the target grids as they are so separable (broadcast)
+        # longitudes and latitudes are transformed per row and column
+        target_lons_valid = target_lons
+        target_lats_valid = target_lats
+    else:
+        target_lons_valid = target_lons.ravel()[valid_output_index]
+        target_lats_valid = target_lats.ravel()[valid_output_index]
+    if dt == np.float32:
+        target_lons_valid = target_lons_valid.astype(dt, copy=False)
+        target_lats_valid = target_lats_valid.astype(dt, copy=False)
 
     output_coords = cartesian.transform_lonlats(target_lons_valid,
                                                 target_lats_valid)
-
-    # pykdtree requires query points have same data type as kdtree.
-    try:
-        dt = resample_kdtree.data.dtype
-    except AttributeError:
-        # use a sensible default
-        dt = np.dtype('d')
     output_coords = np.asarray(output_coords, dtype=dt)
 
     # Query kd-tree
@@ -550,15 +906,17 @@ def _query_resample_kdtree(resample_kdtree,
     return valid_output_index, index_array, distance_array
 
 
-def _create_empty_info(source_geo_def, target_geo_def, neighbours):
+def _create_empty_info(source_geo_def, target_geo_def, neighbours, compact_dtypes=False):
     """Create dummy info for empty result set."""
     valid_output_index = np.ones(target_geo_def.size, dtype=bool)
-    if neighbours > 1:
-        index_array = (np.ones((target_geo_def.size, neighbours), dtype=np.int32) * source_geo_def.size)
-        distance_array = np.ones((target_geo_def.size, neighbours))
+    if compact_dtypes:
+        index_dtype = np.uint32 if source_geo_def.size < 2 ** 32 else np.uint64
     else:
-        index_array = (np.ones(target_geo_def.size, dtype=np.int32) * source_geo_def.size)
-        distance_array = np.ones(target_geo_def.size)
+        index_dtype = np.int32
+    distance_dtype = np.float32 if compact_dtypes else np.float64
+    shape = (target_geo_def.size, neighbours) if neighbours > 1 else (target_geo_def.size,)
+    index_array = np.full(shape, source_geo_def.size, dtype=index_dtype)
+    distance_array = np.ones(shape, dtype=distance_dtype)
 
     return valid_output_index, index_array, distance_array
 
@@ -567,7 +925,7 @@ def get_sample_from_neighbour_info(resample_type, output_shape, data,
                                    valid_input_index, valid_output_index,
                                    index_array, distance_array=None,
                                    weight_funcs=None, fill_value=0,
-                                   with_uncert=False):
+                                   with_uncert=False, block_size=None):
     """Resamples swath based on neighbour info.
 
     Parameters
@@ -598,6 +956,16 @@ def get_sample_from_neighbour_info(resample_type, output_shape, data,
         Set undetermined pixels to this value.
         If fill_value is None a masked array is returned
         with undetermined pixels masked
+    with_uncert : bool, optional
+        Calculate uncertainty estimates
+    block_size : int or None, optional
+        Maximum number of target pixels to weight at once when using
+        'custom' resampling. The intermediate per-neighbour arrays used
+        for the weighting are as large as the number of target pixels
+        times the number of neighbours and channels. Processing the
+        target pixels in blocks bounds this memory by the block size
+        instead of the size of the target geometry. If None all target
+        pixels are processed at once.
 
     Returns
     -------
@@ -648,7 +1016,7 @@ def get_sample_from_neighbour_info(resample_type, output_shape, data,
         resample_type, neighbours, new_data, index_array, distance_array,
         valid_input_size, valid_output_index, weight_funcs, with_uncert,
         fill_value, output_shape, is_masked_data, is_multi_channel,
-        input_data_type
+        input_data_type, block_size=block_size,
     )
 
 
@@ -692,7 +1060,7 @@ def _validate_resampler_type(resample_type: str, weight_funcs: Any) -> None:
 
 def _extract_resample_result(resample_type, neighbours, new_data, index_array, distance_array, valid_input_size,
                              valid_output_index, weight_funcs, with_uncert, fill_value, output_shape,
-                             is_masked_data, is_multi_channel, input_data_type):
+                             is_masked_data, is_multi_channel, input_data_type, block_size=None):
     # Prepare weight_funcs argument for handling mask data
     if weight_funcs is not None and is_masked_data:
         weight_funcs = weight_funcs * 2 if is_multi_channel else (weight_funcs,) * 2
@@ -709,10 +1077,15 @@ def _extract_resample_result(resample_type, neighbours, new_data, index_array, d
         result = new_data[new_index_array].copy()
         result[index_mask] = fill_value
         stddev = count = None
+    elif block_size is not None:
+        result, stddev, count = _resample_with_weights_in_blocks(
+            new_data, index_array, distance_array, neighbours, valid_input_size,
+            weight_funcs, with_uncert, fill_value, block_size,
+        )
     else:
         result, stddev, count = _resample_with_weights(
             new_data, index_array, distance_array, neighbours, valid_input_size,
-            valid_output_index, weight_funcs, with_uncert, fill_value,
+            weight_funcs, with_uncert, fill_value,
         )
 
     # Create full result
@@ -738,9 +1111,36 @@ def _extract_resample_result(resample_type, neighbours, new_data, index_array, d
     return result
 
 
+def _resample_with_weights_in_blocks(new_data, index_array, distance_array, neighbours,
+                                     input_size, weight_funcs, with_uncert, fill_value,
+                                     block_size):
+    """Calculate the weighted result for blocks of target pixels at a time.
+
+    The results of every block are written into arrays allocated once for
+    all valid target pixels so only the intermediate arrays of one block
+    exist at any time.
+
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be a positive integer")
+    num_rows = index_array.shape[0]
+    results = [None, None, None]
+    for block_start in range(0, num_rows, block_size):
+        block = slice(block_start, block_start + block_size)
+        block_results = _resample_with_weights(
+            new_data, index_array[block], distance_array[block], neighbours,
+            input_size, weight_funcs, with_uncert, fill_value)
+        for res_idx, block_res in enumerate(block_results):
+            if block_res is None:
+                continue
+            if results[res_idx] is None:
+                results[res_idx] = np.empty((num_rows,) + block_res.shape[1:], dtype=block_res.dtype)
+            results[res_idx][block] = block_res
+    return tuple(results)
+
+
 def _resample_with_weights(new_data, index_array, distance_array, neighbours,
-                           input_size, valid_output_index, weight_funcs,
-                           with_uncert, fill_value):
+                           input_size, weight_funcs, with_uncert, fill_value):
     # Calculate result using weighting.
     # Note: the code below has low readability in order
     #       to avoid looping over numpy arrays
@@ -774,7 +1174,7 @@ def _resample_with_weights(new_data, index_array, distance_array, neighbours,
 
         # Calculate weights for each channel
         weights = []
-        num_weights = valid_output_index.sum()
+        num_weights = index_array.shape[0]
         num_channels = new_data.shape[1]
         for j in range(num_channels):
             calc_weight = weight_funcs[j](distance)
@@ -899,6 +1299,161 @@ def _prepare_result(result, output_shape, is_masked_data, use_masked_fill_value,
     return result
 
 
+class SparseNeighbourWeights:
+    """Reusable sparse weighting operator built from neighbour info.
+
+    The weights of all neighbours of every target pixel are computed and
+    normalised once and stored as a :class:`scipy.sparse.csr_matrix` of
+    shape ``(target size, source size)``. Resampling then only needs a
+    single sparse-dense matrix product for any number of channels instead
+    of gathering and weighting every neighbour of every channel separately
+    like :func:`get_sample_from_neighbour_info`. This is mostly useful when
+    many channels or many datasets on the same swath are resampled with
+    the same weight function.
+
+    The result is the same as the ``'custom'`` resampling of
+    :func:`get_sample_from_neighbour_info` with a single weight function
+    used for all channels. Uncertainty estimates are not supported.
+
+    Instances can be stored with :meth:`save` and restored with
+    :meth:`load` to reuse them for other granules with the same
+    geolocation.
+
+    Example:
+        >>> ninfo = get_neighbour_info(swath_def, area_def, 50000, neighbours=8)
+        >>> weights = SparseNeighbourWeights.from_neighbour_info(
+        ...     area_def.shape, *ninfo, weight_func=lambda r: np.exp(-r ** 2 / 25000. ** 2))
+        >>> result = weights.resample(data)
+
+    """
+
+    def __init__(self, matrix, output_shape):
+        """Initialize the operator from an already normalised sparse matrix.
+
+        Args:
+            matrix (scipy.sparse.csr_matrix): Normalised weights of shape
+                ``(target size, source size)``. Target pixels without any
+                non-zero weight are filled when resampling.
+            output_shape (tuple): Shape of the target geometry.
+
+        """
+        if sparse is None:
+            raise ImportError("Missing 'scipy' dependency")
+        self.matrix = sparse.csr_matrix(matrix)
+        self.output_shape = tuple(output_shape)
+        self._has_weight = np.diff(self.matrix.indptr) > 0
+
+    @classmethod
+    def from_neighbour_info(cls, output_shape, valid_input_index, valid_output_index,
+                            index_array, distance_array, weight_func):
+        """Create the operator from the result of :func:`get_neighbour_info`.
+
+        Args:
+            output_shape (tuple): Shape of the target geometry.
+            valid_input_index (numpy.ndarray): ``valid_input_index`` from
+                :func:`get_neighbour_info`.
+            valid_output_index (numpy.ndarray): ``valid_output_index`` from
+                :func:`get_neighbour_info`.
+            index_array (numpy.ndarray): ``index_array`` from
+                :func:`get_neighbour_info`.
+            distance_array (numpy.ndarray): ``distance_array`` from
+                :func:`get_neighbour_info`.
+            weight_func (callable): Weight function f(dist) used for all
+                channels.
+
+        """
+        valid_input_size = int(valid_input_index.sum())
+        if index_array.ndim == 1:
+            index_array = index_array[:, np.newaxis]
+            distance_array = distance_array[:, np.newaxis]
+        valid_neighbours = index_array < valid_input_size
+
+        weights = np.zeros(index_array.shape, dtype=np.float64)
+        for i in range(index_array.shape[1]):  # Iterate over number of neighbours
+            # set out of bounds distance to 1 in order to avoid numerical Inf
+            distance = np.where(valid_neighbours[:, i], distance_array[:, i], 1)
+            weights[:, i] = weight_func(distance)
+        weights[~valid_neighbours] = 0
+
+        output_size = int(np.prod(output_shape))
+        rows = np.broadcast_to(np.flatnonzero(valid_output_index)[:, np.newaxis],
+                               index_array.shape)[valid_neighbours]
+        cols = np.flatnonzero(valid_input_index)[index_array[valid_neighbours]]
+        weights = weights[valid_neighbours]
+
+        norm = np.bincount(rows, weights=weights, minlength=output_size)
+        is_normalizable = (norm > 0)[rows]
+        rows = rows[is_normalizable]
+        weights = weights[is_normalizable] / norm[rows]
+        matrix = sparse.csr_matrix((weights, (rows, cols[is_normalizable])),
+                                   shape=(output_size, valid_input_index.size))
+        return cls(matrix, output_shape)
+
+    def resample(self, data, fill_value=0):
+        """Resample one or more channels of source data.
+
+        Args:
+            data (numpy.ndarray): Source data of the same shape as the source
+                geometry or with the channels along an extra last dimension.
+                If a masked array is provided any target pixel with a
+                non-zero weight for a masked source pixel is masked.
+            fill_value (int, float or None): Value for target pixels without
+                any valid neighbour. If None a masked array is returned.
+
+        Returns:
+            numpy.ndarray: Resampled data of shape ``output_shape`` with the
+            channels along an extra last dimension if there are more than one.
+
+        """
+        input_size = self.matrix.shape[1]
+        if data.ndim > 2 and data.shape[0] * data.shape[1] == input_size:
+            data = data.reshape(data.shape[0] * data.shape[1], data.shape[2])
+        elif data.shape[0] != input_size:
+            data = data.ravel()
+        if data.shape[0] != input_size:
+            raise ValueError('Mismatch between geometry and dataset')
+
+        is_multi_channel = data.ndim > 1
+        final_output_shape = self.output_shape + data.shape[1:] if is_multi_channel else self.output_shape
+        data_mask = np.ma.getmaskarray(data) if np.ma.isMA(data) else None
+        values = np.ma.getdata(data)
+        if data_mask is not None:
+            values = np.where(data_mask, 0, values)
+
+        result = self.matrix @ values
+        fill_mask = ~self._has_weight
+        if is_multi_channel:
+            fill_mask = np.broadcast_to(fill_mask[:, np.newaxis], result.shape)
+        if data_mask is not None:
+            fill_mask = fill_mask | ((self.matrix @ data_mask.astype(np.float64)) != 0)
+
+        if fill_value is None:
+            return np.ma.array(result, mask=fill_mask).reshape(final_output_shape)
+        result[fill_mask] = fill_value
+        return result.reshape(final_output_shape)
+
+    def save(self, filename):
+        """Save the operator to a ``.npz`` file to reuse it later with :meth:`load`."""
+        np.savez(filename,
+                 data=self.matrix.data,
+                 indices=self.matrix.indices,
+                 indptr=self.matrix.indptr,
+                 matrix_shape=np.array(self.matrix.shape),
+                 output_shape=np.array(self.output_shape))
+
+    @classmethod
+    def load(cls, filename):
+        """Load an operator previously stored with :meth:`save`."""
+        if sparse is None:
+            raise ImportError("Missing 'scipy' dependency")
+        with np.load(filename, allow_pickle=False) as npz_file:
+            matrix = sparse.csr_matrix(
+                (npz_file["data"], npz_file["indices"], npz_file["indptr"]),
+                shape=tuple(npz_file["matrix_shape"]))
+            output_shape = tuple(int(size) for size in npz_file["output_shape"])
+        return cls(matrix, output_shape)
+
+
 class XArrayResamplerNN(object):
     """Resampler for Xarray DataArray objects with the nearest neighbor algorithm."""
 
@@ -907,7 +1462,9 @@ class XArrayResamplerNN(object):
                  target_geo_def,
                  radius_of_influence=None,
                  neighbours=1,
-                 epsilon=0):
+                 epsilon=0,
+                 compact_dtypes=None,
+                 source_kdtree=None):
         """Resampler for xarray DataArrays using a nearest neighbor algorithm.
 
         Parameters
@@ -926,6 +1483,19 @@ class XArrayResamplerNN(object):
         epsilon : float, optional
             Allowed uncertainty in meters. Increasing uncertainty
             reduces execution time
+        compact_dtypes : bool, optional
+            Build the KDTree from ``float32`` coordinates and return the
+            index array as ``int32`` instead of ``int64``. This halves the
+            memory used by the tree and the index array. Sources with
+            ``2**31`` pixels or more keep an ``int64`` index array. The
+            longitudes and latitudes of areas are computed as ``float32``
+            too. See :func:`get_neighbour_info` for the accuracy
+            implications. If ``None`` the ``compact_dtypes`` configuration
+            option is used.
+        source_kdtree : SourceKDTree, optional
+            KDTree of the source geometry shared with other resamplers. If
+            not provided one is taken from :func:`get_source_kdtree` when
+            its cache is enabled, otherwise a new tree is built.
 
         """
         if DataArray is None:
@@ -938,6 +1508,8 @@ class XArrayResamplerNN(object):
         self.delayed_kdtree = None
         self.neighbours = neighbours
         self.epsilon = epsilon
+        self.compact_dtypes = resolve_compact_dtypes(compact_dtypes)
+        self.source_kdtree = source_kdtree
         self.source_geo_def = source_geo_def
         self.target_geo_def = target_geo_def
         if radius_of_influence is None:
@@ -946,6 +1518,11 @@ class XArrayResamplerNN(object):
         if self.target_geo_def.ndim != 2:
             raise ValueError("Target area definition must be 2 dimensions")
 
+    @property
+    def _lonlat_dtype(self):
+        """Data type requested for the longitudes and latitudes of areas."""
+        return np.float32 if self.compact_dtypes else None
+
     def _compute_radius_of_influence(self):
         """Estimate a good default radius_of_influence."""
         try:
@@ -970,13 +1547,13 @@ class XArrayResamplerNN(object):
     def _create_resample_kdtree(self, chunks=CHUNK_SIZE):
         """Set up kd tree on input."""
         source_lons, source_lats = self.source_geo_def.get_lonlats(
-            chunks=chunks)
+            chunks=chunks, dtype=self._lonlat_dtype)
         valid_input_idx = ((source_lons >= -180) & (source_lons <= 180) & (source_lats <= 90) & (source_lats >= -90))
-        input_coords = lonlat2xyz(source_lons, source_lats)
+        input_coords = lonlat2xyz(source_lons, source_lats,
+                                  dtype=np.float32 if self.compact_dtypes else np.float64)
         input_coords = input_coords[valid_input_idx.ravel(), :]
 
         # Build kd-tree on input
-        input_coords = input_coords.astype(np.float64)
         delayed_kdtree = dask.delayed(KDTree, pure=True)(input_coords)
         return valid_input_idx, delayed_kdtree
 
@@ -993,13 +1570,18 @@ class XArrayResamplerNN(object):
             ndims = self.source_geo_def.ndim
             dims = 'mn'[:ndims]
             args = (mask, dims, self.valid_input_index, dims)
+        # -1 marks missing neighbours so the index type must be signed
+        if self.compact_dtypes and self.source_geo_def.size < 2 ** 31:
+            index_dtype = np.int32
+        else:
+            index_dtype = np.int64
         # res.shape = rows, cols, neighbors
         # j=rows, i=cols, k=neighbors, m=source rows, n=source cols
         res = blockwise(query_no_distance, 'jik', tlons, 'ji', tlats, 'ji',
                         valid_oi, 'ji', *args, kdtree=resample_kdtree,
                         neighbours=self.neighbours, epsilon=self.epsilon,
-                        radius=self.radius_of_influence, dtype=np.int64,
-                        meta=np.array((), dtype=np.int64),
+                        radius=self.radius_of_influence, index_dtype=index_dtype,
+                        dtype=index_dtype, meta=np.array((), dtype=index_dtype),
                         new_axes={'k': self.neighbours}, concatenate=True)
         return res, None
 
@@ -1018,13 +1600,19 @@ class XArrayResamplerNN(object):
 
         # Create kd-tree
         chunks = mask.chunks if mask is not None else CHUNK_SIZE
-        valid_input_idx, resample_kdtree = self._create_resample_kdtree(
-            chunks=chunks)
+        source_kdtree = _get_shared_source_kdtree(self.source_kdtree, self.source_geo_def,
+                                                  compact_dtypes=self.compact_dtypes)
+        if source_kdtree is None:
+            valid_input_idx, resample_kdtree = self._create_resample_kdtree(
+                chunks=chunks)
+        else:
+            valid_input_idx, resample_kdtree = source_kdtree.to_dask(chunks=chunks)
         self.valid_input_index = valid_input_idx
         self.delayed_kdtree = resample_kdtree
 
         # TODO: Add 'chunks' keyword argument to this method and use it
-        target_lons, target_lats = self.target_geo_def.get_lonlats(chunks=CHUNK_SIZE)
+        target_lons, target_lats = geometry._get_lonlats_to_read(self.target_geo_def, chunks=CHUNK_SIZE,
+                                                                 dtype=self._lonlat_dtype)
         valid_output_idx = ((target_lons >= -180) & (target_lons <= 180) & (target_lats <= 90) & (target_lats >= -90))
 
         if mask is not None:
@@ -27,6 +27,7 @@ from pyproj import Transformer
 from pyproj.enums import TransformDirection
 
 from pyresample import AreaDefinition, SwathDefinition
+from pyresample._caching import cache_to_json_if
 from pyresample.geometry import (
     IncompatibleAreas,
     InvalidArea,
@@ -94,7 +95,17 @@ class Slicer(ABC):
 
 
 class SwathSlicer(Slicer):
-    """A Slicer for cropping SwathDefinitions."""
+    """A Slicer for cropping SwathDefinitions.
+
+    The slices are cached like the slices of
+    :meth:`~pyresample.geometry.AreaDefinition.get_area_slices` if the
+    ``cache_geometry_slices`` configuration option is enabled.
+
+    """
+
+    def get_slices(self):
+        """Get the slices to crop *area_to_crop* enclosing *area_to_contain*."""
+        return tuple(_get_swath_slices(self.area_to_crop, self.area_to_contain))
 
     def get_polygon_to_contain(self):
         """Get the shapely Polygon corresponding to *area_to_contain* in lon/lat coordinates."""
@@ -123,6 +134,15 @@ class SwathSlicer(Slicer):
         return slices
 
 
+@cache_to_json_if("cache_geometry_slices",
+                  memory_size_config_key="cache_geometry_slices_memory_size",
+                  max_entries_config_key="cache_geometry_slices_max_entries",
+                  cache_name="swath_slices")
+def _get_swath_slices(swath_to_crop, area_to_contain):
+    slicer = SwathSlicer(swath_to_crop, area_to_contain)
+    return slicer.get_slices_from_polygon(slicer.get_polygon_to_contain())
+
+
 @lru_cache(maxsize=10)
 def _get_chunk_polygons_for_swath_to_crop(swath_to_crop):
     """Get the polygons for each chunk of the area_to_crop."""
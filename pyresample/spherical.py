@@ -24,6 +24,14 @@ import logging
 
 import numpy as np
 
+from pyresample import CHUNK_SIZE
+from pyresample._spherical_arrays import (
+    distances,
+    great_circles_intersection,
+    points_inside_polygon,
+    points_on_arcs,
+)
+
 logger = logging.getLogger(__name__)
 
 EPSILON = 0.0000001
@@ -120,6 +128,18 @@ def _check_lon_lat(lon, lat):
     return lon, lat
 
 
+def _lonlat_radians_to_xyz(lons, lats):
+    """Convert longitudes and latitudes in radians to ``(..., 3)`` unit vectors."""
+    cos_lats = np.cos(lats)
+    return np.stack((cos_lats * np.cos(lons), cos_lats * np.sin(lons), np.sin(lats)), axis=-1)
+
+
+def _allclose_coordinates(lon1, lat1, lon2, lat2):
+    """Vectorised ``SCoordinate(lon1, lat1) == SCoordinate(lon2, lat2)``."""
+    return ((np.abs(lon1 - lon2) <= 1e-8 + 1e-5 * np.abs(lon2)) &
+            (np.abs(lat1 - lat2) <= 1e-8 + 1e-5 * np.abs(lat2)))
+
+
 class SCoordinate(object):
     """Spherical coordinates.
 
@@ -516,6 +536,96 @@ class Arc(object):
         return None, None
 
 
+class _EdgeIntersections:
+    """Intersections of all the pairs of arcs of two lists, computed at once.
+
+    The arcs of both lists are numbered together, the ones of the first
+    list first. The intersections are computed on unit vectors with the
+    functions of :mod:`pyresample._spherical_arrays` and
+    :meth:`get_next_intersection` replaces :meth:`Arc.get_next_intersection`
+    with a lookup in them.
+    """
+
+    # number of arcs of one list intersected with all the others at once
+    block_size = 256
+
+    def __init__(self, arcs1, arcs2):
+        """Compute the intersections of the arcs of the two lists."""
+        arcs1 = list(arcs1)
+        self.arcs = arcs1 + list(arcs2)
+        self.edges1 = list(range(len(arcs1)))
+        self.edges2 = list(range(len(arcs1), len(self.arcs)))
+        self._lonlats = np.array([(arc.start.lon, arc.start.lat, arc.end.lon, arc.end.lat)
+                                  for arc in self.arcs], dtype=np.float64).T
+        self._starts = _lonlat_radians_to_xyz(self._lonlats[0], self._lonlats[1])
+        self._ends = _lonlat_radians_to_xyz(self._lonlats[2], self._lonlats[3])
+        self.lons = np.full((len(self.arcs), len(self.arcs)), np.nan)
+        self.lats = np.full((len(self.arcs), len(self.arcs)), np.nan)
+        self._intersect(self.edges1, self.edges2)
+        self._intersect(self.edges2, self.edges1)
+
+    def _intersect(self, edges, other_edges):
+        if not edges or not other_edges:
+            return
+        others = slice(other_edges[0], other_edges[-1] + 1)
+        for start in range(edges[0], edges[-1] + 1, self.block_size):
+            rows = slice(start, min(start + self.block_size, edges[-1] + 1))
+            starts1, ends1 = self._starts[rows, np.newaxis], self._ends[rows, np.newaxis]
+            starts2, ends2 = self._starts[np.newaxis, others], self._ends[np.newaxis, others]
+            lonlats1, lonlats2 = self._lonlats[:, rows, np.newaxis], self._lonlats[:, np.newaxis, others]
+            # like Arc.intersection, an arc doesn't intersect itself
+            same_arcs = (_allclose_coordinates(*lonlats1[:2], *lonlats2[:2]) &
+                         _allclose_coordinates(*lonlats1[2:], *lonlats2[2:]))
+            candidate = great_circles_intersection(starts1, ends1, starts2, ends2)
+            len1 = distances(starts1, ends1)
+            len2 = distances(starts2, ends2)
+            # the antipode is only used if the candidate isn't on the arcs
+            for point in (-candidate, candidate):
+                lons = _unwrap_radians(np.arctan2(point[..., 1], point[..., 0]))
+                lats = np.arctan2(point[..., 2], np.hypot(point[..., 0], point[..., 1]))
+                # like Arc.intersection, the arc ends are compared as SCoordinate
+                on_arc1 = (points_on_arcs(point, starts1, ends1, len1) |
+                           _allclose_coordinates(lons, lats, *lonlats1[:2]) |
+                           _allclose_coordinates(lons, lats, *lonlats1[2:]))
+                on_arc2 = (points_on_arcs(point, starts2, ends2, len2) |
+                           _allclose_coordinates(lons, lats, *lonlats2[:2]) |
+                           _allclose_coordinates(lons, lats, *lonlats2[2:]))
+                found = on_arc1 & on_arc2 & ~same_arcs
+                self.lons[rows, others] = np.where(found, lons, self.lons[rows, others])
+                self.lats[rows, others] = np.where(found, lats, self.lats[rows, others])
+
+    def get_next_intersection(self, edge, other_edges, known_inter=None):
+        """Get the next intersection between the arc `edge` and the arcs `other_edges`.
+
+        Same as :meth:`Arc.get_next_intersection` with arc numbers instead of
+        arcs. Returns the intersection and the number of the intersected arc.
+        """
+        other_edges = np.asarray(other_edges)
+        lons = self.lons[edge, other_edges]
+        lats = self.lats[edge, other_edges]
+        start_lon, start_lat, end_lon, end_lat = self._lonlats[:, edge]
+        valid = (~np.isnan(lons) &
+                 ~_allclose_coordinates(lons, lats, self._lonlats[2, other_edges], self._lonlats[3, other_edges]) &
+                 ~_allclose_coordinates(lons, lats, end_lon, end_lat))
+        other_edges, lons, lats = other_edges[valid], lons[valid], lats[valid]
+        if not other_edges.size:
+            return None, None
+        dists = _vincenty_matrix(start_lon, start_lat, lons, lats)[0]
+
+        take_next = False
+        for idx in np.argsort(dists, kind="stable"):
+            inter = SCoordinate(lons[idx], lats[idx])
+            if known_inter is not None:
+                if known_inter == inter:
+                    take_next = True
+                elif take_next:
+                    return inter, int(other_edges[idx])
+            else:
+                return inter, int(other_edges[idx])
+
+        return None, None
+
+
 class SphPolygon:
     """Spherical polygon.
 
@@ -641,14 +751,17 @@ class SphPolygon:
         polygon, and so on until you come back to the first intersection. In
         which direction to follow the edges of the polygons depends if you are
         interested in the union or the intersection of the two polygons.
+
+        The intersections of all the pairs of edges of the two polygons are
+        computed at once with array operations before following the edges.
         """
-        arcs1 = [edge for edge in self.aedges()]
-        arcs2 = [edge for edge in other.aedges()]
+        intersections = _EdgeIntersections(self.aedges(), other.aedges())
+        arcs = intersections.arcs
 
         # find the first intersection, to start from.
-        for edge1 in arcs1:
-            inter, edge2 = edge1.get_next_intersection(arcs2)
-            if inter is not None and inter != edge1.end and inter != edge2.end:
+        for edge1 in intersections.edges1:
+            inter, edge2 = intersections.get_next_intersection(edge1, intersections.edges2)
+            if inter is not None and inter != arcs[edge1].end and inter != arcs[edge2].end:
                 break
 
         # if no intersection is found, find out if the one poly is included in
@@ -662,15 +775,18 @@ class SphPolygon:
 
             return None
 
-        nodes = self._find_intersection_nodes(inter, edge1, edge2, arcs1, arcs2, sign)
+        nodes = self._find_intersection_nodes(inter, edge1, edge2, intersections, sign)
         return SphPolygon(np.array([(node.lon, node.lat) for node in nodes]), radius=self.radius)
 
     @staticmethod
-    def _find_intersection_nodes(inter, edge1, edge2, arcs1, arcs2, sign):
+    def _find_intersection_nodes(inter, edge1, edge2, intersections, sign):
         def rotate_arcs(start_arc, arcs):
             idx = arcs.index(start_arc)
             return arcs[idx:] + arcs[:idx]
 
+        arcs = intersections.arcs
+        arcs1 = intersections.edges1
+        arcs2 = intersections.edges2
         # starting from the intersection, follow the edges of one of the polygons
         nodes = []
         while True:
@@ -680,8 +796,8 @@ class SphPolygon:
             narcs1 = arcs1 + [edge1]
             narcs2 = arcs2 + [edge2]
 
-            arc1 = Arc(inter, edge1.end)
-            arc2 = Arc(inter, edge2.end)
+            arc1 = Arc(inter, arcs[edge1].end)
+            arc2 = Arc(inter, arcs[edge2].end)
 
             if np.sign(arc1.angle(arc2)) != sign:
                 arcs1, arcs2 = arcs2, arcs1
@@ -690,11 +806,11 @@ class SphPolygon:
             nodes.append(inter)
 
             for edge1 in narcs1:
-                inter, edge2 = edge1.get_next_intersection(narcs2, inter)
+                inter, edge2 = intersections.get_next_intersection(edge1, narcs2, inter)
                 if inter is not None:
                     break
-                elif len(nodes) > 0 and edge1.end not in [nodes[-1], nodes[0]]:
-                    nodes.append(edge1.end)
+                elif len(nodes) > 0 and arcs[edge1].end not in [nodes[-1], nodes[0]]:
+                    nodes.append(arcs[edge1].end)
 
             if inter is None and len(nodes) > 2 and nodes[-1] == nodes[0]:
                 nodes = nodes[:-1]
@@ -743,15 +859,58 @@ class SphPolygon:
                    SCoordinate(self.lon[0],
                                self.lat[0]))
 
-        other_arcs = [edge for edge in other.aedges()]
-        for arc in [arc1, arc2, arc3]:
-            inter, other_arc = arc.get_next_intersection(other_arcs)
+        intersections = _EdgeIntersections([arc1, arc2, arc3], other.aedges())
+        for edge in intersections.edges1:
+            inter, other_edge = intersections.get_next_intersection(edge, intersections.edges2)
             if inter is not None:
-                sarc = Arc(arc.start, inter)
-                earc = Arc(inter, other_arc.end)
+                sarc = Arc(intersections.arcs[edge].start, inter)
+                earc = Arc(inter, intersections.arcs[other_edge].end)
                 return sarc.angle(earc) < 0
         return other.area() > (2 * np.pi * other.radius ** 2)
 
+    def contains(self, points):
+        """Check which points are inside the polygon.
+
+        Vectorised point-in-polygon test for the many points of a
+        :class:`~pyresample.future.spherical.SMultiPoint` (or a single
+        :class:`~pyresample.future.spherical.SPoint`) at once. The polygon
+        doesn't need to be convex. Points lying on an edge may be found
+        either inside or outside.
+
+        Args:
+            points (SCoordinate): Points with longitudes and latitudes in radians.
+
+        Returns:
+            Boolean array with the shape of the longitudes of `points`.
+        """
+        return self._contains_lonlats(points.lon, points.lat)
+
+    def contains_dask(self, lons, lats, chunks=CHUNK_SIZE):
+        """Check lazily which points are inside the polygon.
+
+        Dask version of :meth:`contains` for points too many to hold in
+        memory at once, the points are checked chunk by chunk.
+
+        Args:
+            lons (array-like): Longitudes of the points in radians, numpy or dask array.
+            lats (array-like): Latitudes of the points in radians, numpy or dask array.
+            chunks: Chunk size used for numpy `lons` and `lats`.
+
+        Returns:
+            Dask boolean array with the shape of `lons`.
+        """
+        import dask.array as da
+
+        lons = da.asarray(lons, chunks=chunks)
+        lats = da.asarray(lats, chunks=lons.chunks).rechunk(lons.chunks)
+        return da.map_blocks(self._contains_lonlats, lons, lats,
+                             dtype=bool, meta=np.array((), dtype=bool))
+
+    def _contains_lonlats(self, lons, lats):
+        cos_lats = np.cos(lats)
+        points = np.stack((cos_lats * np.cos(lons), cos_lats * np.sin(lons), np.sin(lats)), axis=-1)
+        return points_inside_polygon(points, self.cvertices / self.radius)
+
     def __str__(self):
         """Get numpy representation of vertices."""
         return str(np.rad2deg(self.vertices))
@@ -15,7 +15,12 @@
 #
 # You should have received a copy of the GNU Lesser General Public License along
 # with this program.  If not, see <http://www.gnu.org/licenses/>.
-"""Classes for spherical geometry operations."""
+"""Classes for spherical geometry operations.
+
+The computations are done by the array functions of
+:mod:`pyresample._spherical_arrays`, the classes and functions of this module
+convert their arguments to and from arrays of unit vectors.
+"""
 
 from __future__ import absolute_import
 
@@ -24,6 +29,8 @@ import warnings
 
 import numpy as np
 
+from pyresample import _spherical_arrays
+
 warnings.warn("This module will be removed in pyresample 2.0, please use the "
               "`pyresample.spherical` module functions and class instead.",
               DeprecationWarning, stacklevel=2)
@@ -150,6 +157,19 @@ class Coordinate(object):
                 self.y__ * point.y__ +
                 self.z__ * point.z__)
 
+    @classmethod
+    def from_xyz(cls, xyz):
+        """Create a coordinate from a unit vector."""
+        lon, lat = _spherical_arrays.xyz_to_lonlat(np.asarray(xyz, dtype=np.float64))
+        return cls(float(lon), float(lat))
+
+
+def _to_xyz(points):
+    """Get the unit vectors of a coordinate or a sequence of coordinates."""
+    if isinstance(points, Coordinate):
+        return np.array([points.x__, points.y__, points.z__], dtype=np.float64)
+    return np.array([[point.x__, point.y__, point.z__] for point in points], dtype=np.float64)
+
 
 class Arc(object):
     """An arc of the great circle between two points."""
@@ -213,28 +233,10 @@ class Arc(object):
         else:
             raise ValueError("No common point in angle computation.")
 
-        ua_ = a__.cross(b__)
-        ub_ = a__.cross(c__)
-
-        val = ua_.dot(ub_) / (ua_.norm() * ub_.norm())
-        angle = self._convert_to_angle(val, snap_to_zero=snap)
-
-        n__ = ua_.normalize()
-        return -angle if n__.dot(c__) > 0 else angle
-
-    @staticmethod
-    def _convert_to_angle(val: float, snap_to_zero: bool) -> float:
-        if snap_to_zero:
-            if abs(val - 1) < EPSILON:
-                return 0
-            elif abs(val + 1) < EPSILON:
-                return math.pi
-        else:
-            if 0 <= val - 1 < EPSILON:
-                return 0
-            elif -EPSILON < val + 1 <= 0:
-                return math.pi
-        return math.acos(val)
+        angle = _spherical_arrays.arc_angles(_to_xyz(a__), _to_xyz(b__), _to_xyz(c__), snap=snap)
+        if np.isnan(angle):
+            raise ZeroDivisionError("Angle computation with a zero length arc.")
+        return float(angle)
 
     def intersections(self, other_arc):
         """Get the two intersections of the greats circles defined by the current arc and *other_arc*."""
@@ -275,19 +277,11 @@ class Arc(object):
 
         An arc is defined as the shortest tracks between two points.
         """
-        for i in self.intersections(other_arc):
-            a__ = self.start
-            b__ = self.end
-            c__ = other_arc.start
-            d__ = other_arc.end
-
-            ab_ = a__.distance(b__)
-            cd_ = c__.distance(d__)
-
-            if (abs(a__.distance(i) + b__.distance(i) - ab_) < EPSILON and
-                    abs(c__.distance(i) + d__.distance(i) - cd_) < EPSILON):
-                return i
-        return None
+        point = _spherical_arrays.arcs_intersection(_to_xyz(self.start), _to_xyz(self.end),
+                                                    _to_xyz(other_arc.start), _to_xyz(other_arc.end))
+        if np.isnan(point[0]):
+            return None
+        return Coordinate.from_xyz(point)
 
 
 def modpi(val):
@@ -300,19 +294,7 @@ def get_polygon_area(corners):
     # We assume the earth is spherical !!!
     # Should be the radius of the earth at the observed position
     R = 1
-
-    c1_ = corners[0]
-    area = 0
-
-    for idx in range(1, len(corners) - 1):
-        b1_ = Arc(c1_, corners[idx])
-        b2_ = Arc(c1_, corners[idx + 1])
-        b3_ = Arc(corners[idx], corners[idx + 1])
-        e__ = (abs(b1_.angle(b2_, snap=False)) +
-               abs(b2_.angle(b3_, snap=False)) +
-               abs(b3_.angle(b1_, snap=False)))
-        area += e__ - math.pi
-    return R ** 2 * area
+    return R ** 2 * float(_spherical_arrays.get_polygon_areas(_to_xyz(corners)))
 
 
 def get_intersections(b__, boundaries):
@@ -360,71 +342,19 @@ def point_inside(point, corners):
 
     This uses great circle arcs as area boundaries.
     """
-    arc1 = Arc(corners[0], corners[1])
-    arc2 = Arc(corners[1], corners[2])
-    arc3 = Arc(corners[2], corners[3])
-    arc4 = Arc(corners[3], corners[0])
-
-    arc5 = Arc(corners[1], point)
-    arc6 = Arc(corners[3], point)
-
-    angle1 = modpi(arc1.angle(arc2))
-    angle1bis = modpi(arc1.angle(arc5))
-
-    angle2 = modpi(arc3.angle(arc4))
-    angle2bis = modpi(arc3.angle(arc6))
-
-    return (np.sign(angle1) == np.sign(angle1bis) and
-            abs(angle1) > abs(angle1bis) and
-            np.sign(angle2) == np.sign(angle2bis) and
-            abs(angle2) > abs(angle2bis))
+    return bool(_spherical_arrays.points_inside_quadrilaterals(_to_xyz(point), _to_xyz(corners)))
 
 
 def intersection_polygon(area_corners, segment_corners):
     """Get the intersection polygon between two areas."""
-    area_boundaries = [Arc(area_corners[0], area_corners[1]),
-                       Arc(area_corners[1], area_corners[2]),
-                       Arc(area_corners[2], area_corners[3]),
-                       Arc(area_corners[3], area_corners[0])]
-    segment_boundaries = [Arc(segment_corners[0], segment_corners[1]),
-                          Arc(segment_corners[1], segment_corners[2]),
-                          Arc(segment_corners[2], segment_corners[3]),
-                          Arc(segment_corners[3], segment_corners[0])]
-
-    angle1 = area_boundaries[0].angle(area_boundaries[1])
-    angle2 = segment_boundaries[0].angle(segment_boundaries[1])
-    if np.sign(angle1) != np.sign(angle2):
-        segment_corners.reverse()
-        segment_boundaries = [Arc(segment_corners[0], segment_corners[1]),
-                              Arc(segment_corners[1], segment_corners[2]),
-                              Arc(segment_corners[2], segment_corners[3]),
-                              Arc(segment_corners[3], segment_corners[0])]
-    poly = []
-
-    boundaries = area_boundaries
-    other_boundaries = segment_boundaries
-
-    b__ = None
-
-    for b__ in boundaries:
-        if point_inside(b__.start, segment_corners):
-            poly.append(b__.start)
-            break
-        else:
-            inter = get_first_intersection(b__, other_boundaries)
-            if inter is not None:
-                poly.append(inter)
-                break
-    if len(poly) == 0:
+    vertices, count = _spherical_arrays.intersection_polygons(_to_xyz(area_corners), _to_xyz(segment_corners))
+    if count == 0:
         return None
-    while len(poly) < 2 or poly[0] != poly[-1]:
-        inter, b2_ = get_next_intersection(poly[-1], b__, other_boundaries)
-        if inter is None:
-            poly.append(b__.end)
-            idx = (boundaries.index(b__) + 1) % len(boundaries)
-            b__ = boundaries[idx]
-        else:
-            poly.append(inter)
-            b__ = b2_
-            boundaries, other_boundaries = other_boundaries, boundaries
-    return poly[:-1]
+    corners = list(area_corners) + list(segment_corners)
+    corners_xyz = _to_xyz(corners)
+    poly = []
+    for vertex in vertices[:count]:
+        # keep the corners themselves to not lose precision converting them back to lon/lat
+        same = np.flatnonzero(np.all(corners_xyz == vertex, axis=-1))
+        poly.append(corners[same[0]] if same.size else Coordinate.from_xyz(vertex))
+    return poly
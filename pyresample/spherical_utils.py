@@ -22,7 +22,9 @@ local stations over a certain time window where we want to calculate how much
 of an area is covered by the onboard scanning instrument(s).
 """
 
-import itertools
+import numpy as np
+
+from pyresample._spherical_arrays import caps_overlap, get_bounding_caps
 
 
 class GetNonOverlapUnionsBaseClass():
@@ -67,7 +69,17 @@ class GetNonOverlapUnionsBaseClass():
 
         return False
 
-    def _find_union_pair(self, geoms):
+    def _get_bounding_cap(self, geom):
+        """Get a spherical cap containing a geometry.
+
+        Return the centre of the cap as a unit vector and its angular radius,
+        or None if no such cap is known for the geometry. Pairs of geometries
+        whose caps don't intersect are not checked for overlap.
+
+        """
+        return None
+
+    def _find_union_pair(self, geoms, cache=None):
         """From a set of geometries find a pair that overlaps.
 
         *geoms* is here expected to be a numbered dict with SphPolygon
@@ -77,14 +89,35 @@ class GetNonOverlapUnionsBaseClass():
         Strictly the geometries/objects does not need to be a SphPolygon. The
         only requirement is that it has a union method with the same behaviour.
 
+        *cache* is a dict shared by the successive calls made while merging
+        the same geometries. It keeps the bounding caps of the geometries and
+        the pairs already known not to overlap, so that each pair is only
+        checked once.
+
         """
-        if len(geoms) == 1:
+        if len(geoms) <= 1:
             return None
-
-        for id_, komb_pair in zip(itertools.combinations(geoms.keys(), 2),
-                                  itertools.combinations(geoms.values(), 2)):
-            if self._overlaps(komb_pair[0], komb_pair[1]):
-                return id_, komb_pair[0].union(komb_pair[1])
+        if cache is None:
+            cache = {}
+        caps = cache.setdefault("caps", {})
+        disjoint_pairs = cache.setdefault("disjoint_pairs", set())
+
+        keys = list(geoms.keys())
+        for key in keys:
+            if key not in caps:
+                caps[key] = self._get_bounding_cap(geoms[key])
+        centers = np.array([(0.0, 0.0, 1.0) if caps[key] is None else caps[key][0] for key in keys])
+        radii = np.array([np.pi if caps[key] is None else caps[key][1] for key in keys])
+        candidates = np.triu(caps_overlap(centers, radii, centers, radii), 1)
+
+        # same order as itertools.combinations
+        for idx1, idx2 in np.argwhere(candidates):
+            id_ = keys[idx1], keys[idx2]
+            if id_ in disjoint_pairs:
+                continue
+            if self._overlaps(geoms[id_[0]], geoms[id_[1]]):
+                return id_, geoms[id_[0]].union(geoms[id_[1]])
+            disjoint_pairs.add(id_)
 
         return None
 
@@ -96,17 +129,16 @@ class GetNonOverlapUnionsBaseClass():
         same as the output:
 
         """
-        retv = self._find_union_pair(geoms)
-        if retv is None:
-            return geoms
-
-        cc_poly = geoms.copy()
+        cache = {}
+        while True:
+            retv = self._find_union_pair(geoms, cache)
+            if retv is None:
+                return geoms
 
-        for idx in [0, 1]:
-            del cc_poly[retv[0][idx]]
-        cc_poly[retv[0]] = retv[1]
-
-        return self._merge_unions(cc_poly)
+            geoms = geoms.copy()
+            for idx in [0, 1]:
+                del geoms[retv[0][idx]]
+            geoms[retv[0]] = retv[1]
 
 
 class GetNonOverlapUnions(GetNonOverlapUnionsBaseClass):
@@ -129,6 +161,24 @@ class GetNonOverlapUnions(GetNonOverlapUnionsBaseClass):
         """
         return check_if_two_polygons_overlap(polygon1, polygon2)
 
+    def _get_bounding_cap(self, polygon):
+        """Get a spherical cap containing a SphPolygon.
+
+        Only polygons smaller than a hemisphere and whose vertices fit in a
+        cap smaller than a hemisphere get a cap, as the sides of the polygon
+        and its inside are then in the cap too.
+
+        """
+        try:
+            vertices = polygon.cvertices / polygon.radius
+            area = polygon.area() / polygon.radius ** 2
+        except AttributeError:
+            return None
+        center, radius = get_bounding_caps(vertices)
+        if not (0 <= area < 2 * np.pi and radius < np.pi / 2):
+            return None
+        return center, radius
+
 
 def merge_tuples(atuple):
     """Take a nested tuple of integers and concatenate it to a tuple of integers."""
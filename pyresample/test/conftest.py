@@ -43,6 +43,9 @@ def reset_pyresample_config(tmpdir):
     """Set pyresample config to logical defaults for tests."""
     test_config = {
         "cache_geometry_slices": False,
+        "cache_neighbour_info": False,
+        "source_kdtree_cache_size": 0,
+        "area_lonlats_cache_size": 0,
         "features": {
             "future_geometries": False,
         },
@@ -415,6 +415,18 @@ class TestNumpyBilinear(unittest.TestCase):
         self.assertEqual(shp[0:2], self.target_def.shape)
         self.assertEqual(shp[-1], 2)
 
+    def test_class_resample_method_compact_dtypes(self):
+        """Test resampling with float32 coordinates."""
+        from pyresample.bilinear import NumpyBilinearResampler
+
+        expected = NumpyBilinearResampler(self.source_def, self.target_def, 50e5,
+                                          compact_dtypes=False).resample(self.data2)
+        resampler = NumpyBilinearResampler(self.source_def, self.target_def, 50e5,
+                                           compact_dtypes=True)
+        res = resampler.resample(self.data2)
+        self.assertEqual(resampler._resample_kdtree.data.dtype, np.float32)
+        np.testing.assert_allclose(res, expected, rtol=1e-5)
+
     def test_create_empty_bil_info(self):
         """Test creation of empty bilinear info."""
         from pyresample.bilinear import NumpyBilinearResampler
@@ -852,7 +864,7 @@ class TestXarrayBilinear(unittest.TestCase):
         resampler._get_index_array()
         qnd.assert_called_with(1, 2, True, 3, resampler._neighbours,
                                resampler._epsilon,
-                               resampler._radius_of_influence)
+                               resampler._radius_of_influence, dtype=np.float64)
         ria.assert_called_with(qnd.return_value)
 
     def test_get_input_xy(self):
@@ -1160,6 +1172,10 @@ class TestXarrayBilinear(unittest.TestCase):
         vals = [3188578.91069278, -612099.36103276, 5481596.63569999]
         self.assertTrue(np.allclose(res.compute()[0, :], vals))
 
+        res = lonlat2xyz(lons, lats, dtype=np.float32)
+        self.assertEqual(res.dtype, np.float32)
+        np.testing.assert_allclose(res.compute()[0, :], vals, atol=1.0)
+
     def test_class_resample_method(self):
         """Test the 'resampler.resample()' method."""
         from pyresample.bilinear import XArrayBilinearResampler
@@ -25,6 +25,7 @@ import numpy as np
 import pytest
 import xarray as xr
 
+import pyresample
 from pyresample import bucket, create_area_def
 from pyresample.bucket import _get_invalid_mask
 from pyresample.geometry import AreaDefinition
@@ -69,14 +70,14 @@ def resampler(adef, lons, lats):
     return bucket.BucketResampler(adef, lons, lats)
 
 
-@patch('pyresample.bucket.Proj')
+@patch('pyresample.bucket.get_proj')
 @patch('pyresample.bucket.BucketResampler._get_indices')
 def test_init(get_indices, prj, adef, lons, lats):
     """Test the init method of the BucketResampler."""
     resampler = bucket.BucketResampler(adef, lons, lats)
 
     get_indices.assert_called_once()
-    prj.assert_called_once_with(adef.proj_dict)
+    prj.assert_called_once_with(adef.crs)
 
     assert hasattr(resampler, 'target_area')
     assert hasattr(resampler, 'source_lons')
@@ -135,6 +136,17 @@ def test_get_bucket_indices(resampler):
     np.testing.assert_equal(y_idxs, np.array([465, 465, 459, 455]))
 
 
+def test_get_bucket_indices_compact_dtypes(adef, lons, lats):
+    """Test calculation of array indices from float32 projection coordinates."""
+    with pyresample.config.set(compact_dtypes=True):
+        resampler = bucket.BucketResampler(adef, lons, lats)
+    assert resampler.compact_dtypes
+    assert resampler._get_proj_coordinates(lons.compute(), lats.compute()).dtype == np.float32
+    x_idxs, y_idxs = da.compute(resampler.x_idxs, resampler.y_idxs)
+    np.testing.assert_equal(x_idxs, np.array([1710, 1710, 1707, 1705]))
+    np.testing.assert_equal(y_idxs, np.array([465, 465, 459, 455]))
+
+
 def test_get_bucket_indices_on_latlong():
     """Test calculation of array indices on latlong grid."""
     adef = create_area_def(
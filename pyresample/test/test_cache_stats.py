@@ -0,0 +1,58 @@
+"""Test the cache statistics."""
+import pytest
+
+from pyresample import cache_stats
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    cache_stats.reset_cache_stats()
+    yield
+    cache_stats.reset_cache_stats()
+
+
+def test_record_events():
+    """Test that events are summed per cache."""
+    cache_stats.record_cache_event("a", "miss", duration=2.0)
+    cache_stats.record_cache_event("a", "store", nbytes=10)
+    cache_stats.record_cache_event("a", "hit", duration=0.5)
+    cache_stats.record_cache_event("a", "hit", duration=0.25)
+    cache_stats.record_cache_event("b", "hit")
+    assert cache_stats.get_cache_stats("a") == {
+        "hits": 2, "misses": 1, "bytes_stored": 10, "load_time": 0.75, "compute_time": 2.0}
+    assert set(cache_stats.get_cache_stats()) == {"a", "b"}
+    assert cache_stats.get_cache_stats("c")["hits"] == 0
+
+    cache_stats.reset_cache_stats()
+    assert cache_stats.get_cache_stats() == {}
+
+
+def test_unknown_event():
+    """Test that unknown events are refused."""
+    with pytest.raises(ValueError, match="Unknown cache event"):
+        cache_stats.record_cache_event("a", "evict")
+
+
+def test_timed_event():
+    """Test that the duration of a block of code is recorded."""
+    with cache_stats.timed_cache_event("a", "miss"):
+        pass
+    stats = cache_stats.get_cache_stats("a")
+    assert stats["misses"] == 1
+    assert stats["compute_time"] >= 0.0
+
+
+def test_callbacks():
+    """Test that callbacks receive every event until they are removed."""
+    events = []
+
+    def _callback(*args):
+        events.append(args)
+
+    cache_stats.add_cache_callback(_callback)
+    try:
+        cache_stats.record_cache_event("a", "store", nbytes=5)
+    finally:
+        cache_stats.remove_cache_callback(_callback)
+    cache_stats.record_cache_event("a", "hit")
+    assert events == [("a", "store", 0.0, 5)]
@@ -0,0 +1,142 @@
+"""Test the caching helpers."""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+
+import pytest
+
+import pyresample
+from pyresample import cache_stats
+from pyresample._caching import cache_to_json_if
+
+
+def _create_cached_func():
+    calls = []
+    lock = threading.Lock()
+
+    @cache_to_json_if("cache_geometry_slices",
+                      memory_size_config_key="cache_geometry_slices_memory_size",
+                      max_entries_config_key="cache_geometry_slices_max_entries")
+    def _slices(start, stop):
+        with lock:
+            calls.append((start, stop))
+        time.sleep(0.05)
+        return slice(start, stop), slice(start, stop)
+
+    return _slices, calls
+
+
+@pytest.fixture
+def cache_config(tmp_path):
+    """Enable geometry slice caching to a temporary directory."""
+    with pyresample.config.set(cache_dir=tmp_path, cache_geometry_slices=True,
+                               cache_geometry_slices_memory_size=0,
+                               cache_geometry_slices_max_entries=None):
+        yield tmp_path / "geometry_slices_v1"
+
+
+class TestJSONCacheHelper:
+    """Test the JSON cache helper."""
+
+    def test_concurrent_misses_compute_once(self, cache_config):
+        """Test that concurrent calls with the same arguments compute the result once."""
+        func, calls = _create_cached_func()
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda _: func(0, 10), range(16)))
+        assert calls == [(0, 10)]
+        assert all(res == [slice(0, 10), slice(0, 10)] for res in results)
+        assert [os.path.basename(fn) for fn in glob(str(cache_config / "*"))] == \
+            [os.path.basename(fn) for fn in glob(str(cache_config / "*.json"))]
+        assert not glob(str(cache_config / ".*"))
+
+    def test_partial_file_is_recomputed(self, cache_config):
+        """Test that a corrupt cache file is replaced instead of failing."""
+        func, calls = _create_cached_func()
+        func(0, 10)
+        json_file, = glob(str(cache_config / "*.json"))
+        with open(json_file, "w") as json_cache:
+            json_cache.write('[{"__slice__": true, "sta')
+        assert func(0, 10) == [slice(0, 10), slice(0, 10)]
+        assert len(calls) == 2
+        func(0, 10)
+        assert len(calls) == 2
+
+    def test_stale_lock_is_ignored(self, cache_config):
+        """Test that a lock file left by a crashed process doesn't block forever."""
+        func, calls = _create_cached_func()
+        func(0, 10)
+        json_file, = glob(str(cache_config / "*.json"))
+        os.remove(json_file)
+        lock_file = cache_config / f".{os.path.basename(json_file)}.lock"
+        lock_file.touch()
+        old_time = time.time() - 3600
+        os.utime(lock_file, (old_time, old_time))
+        assert func(0, 10) == [slice(0, 10), slice(0, 10)]
+        assert len(calls) == 2
+        assert not lock_file.exists()
+
+    def test_max_entries(self, cache_config):
+        """Test that the least recently used files are removed."""
+        func, calls = _create_cached_func()
+        with pyresample.config.set(cache_geometry_slices_max_entries=2):
+            func(0, 1)
+            func(0, 2)
+            _age_cache_files(cache_config)
+            func(0, 1)  # now the most recently used
+            func(0, 3)
+            assert len(glob(str(cache_config / "*.json"))) == 2
+            func(0, 1)
+            assert len(calls) == 3
+            func(0, 2)
+            assert len(calls) == 4
+
+    def test_prune_and_stats(self, cache_config):
+        """Test the cache maintenance methods."""
+        func, _ = _create_cached_func()
+        empty_stats = func.stats()
+        assert empty_stats["entries"] == 0
+        assert empty_stats["oldest"] is None
+
+        for stop in range(1, 5):
+            func(0, stop)
+        stats = func.stats()
+        assert stats["entries"] == 4
+        assert stats["size"] > 0
+        assert stats["oldest"] <= stats["newest"]
+        assert stats["memory_entries"] == 0
+
+        _age_cache_files(cache_config)
+        func(0, 1)
+        assert func.prune(max_age=600) == 3
+        assert func.stats()["entries"] == 1
+        func(0, 2)
+        assert func.prune(max_entries=1) == 1
+        assert func.stats()["entries"] == 1
+        func.cache_clear()
+        assert func.stats()["entries"] == 0
+
+    def test_cache_stats(self, cache_config):
+        """Test that cache usage is recorded."""
+        func, _ = _create_cached_func()
+        cache_stats.reset_cache_stats()
+        try:
+            func(0, 10)
+            func(0, 10)
+            with pyresample.config.set(cache_geometry_slices_memory_size=1):
+                func(0, 10)
+                func(0, 10)
+            stats = cache_stats.get_cache_stats("geometry_slices")
+        finally:
+            cache_stats.reset_cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 3
+        assert stats["bytes_stored"] == len(open(glob(str(cache_config / "*.json"))[0]).read())
+        assert stats["compute_time"] >= 0.05
+
+
+def _age_cache_files(cache_dir, age=3600):
+    old_time = time.time() - age
+    for json_file in glob(str(cache_dir / "*.json")):
+        os.utime(json_file, (old_time, old_time))
@@ -14,7 +14,9 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Test AreaDefinition objects."""
 import io
+import os
 import sys
+import warnings
 from glob import glob
 from unittest.mock import patch
 
@@ -1040,6 +1042,112 @@ class TestAreaDefinition:
         assert lon.dtype == np.dtype("f8", )
         assert isinstance(lon, dask_array)
 
+    def test_get_lonlats_memory_cache(self, create_test_area):
+        """Test that lons and lats are reused for equal areas when caching is enabled."""
+        from pyresample.geometry import clear_lonlats_cache
+        proj_dict = {'proj': 'stere', 'lat_0': '50.00', 'lon_0': '8.00'}
+        extent = (-1370912.72, -909968.64, 1029087.28, 1490031.36)
+        area_def = create_test_area(proj_dict, 80, 80, extent)
+        exp_lons, exp_lats = area_def.get_lonlats()
+        nbytes = exp_lons.nbytes + exp_lats.nbytes
+
+        clear_lonlats_cache()
+        try:
+            with pyresample.config.set(area_lonlats_cache_size=nbytes + nbytes // 2):
+                lons, lats = area_def.get_lonlats()
+                with patch("pyresample.geometry.get_geodetic_transformer") as transformer:
+                    lons2, lats2 = create_test_area(proj_dict, 80, 80, extent).get_lonlats()
+                    transformer.assert_not_called()
+                assert lons2 is lons
+                np.testing.assert_array_equal(lons, exp_lons)
+                np.testing.assert_array_equal(lats, exp_lats)
+                assert not lons.flags.writeable
+
+                # other keys are cached separately
+                lons_f4, _ = area_def.get_lonlats(dtype=np.float32)
+                assert lons_f4.dtype == np.float32
+                sub_lons, _ = area_def.get_lonlats(data_slice=(slice(0, 10), slice(0, 10)))
+                np.testing.assert_array_equal(sub_lons, exp_lons[:10, :10])
+                # the float64 full-size result was least recently used and dropped
+                assert area_def.get_lonlats()[0] is not lons
+
+                dask_lons, _ = area_def.get_lonlats(chunks=40)
+                assert area_def.get_lonlats(chunks=40)[0] is dask_lons
+        finally:
+            clear_lonlats_cache()
+
+        # disabled by default
+        assert area_def.get_lonlats()[0].flags.writeable
+
+    def test_get_proj_coords_broadcast(self, create_test_area):
+        """Test getting the projection coordinates as broadcast views."""
+        area_def = create_test_area({'proj': 'stere', 'lat_0': '50.00', 'lon_0': '8.00'},
+                                    40, 20, (-1370912.72, -909968.64, 1029087.28, 1490031.36))
+        exp_x, exp_y = area_def.get_proj_coords()
+        assert exp_x.flags.writeable
+
+        x, y = area_def.get_proj_coords(broadcast=True)
+        np.testing.assert_array_equal(x, exp_x)
+        np.testing.assert_array_equal(y, exp_y)
+        assert x.strides[0] == 0
+        assert y.strides[1] == 0
+        assert not x.flags.writeable
+
+        x, y = area_def.get_proj_coords(broadcast=True, data_slice=(slice(2, 8), slice(5, 15)), dtype=np.float32)
+        assert x.dtype == np.float32
+        np.testing.assert_allclose(x, exp_x[2:8, 5:15])
+        np.testing.assert_allclose(y, exp_y[2:8, 5:15])
+
+        x, y = area_def.get_proj_coords(broadcast=True, chunks=(8, 16))
+        assert x.chunks == ((8, 8, 4), (16, 16, 8))
+        np.testing.assert_array_equal(x.compute(), exp_x)
+        np.testing.assert_array_equal(y.compute(), exp_y)
+
+    @pytest.mark.parametrize("crs", ["EPSG:4326", "+proj=longlat +ellps=WGS84 +lon_wrap=180"])
+    def test_get_lonlats_separable(self, create_test_area, crs):
+        """Test that lons and lats of geographic areas are the projection coordinates, as broadcast views on request."""
+        area_def = create_test_area(crs, 40, 20, (-20.0, -10.0, 380.0, 90.0))
+        assert area_def.is_separable_lonlat
+        with patch("pyresample.geometry.get_geodetic_transformer") as transformer:
+            lons, lats = area_def.get_lonlats(broadcast=True)
+            exp_lons, exp_lats = area_def.get_lonlats()
+            transformer.assert_not_called()
+        x_vector, y_vector = area_def.get_proj_vectors()
+        np.testing.assert_array_equal(exp_lons, np.meshgrid(x_vector, y_vector)[0])
+        np.testing.assert_array_equal(exp_lats, np.meshgrid(x_vector, y_vector)[1])
+        np.testing.assert_array_equal(lons, exp_lons)
+        np.testing.assert_array_equal(lats, exp_lats)
+        assert lons.strides[0] == 0
+        assert lats.strides[1] == 0
+        assert not lons.flags.writeable
+        # the default arrays can still be modified
+        exp_lons[exp_lons < 0] += 360
+        assert exp_lats.flags.writeable
+        assert np.all(area_def.get_proj_coords()[0] == area_def.get_lonlats()[0])
+        assert area_def.get_proj_coords()[0].flags.writeable
+
+        sub_lons, sub_lats = area_def.get_lonlats(data_slice=(slice(2, 8), slice(5, 15)), dtype=np.float32,
+                                                  broadcast=True)
+        assert sub_lons.dtype == np.float32
+        np.testing.assert_allclose(sub_lons, lons[2:8, 5:15])
+        np.testing.assert_allclose(sub_lats, lats[2:8, 5:15])
+        assert area_def.get_lonlat(3, 4) == (lons[3, 4], lats[3, 4])
+
+        for broadcast in (False, True):
+            dask_lons, dask_lats = area_def.get_lonlats(chunks=(8, 16), broadcast=broadcast)
+            assert dask_lons.chunks == ((8, 8, 4), (16, 16, 8))
+            np.testing.assert_array_equal(dask_lons.compute(), lons)
+            np.testing.assert_array_equal(dask_lats.compute(), lats)
+        assert area_def.get_lonlats(chunks=(8, 16))[0].compute().flags.writeable
+
+    def test_get_lonlats_not_separable(self, create_test_area):
+        """Test that lons and lats of geographic areas with a shifted prime meridian are computed."""
+        area_def = create_test_area("+proj=longlat +ellps=WGS84 +pm=90", 40, 20, (-20.0, -10.0, 380.0, 90.0))
+        assert not area_def.is_separable_lonlat
+        lons, _ = area_def.get_lonlats()
+        assert lons.flags.writeable
+        np.testing.assert_allclose(lons[0, :2], [75, 85])
+
     def test_area_def_geocentric_resolution(self, create_test_area):
         """Test the AreaDefinition.geocentric_resolution method."""
         area_extent = (-5570248.477339745, -5561247.267842293, 5567248.074173927, 5570248.477339745)
@@ -1680,8 +1788,38 @@ class TestAreaDefGetAreaSlices:
                 get_area_slices.cache_clear()
             assert len(glob(cache_glob)) == 0
 
-    def test_area_slices_caching_no_swaths(self, tmp_path, create_test_area, create_test_swath):
-        """Test that swath inputs produce a warning when tried to use in caching."""
+    @pytest.mark.parametrize("memory_size", [0, 2])
+    def test_area_slices_caching_in_memory(self, create_test_area, tmp_path, memory_size):
+        """Check that repeated area slice requests are served from memory."""
+        from pyresample.future.geometry._subset import get_area_slices
+        src_area = create_test_area(dict(proj="utm", zone=33),
+                                    10980, 10980,
+                                    (499980.0, 6490200.0, 609780.0, 6600000.0))
+        crop_areas = [create_test_area({'proj': 'latlong'}, 100, 100,
+                                       (15.9689 + offset, 58.5284, 16.4346 + offset, 58.6995))
+                      for offset in (0.0, 0.01, 0.02)]
+        cache_glob = str(tmp_path / "geometry_slices_v1" / "*.json")
+        with pyresample.config.set(cache_dir=tmp_path, cache_geometry_slices=True,
+                                   cache_geometry_slices_memory_size=memory_size):
+            exp_slices = src_area.get_area_slices(crop_areas[0])
+            for json_file in glob(cache_glob):
+                os.remove(json_file)
+            assert src_area.get_area_slices(crop_areas[0]) == exp_slices
+            # the result is only written to disk again if it wasn't in memory
+            assert len(glob(cache_glob)) == int(memory_size == 0)
+
+            # more than memory_size results: the least recently used is dropped
+            for crop_area in crop_areas[1:]:
+                src_area.get_area_slices(crop_area)
+            for json_file in glob(cache_glob):
+                os.remove(json_file)
+            assert src_area.get_area_slices(crop_areas[0]) == exp_slices
+            assert len(glob(cache_glob)) == 1
+            get_area_slices.cache_clear()
+        assert len(get_area_slices._memory_cache) == 0
+
+    def test_area_slices_caching_swaths(self, tmp_path, create_test_area, create_test_swath):
+        """Test that swath inputs can be hashed for caching."""
         from pyresample.future.geometry._subset import get_area_slices
         from pyresample.test.utils import create_test_latitude, create_test_longitude
         area = create_test_area(dict(proj="utm", zone=33),
@@ -1692,7 +1830,8 @@ class TestAreaDefGetAreaSlices:
         swath = create_test_swath(lons, lats)
 
         with pyresample.config.set(cache_dir=tmp_path, cache_geometry_slices=True), pytest.raises(NotImplementedError):
-            with pytest.warns(UserWarning, match="unhashable"):
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
                 get_area_slices(swath, area, None)
 
     @pytest.mark.parametrize("swath_as_src", [False, True])
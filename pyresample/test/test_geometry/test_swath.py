@@ -115,6 +115,56 @@ class TestSwathHashability:
         swath_def_subset = _gen_swath_def_numpy_small_noncontiguous(create_test_swath)
         assert hash(swath_def) != hash(swath_def_subset)
 
+    @pytest.mark.parametrize("hash_mode", ["fast", "sample", "strict"])
+    def test_swath_hash_modes(self, create_test_swath, hash_mode):
+        """Test that all hash modes identify swaths by their values."""
+        import pyresample
+        with pyresample.config.set(swath_hash_mode=hash_mode):
+            swath_def1 = _gen_swath_def_numpy(create_test_swath)
+            swath_def2 = _gen_swath_def_numpy(create_test_swath)
+            swath_def3 = _gen_swath_def_numpy(create_test_swath)
+            swath_def3.lons[0, 0] += 1.0
+            swath_def4 = create_test_swath(swath_def1.lons.astype(np.float64), swath_def1.lats.astype(np.float64))
+            assert swath_def1.update_hash().digest() == swath_def2.update_hash().digest()
+            assert swath_def1.update_hash().digest() != swath_def3.update_hash().digest()
+            assert swath_def1.update_hash().digest() != swath_def4.update_hash().digest()
+
+    def test_fast_digest_without_xxhash(self):
+        """Test that the fast digest falls back to a 128-bit cryptographic hash, safe for the on-disk caches."""
+        import hashlib
+        from unittest import mock
+
+        from pyresample.geometry import get_array_digest
+        arr = np.arange(16.0)
+        with mock.patch("pyresample.geometry.xxhash", None):
+            digest = get_array_digest(arr)
+            assert digest.endswith(hashlib.blake2b(arr.view(np.uint8), digest_size=16).digest())
+            assert get_array_digest(arr.copy()) == digest
+            assert get_array_digest(arr[::-1].copy()) != digest
+
+    def test_swath_hash_is_memoised(self, create_test_swath):
+        """Test that the arrays are only hashed once per mode."""
+        from unittest import mock
+
+        import pyresample
+        swath_def = _gen_swath_def_numpy(create_test_swath)
+        with mock.patch("pyresample.geometry.get_array_digest", wraps=pyresample.geometry.get_array_digest) as digest:
+            fast_hash = swath_def.update_hash().digest()
+            assert swath_def.update_hash().digest() == fast_hash
+            assert digest.call_count == 2
+            with pyresample.config.set(swath_hash_mode="strict"):
+                assert swath_def.update_hash().digest() != fast_hash
+            assert digest.call_count == 4
+            hash(swath_def)
+            assert digest.call_count == 4
+
+    def test_swath_hash_mode_invalid(self, create_test_swath):
+        """Test that unknown hash modes are refused."""
+        import pyresample
+        swath_def = _gen_swath_def_numpy(create_test_swath)
+        with pyresample.config.set(swath_hash_mode="bad"), pytest.raises(ValueError, match="Unknown hash mode"):
+            swath_def.update_hash()
+
 
 class TestSwathDefinition:
     """Test the SwathDefinition."""
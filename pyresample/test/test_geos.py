@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 Pyresample developers
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option) any
+# later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Test the vectorised geostationary projection."""
+from unittest import mock
+
+import numpy as np
+import pytest
+from pyproj import CRS, Proj
+
+from pyresample import _geos
+from pyresample._geos import LONLAT_TOLERANCE, XY_TOLERANCE, get_geos_projection
+
+GEOS_CRSS = [
+    "+proj=geos +h=35785831 +a=6378169 +b=6356583.8 +lon_0=9.5 +sweep=y",
+    "+proj=geos +h=35786023 +ellps=GRS80 +lon_0=-75 +sweep=x",
+    "+proj=geos +h=35785863 +a=6378137 +b=6356752.3 +lon_0=140.7 +units=km +x_0=10 +y_0=-5",
+    "+proj=geos +h=35785831 +R=6371000 +lon_0=170",
+]
+
+
+def _get_lonlat_grid():
+    lons, lats = np.meshgrid(np.linspace(-180, 180, 73), np.linspace(-90, 90, 37))
+    return lons, lats
+
+
+@pytest.mark.parametrize("proj_str", GEOS_CRSS)
+def test_forward_matches_pyproj(proj_str):
+    """Test that projection coordinates are the same as pyproj's."""
+    crs = CRS(proj_str)
+    geos_proj = get_geos_projection(crs.to_wkt())
+    assert geos_proj is not None
+    lons, lats = _get_lonlat_grid()
+    exp_x, exp_y = Proj(crs)(lons, lats)
+    x, y = geos_proj.forward(lons, lats)
+    np.testing.assert_array_equal(np.isfinite(x), np.isfinite(exp_x))
+    visible = np.isfinite(exp_x)
+    np.testing.assert_allclose(x[visible], exp_x[visible], rtol=0, atol=XY_TOLERANCE)
+    np.testing.assert_allclose(y[visible], exp_y[visible], rtol=0, atol=XY_TOLERANCE)
+
+
+@pytest.mark.parametrize("proj_str", GEOS_CRSS)
+def test_inverse_matches_pyproj(proj_str):
+    """Test that lons/lats are the same as pyproj's, including the pixels in space."""
+    crs = CRS(proj_str)
+    geos_proj = get_geos_projection(crs.to_wkt())
+    to_meter = crs.axis_info[0].unit_conversion_factor
+    x = np.linspace(-5.6e6, 5.6e6, 101) / to_meter
+    y = np.linspace(5.6e6, -5.6e6, 91) / to_meter
+    exp_lons, exp_lats = Proj(crs)(*np.meshgrid(x, y), inverse=True)
+    lons, lats = geos_proj.inverse(x[np.newaxis, :], y[:, np.newaxis])
+    assert lons.shape == (91, 101)
+    np.testing.assert_array_equal(np.isinf(lons), np.isinf(exp_lons))
+    on_disk = np.isfinite(exp_lons)
+    np.testing.assert_allclose(lons[on_disk], exp_lons[on_disk], rtol=0, atol=LONLAT_TOLERANCE)
+    np.testing.assert_allclose(lats[on_disk], exp_lats[on_disk], rtol=0, atol=LONLAT_TOLERANCE)
+
+
+def test_dtype_scalars_and_threads():
+    """Test the float32 output, scalar inputs and the computation in blocks."""
+    crs = CRS(GEOS_CRSS[0])
+    geos_proj = get_geos_projection(crs.to_wkt())
+    x = np.linspace(-5.5e6, 5.5e6, 300)
+    y = np.linspace(5.5e6, -5.5e6, 300)
+    exp_lons, exp_lats = geos_proj.inverse(x[np.newaxis, :], y[:, np.newaxis])
+
+    with mock.patch.object(_geos, "BLOCK_ROWS", 7):
+        lons, lats = geos_proj.inverse(*np.meshgrid(x, y), max_workers=3)
+    np.testing.assert_array_equal(lons, exp_lons)
+    np.testing.assert_array_equal(lats, exp_lats)
+
+    lons32, lats32 = geos_proj.inverse(x[np.newaxis, :], y[:, np.newaxis], dtype=np.float32)
+    assert lons32.dtype == np.float32
+    np.testing.assert_allclose(lons32, exp_lons, atol=1e-4)
+
+    lon, lat = geos_proj.inverse(x[100], y[120])
+    assert isinstance(lon, float)
+    assert (lon, lat) == (exp_lons[120, 100], exp_lats[120, 100])
+    res_x, res_y = geos_proj.forward(lon, lat)
+    assert res_x == pytest.approx(x[100], abs=XY_TOLERANCE)
+    assert res_y == pytest.approx(y[120], abs=XY_TOLERANCE)
+
+
+@pytest.mark.parametrize("proj_str", ["EPSG:4326",
+                                      "+proj=stere +lat_0=90 +lon_0=0",
+                                      "+proj=geos +h=35785831 +ellps=WGS84 +lon_0=0 +pm=10"])
+def test_unsupported_crs(proj_str):
+    """Test that pyproj is used for other projections and unsupported parameters."""
+    assert get_geos_projection(CRS(proj_str).to_wkt()) is None
+
+
+def test_area_uses_geos_projection(create_test_area):
+    """Test that geostationary areas give the same results as pyproj."""
+    from pyresample.utils.proj4 import get_geodetic_transformer
+    area_def = create_test_area(CRS(GEOS_CRSS[0]), 100, 80,
+                                (-5570248.477339745, -5561247.267842293, 5567248.074173927, 5570248.477339745))
+    x, y = area_def.get_proj_coords()
+    exp_lons, exp_lats = get_geodetic_transformer(area_def.crs, always_xy=True).transform(
+        x, y, direction="INVERSE")
+    on_disk = np.isfinite(exp_lons)
+
+    with mock.patch("pyresample.geometry.get_geodetic_transformer") as transformer:
+        lons, lats = area_def.get_lonlats()
+        dask_lons, dask_lats = area_def.get_lonlats(chunks=30, dtype=np.float32)
+        dask_lons, dask_lats = dask_lons.compute(), dask_lats.compute()
+        transformer.assert_not_called()
+    np.testing.assert_array_equal(np.isinf(lons), np.isinf(exp_lons))
+    np.testing.assert_allclose(lons[on_disk], exp_lons[on_disk], rtol=0, atol=LONLAT_TOLERANCE)
+    np.testing.assert_allclose(lats[on_disk], exp_lats[on_disk], rtol=0, atol=LONLAT_TOLERANCE)
+    assert dask_lons.dtype == np.float32
+    # float32 projection coordinates are less precise, compare with pyproj using the same ones
+    x32, y32 = area_def.get_proj_coords(dtype=np.float32)
+    exp_lons32, _ = get_geodetic_transformer(area_def.crs, always_xy=True).transform(
+        x32, y32, direction="INVERSE")
+    np.testing.assert_allclose(dask_lons[on_disk], exp_lons32[on_disk], rtol=0, atol=1e-4)
+
+    cols, rows = area_def.get_array_indices_from_lonlat(exp_lons[on_disk], exp_lats[on_disk])
+    exp_rows, exp_cols = np.nonzero(on_disk)
+    np.testing.assert_array_equal(cols, exp_cols)
+    np.testing.assert_array_equal(rows, exp_rows)
@@ -17,13 +17,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Test kd_tree operations."""
 import os
+import pickle
 import unittest
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from glob import glob
 from unittest import mock
 
 import numpy as np
 import pytest
 
-from pyresample import geometry, kd_tree, utils
+import pyresample
+from pyresample import _caching, geometry, kd_tree, utils
 from pyresample.test.utils import TEST_FILES_PATH, catch_warnings
 
 
@@ -224,6 +228,91 @@ class Test(unittest.TestCase):
         expected = 15874591.0
         self.assertEqual(cross_sum, expected)
 
+    def test_gauss_segments_threads(self):
+        lons = np.fromfunction(
+            lambda y, x: 3 + (10.0 / 100) * x, (5000, 100))
+        lats = np.fromfunction(
+            lambda y, x: 75 - (50.0 / 5000) * y, (5000, 100))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        with catch_warnings(UserWarning):
+            expected = kd_tree.get_neighbour_info(swath_def, self.area_def, 50000,
+                                                  neighbours=4, segments=5)
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                res_executor = kd_tree.get_neighbour_info(swath_def, self.area_def, 50000, neighbours=4,
+                                                          segments=5, nprocs=3, executor=executor)
+            res_threads = kd_tree.get_neighbour_info(swath_def, self.area_def, 50000, neighbours=4,
+                                                     segments=5, nprocs=3, executor="threads")
+        for arr_idx, expected_arr in enumerate(expected):
+            np.testing.assert_array_equal(res_executor[arr_idx], expected_arr)
+            np.testing.assert_array_equal(res_threads[arr_idx], expected_arr)
+
+    def test_segments_threads_few_valid_targets(self):
+        """Test that the full size allocation is not kept for a few valid target pixels."""
+        lons = np.concatenate((np.linspace(5, 15, 100), np.linspace(100, 120, 900)))
+        lats = np.concatenate((np.linspace(50, 60, 100), np.linspace(-50, -40, 900)))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        expected = kd_tree.get_neighbour_info(self.area_def, swath_def, 50000, neighbours=1, segments=4)
+        res = kd_tree.get_neighbour_info(self.area_def, swath_def, 50000, neighbours=1, segments=4,
+                                         nprocs=2, executor="threads")
+        for arr_idx, expected_arr in enumerate(expected):
+            np.testing.assert_array_equal(res[arr_idx], expected_arr)
+        assert 0 < res[2].size < swath_def.size // 2
+        assert res[2].base is None
+        assert res[3].base is None
+
+    def test_lonlat_target_transformed_per_row_and_column(self):
+        """Test that the target coordinates of geographic areas are transformed without full 2D grids."""
+        from pyresample import _spatial_mp
+        target_def = geometry.AreaDefinition('lonlat', 'lonlat', 'lonlat', 'EPSG:4326', 80, 60,
+                                             (-10.0, 45.0, 30.0, 75.0))
+        lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
+        lats = np.fromfunction(lambda y, x: 75 - y, (50, 10))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        with mock.patch.object(_spatial_mp, "separable_lonlats_to_xyz",
+                               wraps=_spatial_mp.separable_lonlats_to_xyz) as to_xyz:
+            ninfo = kd_tree.get_neighbour_info(swath_def, target_def, 50000, neighbours=1, reduce_data=False)
+        to_xyz.assert_called_once()
+        target_lons, target_lats = target_def.get_lonlats()
+        expected = kd_tree.get_neighbour_info(
+            swath_def, geometry.SwathDefinition(lons=target_lons, lats=target_lats), 50000, neighbours=1,
+            reduce_data=False)
+        np.testing.assert_array_equal(ninfo[2], expected[2])
+
+    def test_segments_in_flight_from_nprocs(self):
+        """Test that the segments in flight are bound by nprocs for any executor."""
+        class _SyncExecutor(Executor):
+            def submit(self, func, *args, **kwargs):
+                future = Future()
+                future.set_result(func(*args, **kwargs))
+                return future
+
+        lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
+        lats = np.fromfunction(lambda y, x: 75 - y, (50, 10))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        expected = kd_tree.get_neighbour_info(swath_def, self.area_def, 50000, neighbours=1, segments=4)
+        with mock.patch.object(kd_tree, "_iter_results_in_order",
+                               wraps=kd_tree._iter_results_in_order) as iter_results:
+            res = kd_tree.get_neighbour_info(swath_def, self.area_def, 50000, neighbours=1, segments=4,
+                                             nprocs=3, executor=_SyncExecutor())
+        assert iter_results.call_args.args[1] == 6
+        for arr_idx, expected_arr in enumerate(expected):
+            np.testing.assert_array_equal(res[arr_idx], expected_arr)
+
+    def test_segments_in_flight(self):
+        """Test that only a few segments are submitted ahead of the one being copied."""
+        submitted = []
+
+        def submit_all():
+            for idx in range(10):
+                submitted.append(idx)
+                future = Future()
+                future.set_result(idx)
+                yield future
+
+        for idx, res in enumerate(kd_tree._iter_results_in_order(submit_all(), 3)):
+            assert res == idx
+            assert len(submitted) <= idx + 3
+
     def test_nearest_remap(self):
         data = np.fromfunction(lambda y, x: y * x, (50, 10))
         lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
@@ -284,6 +373,43 @@ class Test(unittest.TestCase):
         expected = 15387753.9852
         self.assertAlmostEqual(cross_sum, expected, places=3)
 
+    def test_gauss_sparse_compact_dtypes(self):
+        data = np.fromfunction(lambda y, x: y * x, (50, 10))
+        lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
+        lats = np.fromfunction(lambda y, x: 75 - y, (50, 10))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        ninfo = kd_tree.get_neighbour_info(swath_def, self.area_def, 50000, neighbours=8,
+                                           segments=1, compact_dtypes=True)
+        assert ninfo[2].dtype == np.uint32
+        assert ninfo[3].dtype == np.float32
+        expected_ninfo = kd_tree.get_neighbour_info(swath_def, self.area_def, 50000, neighbours=8, segments=1)
+        # neighbours right at the radius of influence may be cut off differently
+        finite = np.isfinite(expected_ninfo[3]) & np.isfinite(ninfo[3])
+        # the target lons/lats are float32 too
+        np.testing.assert_allclose(ninfo[3][finite], expected_ninfo[3][finite], atol=2.0)
+
+        res = kd_tree.resample_gauss(swath_def, data.ravel(), self.area_def, 50000, 25000,
+                                     fill_value=-1, segments=1, compact_dtypes=True)
+        np.testing.assert_allclose(res.sum(), 15387753.9852, rtol=1e-5)
+
+    def test_compact_dtypes_config(self):
+        """Test that the configuration option keeps all the coordinates as float32."""
+        lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
+        lats = np.fromfunction(lambda y, x: 75 - y, (50, 10))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        with pyresample.config.set(compact_dtypes=True), \
+                mock.patch.object(self.area_def, "get_lonlats", wraps=self.area_def.get_lonlats) as get_lonlats, \
+                mock.patch("pyresample.kd_tree.KDTree", wraps=kd_tree.KDTree) as kdtree:
+            ninfo = kd_tree.get_neighbour_info(swath_def, self.area_def, 50000, neighbours=8, segments=1)
+        assert ninfo[2].dtype == np.uint32
+        assert ninfo[3].dtype == np.float32
+        assert get_lonlats.call_args.kwargs["dtype"] == np.float32
+        assert kdtree.call_args.args[0].dtype == np.float32
+
+        ninfo = kd_tree.get_neighbour_info(swath_def, self.area_def, 50000, neighbours=8, segments=1,
+                                           compact_dtypes=False)
+        assert ninfo[3].dtype == np.float64
+
     def test_gauss(self):
         data = np.fromfunction(lambda y, x: (y + x) * 10 ** -5, (5000, 100))
         lons = np.fromfunction(
@@ -369,6 +495,27 @@ class Test(unittest.TestCase):
             self.assertAlmostEqual(cross_sum_stddev, e_stddev)
         self.assertAlmostEqual(cross_sum_counts, expected_counts)
 
+    def test_gauss_multi_uncert_blocks(self):
+        data = np.fromfunction(lambda y, x: (y + x) * 10 ** -6, (5000, 100))
+        lons = np.fromfunction(
+            lambda y, x: 3 + (10.0 / 100) * x, (5000, 100))
+        lats = np.fromfunction(
+            lambda y, x: 75 - (50.0 / 5000) * y, (5000, 100))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        data_multi = np.column_stack((data.ravel(), data.ravel(),
+                                      data.ravel()))
+        with catch_warnings(UserWarning):
+            res, stddev, counts = kd_tree.resample_gauss(swath_def, data_multi,
+                                                         self.area_def, 50000, [25000, 15000, 10000],
+                                                         segments=1, with_uncert=True, block_size=100000)
+        expected_stddev = [0.44621800779801657, 0.44363137712896705,
+                           0.43861019464274459]
+        self.assertTrue(res.shape == stddev.shape and stddev.shape == counts.shape and counts.shape == (800, 800, 3))
+        self.assertAlmostEqual(res.sum(), 1461.8429990248171)
+        for i, e_stddev in enumerate(expected_stddev):
+            self.assertAlmostEqual(stddev[:, :, i].sum(), e_stddev)
+        self.assertAlmostEqual(counts.sum(), 4934802.0)
+
     def test_gauss_multi_mp(self):
         data = np.fromfunction(lambda y, x: (y + x) * 10 ** -6, (5000, 100))
         lons = np.fromfunction(
@@ -458,6 +605,48 @@ class Test(unittest.TestCase):
         expected = 4872.8100347930776
         self.assertAlmostEqual(cross_sum, expected)
 
+    def test_custom_blocks(self):
+        def wf(dist):
+            return 1 - dist / 100000.0
+
+        data = np.fromfunction(lambda y, x: (y + x) * 10 ** -5, (5000, 100))
+        lons = np.fromfunction(
+            lambda y, x: 3 + (10.0 / 100) * x, (5000, 100))
+        lats = np.fromfunction(
+            lambda y, x: 75 - (50.0 / 5000) * y, (5000, 100))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        with catch_warnings(UserWarning):
+            expected = kd_tree.resample_custom(swath_def, data.ravel(), self.area_def,
+                                               50000, wf, segments=1, fill_value=None)
+            res = kd_tree.resample_custom(swath_def, data.ravel(), self.area_def,
+                                          50000, wf, segments=1, fill_value=None, block_size=12345)
+        np.testing.assert_array_equal(res.mask, expected.mask)
+        np.testing.assert_array_equal(res, expected)
+        with pytest.raises(ValueError):
+            kd_tree.resample_custom(swath_def, data.ravel(), self.area_def,
+                                    50000, wf, segments=1, block_size=0)
+
+    def test_custom_weight_table(self):
+        def wf(dist):
+            return np.exp(-dist ** 2 / 25000.0 ** 2)
+
+        data = np.fromfunction(lambda y, x: (y + x) * 10 ** -5, (5000, 100))
+        lons = np.fromfunction(
+            lambda y, x: 3 + (10.0 / 100) * x, (5000, 100))
+        lats = np.fromfunction(
+            lambda y, x: 75 - (50.0 / 5000) * y, (5000, 100))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        data_multi = np.column_stack((data.ravel(), data.ravel()))
+        with catch_warnings(UserWarning):
+            expected = kd_tree.resample_custom(swath_def, data_multi, self.area_def,
+                                               50000, [wf, wf], segments=1)
+            res = kd_tree.resample_custom(swath_def, data_multi, self.area_def,
+                                          50000, [wf, wf], segments=1, weight_table_size=10000)
+        np.testing.assert_allclose(res, expected, atol=1e-7)
+        with pytest.raises(ValueError):
+            kd_tree.resample_custom(swath_def, data.ravel(), self.area_def,
+                                    50000, wf, segments=1, weight_table_size=1)
+
     def test_custom_multi(self):
         def wf1(dist):
             return 1 - dist / 100000.0
@@ -924,6 +1113,36 @@ class TestXArrayResamplerNN(unittest.TestCase):
         expected = 27706753.0
         self.assertEqual(cross_sum, expected)
 
+    def test_nearest_area_2d_to_area_1n_compact_dtypes(self):
+        """Test 2D area definition to 2D area definition with compact dtypes."""
+        from pyresample.kd_tree import XArrayResamplerNN
+        data = self.data_2d.rename({'my_dim_y': 'y', 'my_dim_x': 'x'})
+        resampler = XArrayResamplerNN(self.src_area_2d, self.area_def,
+                                      radius_of_influence=50000,
+                                      neighbours=1, compact_dtypes=True)
+        ninfo = resampler.get_neighbour_info()
+        assert ninfo[2].dtype == np.int32
+        assert ninfo[2].compute().dtype == np.int32
+        res = resampler.get_sample_from_neighbour_info(data)
+        # float32 lons/lats may pick the other one of two equally close neighbours
+        np.testing.assert_allclose(np.nansum(res.values), 27706753.0, rtol=1e-5)
+
+    def test_compact_dtypes_large_source_index_dtype(self):
+        """Test that compact dtypes keep int64 indices for sources with 2**31 pixels."""
+        import dask.array as da
+
+        from pyresample.kd_tree import XArrayResamplerNN
+        large_area = geometry.AreaDefinition('large', 'large', 'large', {'proj': 'longlat'},
+                                             2 ** 16, 2 ** 15, (-180, -90, 180, 90))
+        resampler = XArrayResamplerNN(large_area, self.area_def,
+                                      radius_of_influence=50000,
+                                      neighbours=1, compact_dtypes=True)
+        tlons = da.zeros(self.area_def.shape, chunks=1000)
+        tlats = da.zeros(self.area_def.shape, chunks=1000)
+        valid_oi = da.ones(self.area_def.shape, dtype=bool, chunks=1000)
+        index_array, _ = resampler.query_resample_kdtree(None, tlons, tlats, valid_oi, None)
+        assert index_array.dtype == np.int64
+
     def test_nearest_area_2d_to_area_1n_no_roi(self):
         """Test 2D area definition to 2D area definition; 1 neighbor, no radius of influence."""
         import dask.array as da
@@ -1015,3 +1234,308 @@ class TestXArrayResamplerNN(unittest.TestCase):
         # actual = res.values
         # expected = TODO
         # np.testing.assert_allclose(actual, expected)
+
+
+class TestNeighbourInfoCache:
+    """Test caching of neighbour info to disk."""
+
+    def setup_method(self):
+        """Create the test geometries."""
+        lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
+        lats = np.fromfunction(lambda y, x: 75 - y, (50, 10))
+        self.swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        self.area_def = geometry.AreaDefinition(
+            'areaD', 'Europe (3km, HRV, VTC)', 'areaD',
+            {'a': '6378144.0', 'b': '6356759.0', 'lat_0': '50.00',
+             'lat_ts': '50.00', 'lon_0': '8.00', 'proj': 'stere'},
+            80, 80,
+            [-1370912.72, -909968.64000000001, 1029087.28, 1490031.3600000001])
+        self.data = np.fromfunction(lambda y, x: y * x, (50, 10))
+
+    def _cache_entries(self, cache_dir):
+        return sorted(glob(str(cache_dir / "neighbour_info_v1" / "*")))
+
+    @pytest.mark.parametrize("cache_ninfo", [False, True])
+    def test_get_neighbour_info_caching(self, tmp_path, cache_ninfo):
+        """Test that neighbour info is written to and loaded from the cache."""
+        with pyresample.config.set(cache_dir=tmp_path, cache_neighbour_info=cache_ninfo):
+            ninfo1 = kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000, neighbours=4)
+            assert len(self._cache_entries(tmp_path)) == int(cache_ninfo)
+            with mock.patch.object(kd_tree, "_create_resample_kdtree",
+                                   wraps=kd_tree._create_resample_kdtree) as create_kdtree:
+                ninfo2 = kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000, neighbours=4)
+            assert create_kdtree.call_count == int(not cache_ninfo)
+
+        for arr_idx, arr in enumerate(ninfo2):
+            np.testing.assert_array_equal(arr, ninfo1[arr_idx])
+        assert isinstance(ninfo2[2], np.memmap) == cache_ninfo
+
+    def test_cache_key_parameters(self, tmp_path):
+        """Test that query parameters are part of the cache key, but segments are not."""
+        with pyresample.config.set(cache_dir=tmp_path, cache_neighbour_info=True):
+            kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000, neighbours=1)
+            kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000, neighbours=1, segments=2)
+            assert len(self._cache_entries(tmp_path)) == 1
+            kd_tree.get_neighbour_info(self.swath_def, self.area_def, 60000, neighbours=1)
+            assert len(self._cache_entries(tmp_path)) == 2
+
+    def test_resample_nearest_cached(self, tmp_path):
+        """Test that resampling from cached neighbour info gives the same result."""
+        expected = kd_tree.resample_nearest(self.swath_def, self.data, self.area_def, 50000)
+        with pyresample.config.set(cache_dir=tmp_path, cache_neighbour_info=True):
+            kd_tree.resample_nearest(self.swath_def, self.data, self.area_def, 50000)
+            with mock.patch.object(kd_tree, "_create_resample_kdtree") as create_kdtree:
+                res = kd_tree.resample_nearest(self.swath_def, self.data, self.area_def, 50000)
+            create_kdtree.assert_not_called()
+        np.testing.assert_array_equal(res, expected)
+
+    @pytest.mark.parametrize("remove_entry", [False, True])
+    def test_incomplete_entry_recomputed(self, tmp_path, remove_entry):
+        """Test that an entry partially removed by another process is recomputed and written again."""
+        with pyresample.config.set(cache_dir=tmp_path, cache_neighbour_info=True):
+            expected = kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000, neighbours=4)
+            entry = self._cache_entries(tmp_path)[0]
+            os.remove(os.path.join(entry, "3.npy"))
+            with mock.patch.object(_caching, "_load_npy_entry",
+                                   wraps=_caching._load_npy_entry) as load_entry:
+                if remove_entry:
+                    # removed between the check for the entry and loading it
+                    load_entry.side_effect = FileNotFoundError
+                res = kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000, neighbours=4)
+            assert load_entry.call_count == 1
+            assert len(res) == 4
+            for arr_idx, arr in enumerate(res):
+                np.testing.assert_array_equal(arr, expected[arr_idx])
+            assert os.path.isfile(os.path.join(entry, "3.npy"))
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entries are removed when the cache is full."""
+        with pyresample.config.set(cache_dir=tmp_path, cache_neighbour_info=True):
+            kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000, neighbours=1)
+            entry_size = sum(os.path.getsize(npy_file)
+                             for npy_file in glob(str(tmp_path / "neighbour_info_v1" / "*" / "*.npy")))
+            with pyresample.config.set(cache_neighbour_info_max_size=int(entry_size * 2.5)):
+                first_entry = self._cache_entries(tmp_path)[0]
+                os.utime(first_entry, (0, 0))
+                kd_tree.get_neighbour_info(self.swath_def, self.area_def, 60000, neighbours=1)
+                # use the first entry again so it is the most recently used
+                kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000, neighbours=1)
+                entries = self._cache_entries(tmp_path)
+                assert len(entries) == 2
+                kd_tree.get_neighbour_info(self.swath_def, self.area_def, 70000, neighbours=1)
+                new_entries = self._cache_entries(tmp_path)
+            assert len(new_entries) == 2
+            assert first_entry in new_entries
+
+            kd_tree._get_cached_neighbour_info.cache_clear()
+            assert len(self._cache_entries(tmp_path)) == 0
+
+
+class TestSparseNeighbourWeights:
+    """Test resampling with a sparse matrix of neighbour weights."""
+
+    def setup_method(self):
+        """Create the test geometries and neighbour info."""
+        lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
+        lats = np.fromfunction(lambda y, x: 75 - y, (50, 10))
+        self.swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        self.area_def = geometry.AreaDefinition(
+            'areaD', 'Europe (3km, HRV, VTC)', 'areaD',
+            {'a': '6378144.0', 'b': '6356759.0', 'lat_0': '50.00',
+             'lat_ts': '50.00', 'lon_0': '8.00', 'proj': 'stere'},
+            80, 80,
+            [-1370912.72, -909968.64000000001, 1029087.28, 1490031.3600000001])
+        self.data = np.fromfunction(lambda y, x: y * x, (50, 10))
+        with catch_warnings(UserWarning):
+            self.ninfo = kd_tree.get_neighbour_info(self.swath_def, self.area_def, 200000, neighbours=4)
+
+    @staticmethod
+    def _weight_func(dist):
+        return np.exp(-dist ** 2 / 100000. ** 2)
+
+    def _expected(self, data, fill_value=0):
+        num_channels = data.shape[-1] if data.ndim == 3 else 1
+        weight_funcs = [self._weight_func] * num_channels if data.ndim == 3 else self._weight_func
+        return kd_tree.get_sample_from_neighbour_info(
+            'custom', self.area_def.shape, data, *self.ninfo[:3], distance_array=self.ninfo[3],
+            weight_funcs=weight_funcs, fill_value=fill_value)
+
+    def test_single_channel(self):
+        """Test that a single channel gives the same result as the custom resampling."""
+        weights = kd_tree.SparseNeighbourWeights.from_neighbour_info(
+            self.area_def.shape, *self.ninfo, weight_func=self._weight_func)
+        res = weights.resample(self.data, fill_value=-1)
+        assert res.shape == self.area_def.shape
+        np.testing.assert_allclose(res, self._expected(self.data, fill_value=-1))
+
+    def test_multi_channel(self):
+        """Test that all channels are resampled at once."""
+        data = np.dstack((self.data, self.data * 2, self.data * 3))
+        weights = kd_tree.SparseNeighbourWeights.from_neighbour_info(
+            self.area_def.shape, *self.ninfo, weight_func=self._weight_func)
+        res = weights.resample(data)
+        assert res.shape == self.area_def.shape + (3,)
+        np.testing.assert_allclose(res, self._expected(data))
+
+    def test_masked_data(self):
+        """Test that pixels affected by masked input pixels are masked."""
+        data = np.ma.array(self.data, mask=np.zeros(self.data.shape, dtype=bool))
+        data.mask[20:30, 3:6] = True
+        weights = kd_tree.SparseNeighbourWeights.from_neighbour_info(
+            self.area_def.shape, *self.ninfo, weight_func=self._weight_func)
+        res = weights.resample(data, fill_value=None)
+        expected = self._expected(data, fill_value=None)
+        np.testing.assert_array_equal(res.mask, expected.mask)
+        np.testing.assert_allclose(res.compressed(), expected.compressed())
+
+    def test_save_and_load(self, tmp_path):
+        """Test that the operator can be reused after saving it to disk."""
+        weights = kd_tree.SparseNeighbourWeights.from_neighbour_info(
+            self.area_def.shape, *self.ninfo, weight_func=self._weight_func)
+        filename = tmp_path / "weights.npz"
+        weights.save(filename)
+        loaded_weights = kd_tree.SparseNeighbourWeights.load(filename)
+        assert loaded_weights.output_shape == self.area_def.shape
+        np.testing.assert_array_equal(loaded_weights.resample(self.data), weights.resample(self.data))
+
+
+class TestSourceKDTree:
+    """Test sharing the source KDTree between resampling calls."""
+
+    def setup_method(self):
+        """Create the test geometries."""
+        lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
+        lats = np.fromfunction(lambda y, x: 75 - y, (50, 10))
+        lons[0, 0] = 200
+        self.swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        proj_dict = {'a': '6378144.0', 'b': '6356759.0', 'lat_0': '50.00',
+                     'lat_ts': '50.00', 'lon_0': '8.00', 'proj': 'stere'}
+        self.area_def = geometry.AreaDefinition(
+            'areaD', 'Europe (3km, HRV, VTC)', 'areaD', proj_dict, 80, 80,
+            [-1370912.72, -909968.64000000001, 1029087.28, 1490031.3600000001])
+        self.area_def2 = geometry.AreaDefinition(
+            'areaD2', 'Europe (3km, HRV, VTC)', 'areaD2', proj_dict, 40, 60,
+            [-1370912.72, -909968.64000000001, 1029087.28, 1490031.3600000001])
+
+    def test_get_neighbour_info_shared_kdtree(self):
+        """Test that one tree is used for several targets with the same result."""
+        source_kdtree = kd_tree.SourceKDTree(self.swath_def)
+        assert not source_kdtree.is_built
+        for area_def in (self.area_def, self.area_def2):
+            expected = kd_tree.get_neighbour_info(self.swath_def, area_def, 50000,
+                                                  neighbours=4, reduce_data=False)
+            with mock.patch.object(kd_tree, "_create_resample_kdtree") as create_kdtree:
+                ninfo = kd_tree.get_neighbour_info(self.swath_def, area_def, 50000,
+                                                   neighbours=4, source_kdtree=source_kdtree)
+            create_kdtree.assert_not_called()
+            assert source_kdtree.is_built
+            for arr_idx, arr in enumerate(ninfo):
+                np.testing.assert_array_equal(arr, expected[arr_idx])
+        assert not source_kdtree.valid_input_index[0]
+
+    def test_get_neighbour_info_mismatch(self):
+        """Test that a tree of another source or precision is refused."""
+        source_kdtree = kd_tree.SourceKDTree(self.swath_def, compact_dtypes=True)
+        with pytest.raises(ValueError, match="compact_dtypes"):
+            kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000,
+                                       neighbours=1, source_kdtree=source_kdtree)
+        other_swath = geometry.SwathDefinition(lons=self.swath_def.lons[:10], lats=self.swath_def.lats[:10])
+        source_kdtree = kd_tree.SourceKDTree(other_swath)
+        with pytest.raises(ValueError, match="source_geo_def"):
+            kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000,
+                                       neighbours=1, source_kdtree=source_kdtree)
+
+    def test_get_source_kdtree_lru(self):
+        """Test that trees are only reused when the cache is enabled."""
+        other_swath = geometry.SwathDefinition(lons=self.swath_def.lons[:10], lats=self.swath_def.lats[:10])
+        assert kd_tree.get_source_kdtree(self.swath_def) is not kd_tree.get_source_kdtree(self.swath_def)
+        try:
+            with pyresample.config.set(source_kdtree_cache_size=1):
+                source_kdtree = kd_tree.get_source_kdtree(self.swath_def)
+                assert kd_tree.get_source_kdtree(self.swath_def) is source_kdtree
+                assert kd_tree.get_source_kdtree(self.swath_def, compact_dtypes=True) is not source_kdtree
+                kd_tree.get_source_kdtree(other_swath)
+                assert kd_tree.get_source_kdtree(self.swath_def) is not source_kdtree
+        finally:
+            pyresample.future.resamplers.clear_source_kdtree_cache()
+
+    @pytest.mark.parametrize("built", [False, True])
+    def test_pickle_for_dask_workers(self, built):
+        """Test that the delayed trees can be sent to other processes, like dask.distributed does."""
+        import cloudpickle
+        import dask
+
+        source_kdtree = kd_tree.SourceKDTree(self.swath_def)
+        if built:
+            expected = source_kdtree.kdtree.query(np.array([[0.1, 0.05, 1.0]]))
+        valid_input_idx, delayed_kdtree = source_kdtree.to_dask()
+        delayed_kdtree = cloudpickle.loads(cloudpickle.dumps(delayed_kdtree))
+        kdtree, valid_input_idx = dask.compute(delayed_kdtree, valid_input_idx, scheduler="sync")
+        if not built:
+            expected = source_kdtree.kdtree.query(np.array([[0.1, 0.05, 1.0]]))
+        np.testing.assert_array_equal(kdtree.query(np.array([[0.1, 0.05, 1.0]])), expected)
+        np.testing.assert_array_equal(valid_input_idx.ravel(), source_kdtree.valid_input_index)
+        assert pickle.loads(pickle.dumps(source_kdtree)).valid_input_index.sum() == 499
+
+    def test_xarray_resampler_shared_kdtree(self):
+        """Test that the xarray resamplers build the shared tree only once."""
+        import dask.array as da
+        import xarray as xr
+        lons = xr.DataArray(da.from_array(self.swath_def.lons, chunks=10), dims=('y', 'x'))
+        lats = xr.DataArray(da.from_array(self.swath_def.lats, chunks=10), dims=('y', 'x'))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        data = xr.DataArray(da.from_array(np.fromfunction(lambda y, x: y * x, (50, 10)), chunks=10),
+                            dims=('y', 'x'))
+        source_kdtree = kd_tree.SourceKDTree(swath_def)
+        for area_def in (self.area_def, self.area_def2):
+            expected = kd_tree.XArrayResamplerNN(swath_def, area_def, 50000)
+            expected.get_neighbour_info()
+            resampler = kd_tree.XArrayResamplerNN(swath_def, area_def, 50000, source_kdtree=source_kdtree)
+            resampler.get_neighbour_info()
+            res = resampler.get_sample_from_neighbour_info(data)
+            np.testing.assert_array_equal(res.values, expected.get_sample_from_neighbour_info(data).values)
+            assert source_kdtree.is_built
+
+
+class TestAreaToAreaNearest:
+    """Test nearest neighbour resampling between two areas without a kd-tree."""
+
+    @pytest.mark.parametrize(
+        ("src_proj", "src_extent"),
+        [
+            ({'proj': 'stere', 'lat_0': '50.00', 'lat_ts': '50.00', 'lon_0': '8.00'},
+             [-1370912.72, -909968.64, 1029087.28, 1490031.36]),
+            ('EPSG:4326', [-20.0, 30.0, 50.0, 80.0]),
+            ({'proj': 'lcc', 'lat_0': '45.0', 'lat_1': '45.0', 'lon_0': '10.0'},
+             [-3000000.0, -2000000.0, 3000000.0, 4000000.0]),
+        ]
+    )
+    def test_resample_nearest_matches_kdtree(self, src_proj, src_extent):
+        """Test that the result is the same as with a kd-tree."""
+        source_def = geometry.AreaDefinition('src', 'src', 'src', src_proj, 130, 110, src_extent)
+        target_def = geometry.AreaDefinition(
+            'areaD', 'Europe (3km, HRV, VTC)', 'areaD',
+            {'a': '6378144.0', 'b': '6356759.0', 'lat_0': '50.00', 'lat_ts': '50.00',
+             'lon_0': '8.00', 'proj': 'stere'},
+            80, 90, [-1370912.72, -909968.64000000001, 1029087.28, 1490031.3600000001])
+        data = np.random.default_rng(1).random(source_def.shape)
+        ninfo = kd_tree.get_neighbour_info(source_def, target_def, 50000, neighbours=1)
+        expected = kd_tree.get_sample_from_neighbour_info('nn', target_def.shape, data, *ninfo, fill_value=None)
+
+        with mock.patch.object(kd_tree, "_create_resample_kdtree") as create_kdtree:
+            res = kd_tree.resample_nearest(source_def, data, target_def, 50000, fill_value=None, segments=3)
+        create_kdtree.assert_not_called()
+        np.testing.assert_array_equal(res.mask, expected.mask)
+        np.testing.assert_array_equal(res.compressed(), expected.compressed())
+
+    def test_resample_nearest_geos_uses_kdtree(self):
+        """Test that a kd-tree is still used for geostationary source areas."""
+        source_def = geometry.AreaDefinition(
+            'src', 'src', 'src', {'proj': 'geos', 'h': 35785831.0, 'lon_0': 0, 'a': 6378169.0, 'b': 6356583.8},
+            130, 110, [-5570248.5, -5567248.07, 5567248.07, 5570248.5])
+        target_def = geometry.AreaDefinition('dst', 'dst', 'dst', 'EPSG:4326', 90, 80, [-20.0, 30.0, 50.0, 80.0])
+        data = np.random.default_rng(1).random(source_def.shape)
+        with mock.patch.object(kd_tree, "_create_resample_kdtree",
+                               wraps=kd_tree._create_resample_kdtree) as create_kdtree:
+            kd_tree.resample_nearest(source_def, data, target_def, 50000)
+        create_kdtree.assert_called_once()
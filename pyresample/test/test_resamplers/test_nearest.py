@@ -27,7 +27,7 @@ import xarray as xr
 from pytest_lazyfixture import lazy_fixture
 
 from pyresample.future.geometry import AreaDefinition, SwathDefinition
-from pyresample.future.resamplers import KDTreeNearestXarrayResampler
+from pyresample.future.resamplers import KDTreeNearestXarrayResampler, SourceKDTree
 from pyresample.test.utils import (
     assert_maximum_dask_computes,
     assert_warnings_contain,
@@ -228,6 +228,68 @@ class TestNearestNeighborResampler:
         assert cross_sum == expected
         assert res.shape[:2] == resampler.target_geo_def.shape
 
+    def test_nearest_area_2d_to_area_1n_matches_kdtree(self, area_def_stere_source, data_2d_float32_xarray_dask,
+                                                       area_def_stere_target):
+        """Test that resampling between areas without a kd-tree gives the kd-tree result."""
+        resampler = KDTreeNearestXarrayResampler(area_def_stere_source, area_def_stere_target)
+        with mock.patch("pyresample.future.resamplers.nearest.KDTree") as kdtree:
+            res = resampler.resample(data_2d_float32_xarray_dask, radius_of_influence=50000)
+            res = res.values
+        kdtree.assert_not_called()
+        kdtree_resampler = KDTreeNearestXarrayResampler(
+            area_def_stere_source, area_def_stere_target,
+            source_kdtree=SourceKDTree(area_def_stere_source))
+        expected = kdtree_resampler.resample(data_2d_float32_xarray_dask, radius_of_influence=50000)
+        np.testing.assert_array_equal(res, expected.values)
+
+    @pytest.mark.parametrize("use_mask", [False, True])
+    def test_nearest_swath_2d_to_area_1n_chunked_kdtree(self, swath_def_2d_xarray_dask, data_2d_float32_xarray_dask,
+                                                        area_def_stere_target, use_mask):
+        """Test that per-chunk kdtrees give the same result as a single kdtree."""
+        data = data_2d_float32_xarray_dask.where(data_2d_float32_xarray_dask % 7 != 0)
+        mask = data.isnull() if use_mask else None
+        expected = KDTreeNearestXarrayResampler(swath_def_2d_xarray_dask, area_def_stere_target).resample(
+            data, mask_area=mask, radius_of_influence=50000)
+        resampler = KDTreeNearestXarrayResampler(
+            swath_def_2d_xarray_dask, area_def_stere_target, chunked_kdtree=True)
+        # persisting the coordinates and computing the chunk bounding boxes
+        with assert_maximum_dask_computes(2):
+            res = resampler.resample(data, mask_area=mask, radius_of_influence=50000)
+        assert isinstance(res, xr.DataArray)
+        assert isinstance(res.data, da.Array)
+        _check_common_metadata(res, isinstance(area_def_stere_target, AreaDefinition))
+        np.testing.assert_array_equal(res.values, expected.values)
+
+    def test_chunked_kdtree_computes_lonlats_once(self, swath_def_2d_xarray_dask, data_2d_float32_xarray_dask,
+                                                  area_def_stere_target):
+        """Test that the coordinates used to select the source chunks are not computed again for the result."""
+        from pyresample import geometry
+        resampler = KDTreeNearestXarrayResampler(
+            swath_def_2d_xarray_dask, area_def_stere_target, chunked_kdtree=True)
+        with mock.patch.object(geometry, "_invproj", wraps=geometry._invproj) as invproj:
+            res = resampler.resample(data_2d_float32_xarray_dask, radius_of_influence=50000)
+            num_calls = invproj.call_count
+            assert num_calls > 0
+            res.compute()
+        assert invproj.call_count == num_calls
+
+    @pytest.mark.parametrize("chunked_kdtree", [False, True])
+    def test_compact_dtypes_kdtree(self, swath_def_2d_xarray_dask, data_2d_float32_xarray_dask,
+                                   area_def_stere_target, chunked_kdtree):
+        """Test that compact dtypes build the kdtrees from float32 coordinates."""
+        from pyresample.future.resamplers import nearest
+        expected = KDTreeNearestXarrayResampler(
+            swath_def_2d_xarray_dask, area_def_stere_target, chunked_kdtree=chunked_kdtree).resample(
+            data_2d_float32_xarray_dask, radius_of_influence=50000)
+        resampler = KDTreeNearestXarrayResampler(
+            swath_def_2d_xarray_dask, area_def_stere_target, chunked_kdtree=chunked_kdtree, compact_dtypes=True)
+        with mock.patch.object(nearest, "KDTree", wraps=nearest.KDTree) as kdtree_cls:
+            res = resampler.resample(data_2d_float32_xarray_dask, radius_of_influence=50000).values
+        assert kdtree_cls.call_count > 0
+        assert all(call.args[0].dtype == np.float32 for call in kdtree_cls.call_args_list)
+        # float32 coordinates may pick the other one of two equally close neighbors
+        np.testing.assert_allclose(np.nansum(res), np.nansum(expected.values), rtol=1e-5)
+
 
 class TestInvalidUsageNearestNeighborResampler:
     """Test the resampler being given input that should raise an error.
@@ -304,3 +366,20 @@ class TestInvalidUsageNearestNeighborResampler:
                 resampler.precompute(mask=data_2d_float32_xarray_dask.notnull())
             else:
                 resampler.resample(data_2d_float32_xarray_dask)
+
+    def test_chunked_kdtree_with_source_kdtree(self, swath_def_2d_xarray_dask, area_def_stere_target):
+        """Test that a shared source kdtree can't be split in to chunks."""
+        with pytest.raises(ValueError, match=".*chunked_kdtree.*"):
+            KDTreeNearestXarrayResampler(swath_def_2d_xarray_dask, area_def_stere_target,
+                                         source_kdtree=SourceKDTree(swath_def_2d_xarray_dask),
+                                         chunked_kdtree=True)
+
+    def test_compact_dtypes_from_source_kdtree(self, swath_def_2d_xarray_dask, area_def_stere_target):
+        """Test that compact dtypes follow the shared source kdtree unless given explicitly."""
+        source_kdtree = SourceKDTree(swath_def_2d_xarray_dask, compact_dtypes=True)
+        resampler = KDTreeNearestXarrayResampler(swath_def_2d_xarray_dask, area_def_stere_target,
+                                                 source_kdtree=source_kdtree)
+        assert resampler.compact_dtypes
+        with pytest.raises(ValueError, match=".*compact_dtypes.*"):
+            KDTreeNearestXarrayResampler(swath_def_2d_xarray_dask, area_def_stere_target,
+                                         source_kdtree=source_kdtree, compact_dtypes=False)
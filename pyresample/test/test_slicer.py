@@ -17,11 +17,15 @@
 # with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Test the Area and Swath Slicers."""
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 import pytest
 import xarray as xr
 
+import pyresample
 from pyresample import AreaDefinition, SwathDefinition
 from pyresample.area_config import create_area_def
 from pyresample.geometry import IncompatibleAreas
@@ -244,6 +248,19 @@ class TestSwathSlicer(unittest.TestCase):
         assert x_slice.start > 0 or x_slice.stop < x_max
         assert y_slice.start > 0 or y_slice.stop < y_max
 
+    def test_source_swath_slicing_caching(self):
+        """Test that swath slices can be cached."""
+        slicer = create_slicer(self.src_swath, self.dst_area)
+        exp_slices = slicer.get_slices()
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                pyresample.config.set(cache_dir=tmp_dir, cache_geometry_slices=True):
+            assert create_slicer(self.src_swath, self.dst_area).get_slices() == exp_slices
+            assert len(os.listdir(os.path.join(tmp_dir, "swath_slices_v1"))) == 1
+            swath_copy = SwathDefinition(self.src_swath.lons, self.src_swath.lats)
+            with mock.patch("pyresample.slicer._get_chunk_polygons_for_swath_to_crop") as get_polys:
+                assert create_slicer(swath_copy, self.dst_area).get_slices() == exp_slices
+            get_polys.assert_not_called()
+
     def test_source_area_slicing_does_not_return_full_dataset(self):
         """Test source area covers dest area."""
         slicer = create_slicer(self.src_area, self.dst_area)
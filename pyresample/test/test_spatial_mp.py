@@ -64,3 +64,26 @@ class SpatialMPTest(unittest.TestCase):
         self.assertIs(type(coords_float32[0, 0]), np.float32)
         self.assertIs(type(coords_float[0, 0]), np.float64)
         self.assertTrue(np.issubdtype(coords_int.dtype, np.floating))
+
+    def test_cartesian_separable(self):
+        """Test the transform_lonlats of class Cartesian with broadcast lon/lat arrays."""
+        lon_vector = np.linspace(-180, 180, 7)
+        lat_vector = np.linspace(80, -80, 5)
+        lons, lats = np.meshgrid(lon_vector, lat_vector, copy=False)
+        self.assertIsNotNone(sp.get_separable_lonlat_vectors(lons, lats))
+        my_cartesian = sp.Cartesian()
+        coords = my_cartesian.transform_lonlats(lons, lats)
+        exp_coords = my_cartesian.transform_lonlats(np.array(lons).ravel(), np.array(lats).ravel())
+        np.testing.assert_allclose(coords, exp_coords)
+        coords_float32 = my_cartesian.transform_lonlats(lons.astype(np.float32)[:, :], lats.astype(np.float32))
+        self.assertIs(type(coords_float32[0, 0]), np.float32)
+
+    def test_get_separable_lonlat_vectors(self):
+        """Test that only broadcast 2D lon/lat arrays are considered separable."""
+        lons, lats = np.meshgrid(np.arange(3.0), np.arange(2.0), copy=False)
+        lon_vector, lat_vector = sp.get_separable_lonlat_vectors(lons, lats)
+        np.testing.assert_array_equal(lon_vector, [0, 1, 2])
+        np.testing.assert_array_equal(lat_vector, [0, 1])
+        self.assertIsNone(sp.get_separable_lonlat_vectors(np.array(lons), np.array(lats)))
+        self.assertIsNone(sp.get_separable_lonlat_vectors(lons.ravel(), lats.ravel()))
+        self.assertIsNone(sp.get_separable_lonlat_vectors(lats, lons))
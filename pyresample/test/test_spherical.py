@@ -707,3 +707,98 @@ class TestSphericalPolygon(unittest.TestCase):
         self.assertAlmostEqual(poly_inter.radius, poly_inner.radius)
         # Well, now when we are at it.
         self.assertAlmostEqual(poly_inter.area(), poly_inner.area())
+
+    def test_vectorised_arc_intersections(self):
+        """Test that the intersections computed at once are the ones of Arc.intersection."""
+        from pyresample.spherical import _EdgeIntersections
+
+        rng = np.random.default_rng(42)
+        lons = np.deg2rad(rng.uniform(-20, 20, (2, 30)))
+        lats = np.deg2rad(rng.uniform(-20, 20, (2, 30)))
+        arcs1 = [Arc(SCoordinate(lons[0, i], lats[0, i]), SCoordinate(lons[0, i + 1], lats[0, i + 1]))
+                 for i in range(29)]
+        arcs2 = [Arc(SCoordinate(lons[1, i], lats[1, i]), SCoordinate(lons[1, i + 1], lats[1, i + 1]))
+                 for i in range(29)]
+        # an arc intersected with itself has no intersection
+        arcs2[3] = arcs1[3]
+        intersections = _EdgeIntersections(arcs1, arcs2)
+        num_found = 0
+        for i, arc1 in enumerate(arcs1):
+            for j, arc2 in enumerate(arcs2):
+                expected = arc1.intersection(arc2)
+                if expected is None:
+                    assert np.isnan(intersections.lons[i, j + len(arcs1)])
+                else:
+                    num_found += 1
+                    np.testing.assert_allclose(intersections.lons[i, j + len(arcs1)], expected.lon, atol=1e-12)
+                    np.testing.assert_allclose(intersections.lats[i, j + len(arcs1)], expected.lat, atol=1e-12)
+            inter, edge = intersections.get_next_intersection(i, intersections.edges2)
+            exp_inter, exp_arc = arc1.get_next_intersection(arcs2)
+            assert (inter is None) == (exp_inter is None)
+            if inter is not None:
+                assert inter == exp_inter
+                assert intersections.arcs[edge] is exp_arc
+                next_inter = intersections.get_next_intersection(i, intersections.edges2, inter)[0]
+                exp_next_inter = arc1.get_next_intersection(arcs2, exp_inter)[0]
+                assert (next_inter is None) == (exp_next_inter is None)
+        assert num_found > 10
+
+    def test_bool_oper_many_vertices(self):
+        """Test union and intersection of polygons with many vertices on their sides."""
+        def densify(corners, num):
+            """Add points along the great circle sides of a polygon."""
+            cart = SphPolygon(np.deg2rad(corners)).cvertices
+            points = []
+            for idx, start in enumerate(cart):
+                end = cart[(idx + 1) % len(cart)]
+                for frac in np.linspace(0, 1, num, endpoint=False):
+                    point = start * (1 - frac) + end * frac
+                    points.append(point / np.linalg.norm(point))
+            points = np.array(points)
+            return np.stack((np.arctan2(points[:, 1], points[:, 0]), np.arcsin(points[:, 2])), axis=-1)
+
+        corners1 = np.array([[-10, 10], [10, 10], [10, -10], [-10, -10]])
+        corners2 = np.array([[0, 15], [15, 15], [15, 0], [0, 0]])
+        exp_inter = SphPolygon(np.deg2rad(corners1)).intersection(SphPolygon(np.deg2rad(corners2)))
+        exp_union = SphPolygon(np.deg2rad(corners1)).union(SphPolygon(np.deg2rad(corners2)))
+
+        poly1 = SphPolygon(densify(corners1, 3))
+        poly2 = SphPolygon(densify(corners2, 3))
+        self.assertAlmostEqual(poly1.intersection(poly2).area(), exp_inter.area())
+        self.assertAlmostEqual(poly1.union(poly2).area(), exp_union.area())
+
+    def test_contains(self):
+        """Test checking many points against concave and polar polygons at once."""
+        from pyresample.future.spherical import SMultiPoint, SPoint
+
+        concave = SphPolygon(np.deg2rad(np.array([[0., 0.], [0., 10.], [5., 10.], [5., 5.], [10., 5.], [10., 0.]])))
+        points = SMultiPoint.from_degrees(np.array([[2., 7., 7.], [2., 20., -170.]]),
+                                          np.array([[2., 7., 2.], [7., 0., 5.]]))
+        expected = np.array([[True, False, True], [True, False, False]])
+        np.testing.assert_array_equal(concave.contains(points), expected)
+        np.testing.assert_array_equal(concave.inverse().contains(points), ~expected)
+        assert concave.contains(SPoint.from_degrees(2., 2.))
+
+        polar = SphPolygon(np.deg2rad(np.array([[0., 80.], [-90., 80.], [180., 80.], [90., 80.]])))
+        points = SMultiPoint.from_degrees(np.array([0., 135., 135., 0., 0., np.nan]),
+                                          np.array([89., 84., 81., 70., -89., 0.]))
+        # the great circle edges go north of the 80th parallel between the vertices
+        np.testing.assert_array_equal(polar.contains(points), [True, True, False, False, False, False])
+
+    def test_contains_dask(self):
+        """Test checking the points chunk by chunk."""
+        import dask.array as da
+
+        from pyresample.future.spherical import SMultiPoint
+
+        poly = SphPolygon(np.deg2rad(np.array([[0., 0.], [0., 10.], [10., 10.], [10., 0.]])))
+        rng = np.random.default_rng(42)
+        lons = np.deg2rad(rng.uniform(-20, 30, 1000))
+        lats = np.deg2rad(rng.uniform(-20, 30, 1000))
+        res = poly.contains_dask(lons, lats, chunks=100)
+        assert isinstance(res, da.Array)
+        assert res.chunks == ((100,) * 10,)
+        expected = poly.contains(SMultiPoint(lons, lats))
+        assert expected.any() and not expected.all()
+        np.testing.assert_array_equal(res.compute(), expected)
+        np.testing.assert_array_equal(poly.contains_dask(da.from_array(lons, chunks=300), lats).compute(), expected)
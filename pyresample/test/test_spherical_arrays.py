@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 Pyresample developers
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option) any
+# later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Test the vectorised spherical geometry and the batched overlap functions."""
+import dask.array as da
+import numpy as np
+import pytest
+
+from pyresample import _spherical_arrays, geometry
+from pyresample.geometry import get_overlap_matrix, get_overlap_rate_matrix
+
+
+def _get_swaths():
+    swaths = []
+    for lon_0, lat_0 in ((0, 0), (1, 1), (-3, 0.5), (30, 60), (179, 0), (0, 89), (45, 89)):
+        lons = np.array([[lon_0 - 1, lon_0 + 1], [lon_0 - 1, lon_0 + 1]])
+        lats = np.array([[lat_0 + 1, lat_0 + 1], [lat_0 - 1, lat_0 - 1]])
+        if lat_0 == 89:
+            lons = np.array([[lon_0, lon_0 + 90], [lon_0 - 90, lon_0 + 180]])
+            lats = np.full((2, 2), 89)
+        lons = (lons + 180) % 360 - 180
+        swaths.append(geometry.SwathDefinition(lons.astype(np.float64), lats.astype(np.float64)))
+    return swaths
+
+
+def _get_areas(create_test_area):
+    return [create_test_area("EPSG:4326", 10, 10, (-2, -2, 2, 2)),
+            create_test_area("EPSG:4326", 20, 10, (176, -2, 180, 2)),
+            create_test_area({"proj": "stere", "lat_0": 90, "lon_0": 0, "ellps": "WGS84"}, 10, 10,
+                             (-1e6, -1e6, 1e6, 1e6)),
+            create_test_area("EPSG:3035", 10, 10, (3e6, 3e6, 4e6, 4e6))]
+
+
+def test_overlap_matrix_like_overlaps(create_test_area):
+    """Test that the overlap matrix is the same as checking every pair."""
+    swaths = _get_swaths()
+    areas = _get_areas(create_test_area)
+    res = get_overlap_matrix(swaths, areas + swaths)
+    assert res.shape == (len(swaths), len(areas) + len(swaths))
+    assert res.any() and not res.all()
+    for i, swath in enumerate(swaths):
+        for j, other in enumerate(areas + swaths):
+            if i == j - len(areas):
+                # overlaps() divides by zero for a geometry and itself
+                assert res[i, j]
+                continue
+            assert res[i, j] == swath.overlaps(other), (i, j)
+
+
+def test_overlap_matrix_dask_and_errors():
+    """Test the corners of dask swaths and the invalid geometries."""
+    swaths = _get_swaths()
+    dask_swaths = [geometry.SwathDefinition(da.from_array(swath.lons), da.from_array(swath.lats))
+                   for swath in swaths]
+    np.testing.assert_array_equal(get_overlap_matrix(dask_swaths, swaths), get_overlap_matrix(swaths, swaths))
+    assert get_overlap_matrix([], swaths).shape == (0, len(swaths))
+
+    with pytest.raises(geometry.DimensionError):
+        get_overlap_matrix([geometry.SwathDefinition(np.arange(3.0), np.arange(3.0))], swaths)
+    with pytest.raises(ValueError):
+        get_overlap_matrix([geometry.SwathDefinition(np.full((2, 2), 200.0), np.zeros((2, 2)))], swaths)
+
+
+def test_overlap_rate_matrix(create_test_area):
+    """Test the overlap rates against the ones of overlap_rate."""
+    swaths = _get_swaths()
+    res = get_overlap_rate_matrix(swaths, swaths)
+    np.testing.assert_allclose(res[0, 1], 0.25, atol=1e-3)
+    np.testing.assert_allclose(res[1, 0], 0.25, atol=1e-3)
+    np.testing.assert_allclose(np.diag(res), 1)
+    assert res[0, 3] == 0
+    for i, j in np.argwhere(res):
+        if i != j:
+            assert res[i, j] == pytest.approx(swaths[i].overlap_rate(swaths[j]), abs=1e-6)
+
+    area = create_test_area("EPSG:4326", 10, 10, (-2, -2, 2, 2))
+    rates = get_overlap_rate_matrix([area], swaths[:3])
+    assert rates[0, 1] == pytest.approx(area.overlap_rate(swaths[1]), abs=1e-6)
+    assert rates[0, 2] == 0
+
+
+def test_caps_prefilter():
+    """Test that the bounding caps contain the polygons and that far caps are discarded."""
+    corners = _spherical_arrays.lonlat_to_xyz(np.array([[-1, 1, 1, -1], [100, 102, 102, 100]]),
+                                              np.array([[1, 1, -1, -1], [1, 1, -1, -1]]))
+    centers, radii = _spherical_arrays.get_bounding_caps(corners)
+    assert np.all(_spherical_arrays.distances(centers[:, np.newaxis], corners) <= radii[:, np.newaxis] + 1e-12)
+    np.testing.assert_array_equal(_spherical_arrays.caps_overlap(centers, radii, centers, radii, block_size=1),
+                                  np.eye(2, dtype=bool))
+
+    hemisphere = _spherical_arrays.lonlat_to_xyz(np.array([[0, 90, 180, -90]]), np.zeros((1, 4)))
+    assert _spherical_arrays.get_bounding_caps(hemisphere)[1][0] == np.pi
+
+
+def test_arcs_intersection():
+    """Test the intersections of many arcs at once."""
+    starts1 = _spherical_arrays.lonlat_to_xyz(np.array([-10, -10, 0]), np.array([0, 0, -10]))
+    ends1 = _spherical_arrays.lonlat_to_xyz(np.array([10, 10, 0]), np.array([0, 0, 10]))
+    starts2 = _spherical_arrays.lonlat_to_xyz(np.array([0, 20, -10]), np.array([-10, -10, 0]))
+    ends2 = _spherical_arrays.lonlat_to_xyz(np.array([0, 20, 10]), np.array([10, 10, 0]))
+    res = _spherical_arrays.arcs_intersection(starts1, ends1, starts2, ends2)
+    np.testing.assert_allclose(res[0], [1, 0, 0], atol=1e-12)
+    assert np.isnan(res[1]).all()
+    np.testing.assert_allclose(res[2], [1, 0, 0], atol=1e-12)
+    np.testing.assert_array_equal(_spherical_arrays.arcs_intersect(starts1, ends1, starts2, ends2),
+                                  [True, False, True])
+
+
+def test_points_inside_quadrilaterals():
+    """Test points against one quadrilateral and the degenerate cases."""
+    corners = _spherical_arrays.lonlat_to_xyz(np.array([-11, 11, 11, -11]), np.array([11, 11, -11, -11]))
+    points = _spherical_arrays.lonlat_to_xyz(np.array([0, 0, 180, -11]), np.array([0, 12, 0, 11]))
+    np.testing.assert_array_equal(_spherical_arrays.points_inside_quadrilaterals(points, corners),
+                                  [True, False, False, False])
+
+
+def test_intersection_polygons():
+    """Test the intersection polygons start and go round like the scalar ones."""
+    square = _spherical_arrays.lonlat_to_xyz(np.array([-1, 1, 1, -1]), np.array([1, 1, -1, -1]))
+    shifted = _spherical_arrays.lonlat_to_xyz(np.array([0, 2, 2, 0]), np.array([0, 0, 2, 2]))
+    small = _spherical_arrays.lonlat_to_xyz(np.array([-0.5, 0.5, 0.5, -0.5]), np.array([0.5, 0.5, -0.5, -0.5]))
+    far = _spherical_arrays.lonlat_to_xyz(np.array([10, 12, 12, 10]), np.array([1, 1, -1, -1]))
+    vertices, counts = _spherical_arrays.intersection_polygons(np.stack([square, square, square]),
+                                                               np.stack([shifted, small, far]))
+    np.testing.assert_array_equal(counts, [4, 4, 0])
+    lons, lats = _spherical_arrays.xyz_to_lonlat(vertices[0, :4])
+    np.testing.assert_allclose(lons, [0, 1, 1, 0], atol=1e-12)
+    np.testing.assert_allclose(lats, [1.00015, 1, 0, 0], atol=1e-5)
+    # the scalar version used to return None when the second quadrilateral is inside the first one
+    np.testing.assert_allclose(vertices[1, :4], small)
+
+    rates = _spherical_arrays.get_polygon_areas(vertices, counts) / _spherical_arrays.get_polygon_areas(square)
+    np.testing.assert_allclose(rates, [0.25, 0.25, 0], atol=1e-4)
+
+
+def test_points_inside_polygon():
+    """Test points against a concave polygon, one block of points and sides at a time."""
+    vertices = _spherical_arrays.lonlat_to_xyz(np.array([0, 0, 5, 5, 10, 10]), np.array([0, 10, 10, 5, 5, 0]))
+    points = _spherical_arrays.lonlat_to_xyz(np.array([2, 7, 7, 2, 20, 180]), np.array([2, 7, 2, 7, 0, -5]))
+    expected = [True, False, True, True, False, False]
+    np.testing.assert_array_equal(_spherical_arrays.points_inside_polygon(points, vertices), expected)
+    np.testing.assert_array_equal(_spherical_arrays.points_inside_polygon(points, vertices, block_size=1), expected)
+    np.testing.assert_array_equal(_spherical_arrays.points_inside_polygon(points, vertices[::-1]),
+                                  np.logical_not(expected))
+
+
+@pytest.mark.parametrize("width", [1e-4, 5e-5, 1e-6])
+def test_points_inside_narrow_polygon(width):
+    """Test that the point inside a polygon narrower than the default offset from its side is found."""
+    vertices = _spherical_arrays.lonlat_to_xyz(np.array([0, 0, 10, 10]), np.array([0, width, width, 0]))
+    points = _spherical_arrays.lonlat_to_xyz(np.array([5, 5, 20, 5]), np.array([width / 2, 1, 0, -width]))
+    np.testing.assert_array_equal(_spherical_arrays.points_inside_polygon(points, vertices),
+                                  [True, False, False, False])
@@ -24,6 +24,7 @@ import pytest
 
 from pyresample.spherical import SphPolygon
 from pyresample.spherical_utils import (
+    GetNonOverlapUnions,
     GetNonOverlapUnionsBaseClass,
     check_if_two_polygons_overlap,
     check_keys_int_or_tuple,
@@ -404,3 +405,63 @@ def test_check_keys_int_or_tuple_input_float():
 
     exception_raised = exec_info.value
     assert str(exception_raised) == "'Key must be integer or a tuple (of integers)'"
+
+
+def test_merge_unions_checks_each_pair_once():
+    """Test that pairs known not to overlap aren't checked again after a merge."""
+    listed_sets = dict(enumerate((SET_A, SET_B, SET_C, SET_D, SET_E, SET_F, SET_G)))
+    this = GetNonOverlapUnionsBaseClass(listed_sets)
+    checked_pairs = []
+    overlaps = this._overlaps
+
+    def _overlaps(set1, set2):
+        checked_pairs.append((id(set1), id(set2)))
+        return overlaps(set1, set2)
+
+    with patch.object(this, "_overlaps", side_effect=_overlaps):
+        retv = this._merge_unions(listed_sets)
+
+    assert retv == {0: {1, 3, 5, 7, 9},
+                    (2, (1, 3)): {2, 4, 6, 8, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19},
+                    (5, (4, 6)): {20, 21, 22, 23, 24, 26, 27, 28, 29}}
+    assert len(checked_pairs) == len(set(checked_pairs))
+
+
+def _get_box(lon, lat, half_size=2):
+    vertices = np.array([[lon - half_size, lat + half_size], [lon + half_size, lat + half_size],
+                         [lon + half_size, lat - half_size], [lon - half_size, lat - half_size]])
+    return SphPolygon(np.deg2rad(vertices))
+
+
+def test_merge_polygons_only_checks_neighbours():
+    """Test that only polygons with intersecting bounding caps are checked for overlap."""
+    # two chains of overlapping boxes far from each other and a lonely box
+    polygons = ([_get_box(lon, 0) for lon in range(0, 15, 3)] +
+                [_get_box(lon, 50) for lon in range(100, 115, 3)] +
+                [_get_box(-60, -40)])
+    unions = GetNonOverlapUnions(polygons)
+
+    with patch("pyresample.spherical_utils.check_if_two_polygons_overlap",
+               side_effect=check_if_two_polygons_overlap) as check:
+        unions.merge()
+
+    ids = unions.get_ids()
+    assert ids[0] == 10
+    assert [sorted(union_ids) for union_ids in ids[1:]] == [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]]
+    checked = {(id(call.args[0]), id(call.args[1])) for call in check.call_args_list}
+    assert len(checked) == check.call_count
+    for call in check.call_args_list:
+        dist = np.linalg.norm(call.args[0].cvertices.mean(axis=0) - call.args[1].cvertices.mean(axis=0))
+        assert dist < 0.5
+    area = sum(polygon.area() for polygon in unions.get_polygons())
+    assert 0 < area < sum(polygon.area() for polygon in polygons)
+
+
+def test_bounding_cap_of_large_polygons():
+    """Test that polygons larger than a hemisphere have no bounding cap."""
+    unions = GetNonOverlapUnions([])
+    center, radius = unions._get_bounding_cap(_get_box(10, 0))
+    np.testing.assert_allclose(center, [np.cos(np.deg2rad(10)), np.sin(np.deg2rad(10)), 0], atol=1e-12)
+    assert radius == pytest.approx(np.deg2rad(2 * np.sqrt(2)), rel=1e-3)
+    assert unions._get_bounding_cap(_get_box(10, 0).inverse()) is None
+    assert unions._get_bounding_cap({1, 2}) is None
@@ -713,6 +713,70 @@ def test_check_slice_orientation():
     assert res == slice(start, stop, -1)
 
 
+class TestTransformerCache:
+    """Test the process-wide cache of pyproj transformers."""
+
+    def setup_method(self):
+        """Start with an empty cache."""
+        from pyresample.utils.proj4 import clear_transformer_cache
+        clear_transformer_cache()
+
+    def teardown_method(self):
+        """Don't leave transformers in the cache."""
+        from pyresample.utils.proj4 import clear_transformer_cache
+        clear_transformer_cache()
+
+    def test_transformers_are_reused(self):
+        """Test that transformers are created once per CRS pair and options."""
+        from pyresample.utils.proj4 import get_transformer
+        stere = "+proj=stere +lat_0=90 +lon_0=0 +ellps=WGS84"
+        transformer = get_transformer(CRS(4326), stere, always_xy=True)
+        assert get_transformer(CRS(4326), stere, always_xy=True) is transformer
+        assert get_transformer(CRS(4326), stere) is not transformer
+        assert get_transformer(CRS(4326), CRS(stere), always_xy=True) is not transformer
+        x, y = transformer.transform(0.0, 90.0)
+        np.testing.assert_allclose((x, y), (0.0, 0.0), atol=1e-6)
+
+    def test_geodetic_transformer_and_proj(self):
+        """Test the cached transformers from geodetic coordinates and Proj objects."""
+        from pyresample.utils.proj4 import get_geodetic_transformer, get_proj
+        crs = CRS("+proj=merc +lon_0=10 +pm=5 +ellps=WGS84")
+        transformer = get_geodetic_transformer(crs, always_xy=True)
+        assert get_geodetic_transformer(crs, always_xy=True) is transformer
+        proj = get_proj(crs)
+        assert get_proj(crs) is proj
+        assert isinstance(proj, pyproj.Proj)
+        np.testing.assert_allclose(transformer.transform(20.0, 30.0), proj(20.0, 30.0))
+
+    def test_cache_size(self):
+        """Test that the least recently used transformers are dropped."""
+        from pyresample.utils.proj4 import get_transformer
+        with pyresample.config.set(transformer_cache_size=2):
+            merc = get_transformer(4326, 3857)
+            world_merc = get_transformer(4326, 3395)
+            assert get_transformer(4326, 3857) is merc
+            get_transformer(4326, 32633)
+            assert get_transformer(4326, 3857) is merc
+            assert get_transformer(4326, 3395) is not world_merc
+        with pyresample.config.set(transformer_cache_size=0):
+            assert get_transformer(4326, 3857) is not get_transformer(4326, 3857)
+
+    def test_threads_share_transformers(self):
+        """Test that the cache can be used from several threads."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from pyresample.utils.proj4 import get_transformer
+
+        def _transform(lon):
+            return get_transformer(4326, 3857, always_xy=True).transform(lon, 0.0)[0]
+
+        lons = np.linspace(-170, 170, 64)
+        with ThreadPoolExecutor(8) as executor:
+            res = list(executor.map(_transform, lons))
+        exp = pyproj.Transformer.from_crs(4326, 3857, always_xy=True).transform(lons, np.zeros_like(lons))[0]
+        np.testing.assert_allclose(res, exp)
+
+
 class TestRowAppendableArray(unittest.TestCase):
     """Test appending numpy arrays to possible pre-allocated buffer."""
 
@@ -18,13 +18,20 @@
 """Utilities for working with projection parameters."""
 import contextlib
 import math
+import os
+import threading
+import time
 import warnings
 from collections import OrderedDict
 
 import numpy as np
-from pyproj import CRS
+import pyproj.transformer
+from pyproj import CRS, Proj
 from pyproj import Transformer as PROJTransformer
 
+from pyresample._config import config
+from pyresample.cache_stats import record_cache_event
+
 
 def convert_proj_floats(proj_pairs):
     """Convert PROJ.4 parameters to floats if possible."""
@@ -99,9 +106,7 @@ def get_geostationary_height(geos_area_crs):
 
 
 def _transform_dask_chunk(x, y, crs_from, crs_to, kwargs, transform_kwargs):
-    crs_from = CRS(crs_from)
-    crs_to = CRS(crs_to)
-    transformer = PROJTransformer.from_crs(crs_from, crs_to, **kwargs)
+    transformer = get_transformer(crs_from, crs_to, **kwargs)
     return np.stack(transformer.transform(x, y, **transform_kwargs), axis=-1)
 
 
@@ -154,7 +159,7 @@ class DaskFriendlyTransformer:
         return x, y
 
     def _transform_numpy(self, x, y, **kwargs):
-        transformer = PROJTransformer.from_crs(self.src_crs, self.dst_crs, **self.kwargs)
+        transformer = get_transformer(self.src_crs, self.dst_crs, **self.kwargs)
         return transformer.transform(x, y, **kwargs)
 
 
@@ -187,3 +192,106 @@ def get_geodetic_crs_with_no_datum_shift(crs: CRS) -> CRS:
     gcrs_dict.pop("pm", None)
     gcrs_pm0 = CRS.from_dict(gcrs_dict)
     return gcrs_pm0
+
+
+_TRANSFORMERS: OrderedDict = OrderedDict()
+_TRANSFORMERS_LOCK = threading.Lock()
+# Transformers can be shared between threads since pyproj 3.1
+_SHARE_TRANSFORMERS_BETWEEN_THREADS = hasattr(pyproj.transformer, "TransformerLocal")
+
+
+def get_transformer(crs_from, crs_to, **kwargs) -> PROJTransformer:
+    """Get a pyproj Transformer from the process-wide transformer cache.
+
+    Creating a Transformer takes milliseconds. Transformers are therefore
+    kept for the lifetime of the process (or dask worker) and reused by
+    every call with the same CRSs and keyword arguments. The arguments are
+    the same as for :meth:`pyproj.transformer.Transformer.from_crs`.
+
+    The number of cached transformers is limited by the
+    ``transformer_cache_size`` configuration option.
+
+    """
+    key = ("transformer", _crs_key(crs_from), _crs_key(crs_to), _kwargs_key(kwargs))
+    return _get_cached_transformer(key, lambda: PROJTransformer.from_crs(crs_from, crs_to, **kwargs))
+
+
+def get_geodetic_transformer(crs, **kwargs) -> PROJTransformer:
+    """Get a cached Transformer from the geodetic CRS of ``crs`` to ``crs``.
+
+    The geodetic CRS has no prime meridian shift (see
+    :func:`get_geodetic_crs_with_no_datum_shift`). The inverse direction of
+    this transformer computes the longitudes and latitudes of projection
+    coordinates.
+
+    """
+    def _create_transformer():
+        crs_to = CRS.from_user_input(crs)
+        gcrs = get_geodetic_crs_with_no_datum_shift(crs_to)
+        return PROJTransformer.from_crs(gcrs, crs_to, **kwargs)
+
+    key = ("geodetic", _crs_key(crs), _kwargs_key(kwargs))
+    return _get_cached_transformer(key, _create_transformer)
+
+
+def get_proj(crs) -> Proj:
+    """Get a cached :class:`pyproj.Proj` for a CRS."""
+    return _get_cached_transformer(("proj", _crs_key(crs)), lambda: Proj(crs))
+
+
+def clear_transformer_cache():
+    """Remove all transformers from the process-wide transformer cache."""
+    with _TRANSFORMERS_LOCK:
+        _TRANSFORMERS.clear()
+
+
+def _crs_key(crs):
+    if isinstance(crs, CRS):
+        return crs.srs
+    if isinstance(crs, dict):
+        return tuple(sorted((str(key), str(val)) for key, val in crs.items()))
+    return crs
+
+
+def _kwargs_key(kwargs):
+    return tuple(sorted(kwargs.items()))
+
+
+def _get_cached_transformer(key, create_transformer):
+    max_size = config.get("transformer_cache_size", 0) or 0
+    if max_size <= 0:
+        return create_transformer()
+    if not _SHARE_TRANSFORMERS_BETWEEN_THREADS:
+        key = key + (threading.get_ident(),)
+    try:
+        hash(key)
+    except TypeError:
+        return create_transformer()
+
+    start_time = time.perf_counter()
+    with _TRANSFORMERS_LOCK:
+        transformer = _TRANSFORMERS.get(key)
+        if transformer is not None:
+            _TRANSFORMERS.move_to_end(key)
+    if transformer is not None:
+        record_cache_event("transformers", "hit", duration=time.perf_counter() - start_time)
+        return transformer
+
+    transformer = create_transformer()
+    record_cache_event("transformers", "miss", duration=time.perf_counter() - start_time)
+    with _TRANSFORMERS_LOCK:
+        _TRANSFORMERS[key] = transformer
+        _TRANSFORMERS.move_to_end(key)
+        while len(_TRANSFORMERS) > max_size:
+            _TRANSFORMERS.popitem(last=False)
+    return transformer
+
+
+def _reset_transformers_lock():
+    global _TRANSFORMERS_LOCK
+    # the lock may have been held by another thread when the process was forked
+    _TRANSFORMERS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_transformers_lock)
@@ -42,6 +42,8 @@ extras_require = {'numexpr': ['numexpr'],
                   'gradient_search': ['shapely'],
                   'xarray_bilinear': ['xarray', 'dask', 'zarr'],
                   'odc-geo': ['odc-geo'],
+                  'sparse_weights': ['scipy'],
+                  'fast_hash': ['xxhash'],
                   'tests': test_requires}
 
 all_extras = []